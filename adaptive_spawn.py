@@ -0,0 +1,134 @@
+import random
+
+# Weakness-targeted spawns.
+# The spawn box is split into a grid, and each cell keeps an exponentially
+# decayed reaction time and miss rate. Spawns are drawn from an alias table
+# (Vose), so a draw costs the same whatever the grid size, weighted toward the
+# cells where the player is slowest.
+#
+# Decay without touching every cell: instead of shrinking all sums each trial,
+# the weight given to new trials grows by 1/decay, and everything is rescaled
+# on the rare occasion that gets large. A cell's mean RT and miss rate are
+# ratios of its sums, which the shared decay doesn't change, so only the cell
+# a trial landed in changes weight. Its change is added to a drift total, and
+# the O(cells) table rebuild only happens once that passes DRIFT_THRESHOLD.
+
+HALF_LIFE_TRIALS = 200      # A trial counts half as much this many trials later
+MISS_PENALTY_MS = 300       # A miss rate of 1 adds this much to a cell's score
+MIN_CELL_TRIALS = 3         # Cells with fewer trials score as UNVISITED_SCORE_MS
+UNVISITED_SCORE_MS = 600    # Untried cells look slow, so they get tried
+SHARPNESS = 2.0             # Weight = (score / 100ms) ^ SHARPNESS
+EXPLORE_RATE = 0.2          # Share of spawns drawn uniformly, no cell starves
+DRIFT_THRESHOLD = 0.1       # Rebuild once weights moved this share of the table total
+RESCALE_AT = 1e12
+
+
+def build_alias_table(weights):
+    """Vose's alias method: (probability, alias) per slot, O(n) to build"""
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Whatever is left is 1 up to rounding
+    return prob, alias
+
+
+class WeaknessGrid:
+    """Decayed per-cell RT and miss rate over a spawn box, and spawns biased toward the slow cells"""
+    def __init__(self, bounds, cols=4, rows=4, half_life=HALF_LIFE_TRIALS, rng=random):
+        self.min_x, self.min_y, self.max_x, self.max_y = bounds
+        self.cols = cols
+        self.rows = rows
+        self.rng = rng
+        self.decay = 0.5 ** (1 / half_life)
+        self.scale = 1.0  # Weight of the newest trial
+        cells = cols * rows
+        self.count = [0] * cells    # Undecayed, only gates MIN_CELL_TRIALS
+        self.n = [0.0] * cells      # Decayed sums, in units of self.scale
+        self.rt = [0.0] * cells
+        self.miss = [0.0] * cells
+        self.weights = [self.weight(i) for i in range(cells)]
+        self.drift = 0.0
+        self.rebuilds = 0
+        self.rebuild()
+
+    def cell_at(self, x, y):
+        col = int((x - self.min_x) * self.cols / (self.max_x - self.min_x + 1))
+        row = int((y - self.min_y) * self.rows / (self.max_y - self.min_y + 1))
+        return min(max(row, 0), self.rows - 1) * self.cols + min(max(col, 0), self.cols - 1)
+
+    def mean_rt(self, cell):
+        return self.rt[cell] / self.n[cell] if self.n[cell] else None
+
+    def miss_rate(self, cell):
+        return self.miss[cell] / self.n[cell] if self.n[cell] else None
+
+    def score(self, cell):
+        """Effective reaction time in ms, misses counted as MISS_PENALTY_MS"""
+        if self.count[cell] < MIN_CELL_TRIALS:
+            return UNVISITED_SCORE_MS
+        return self.mean_rt(cell) + MISS_PENALTY_MS * self.miss_rate(cell)
+
+    def weight(self, cell):
+        return (self.score(cell) / 100) ** SHARPNESS
+
+    def rebuild(self):
+        self.prob, self.alias = build_alias_table(self.weights)
+        self.table_total = sum(self.weights)
+        self.drift = 0.0
+        self.rebuilds += 1
+
+    def record(self, cell, rt_ms, missed):
+        """Add one trial, O(1) unless the table has drifted far enough to rebuild"""
+        self.scale /= self.decay
+        if self.scale > RESCALE_AT:
+            for i in range(len(self.n)):
+                self.n[i] /= self.scale
+                self.rt[i] /= self.scale
+                self.miss[i] /= self.scale
+            self.scale = 1.0
+        self.count[cell] += 1
+        self.n[cell] += self.scale
+        self.rt[cell] += rt_ms * self.scale
+        self.miss[cell] += self.scale if missed else 0.0
+        weight = self.weight(cell)
+        self.drift += abs(weight - self.weights[cell])
+        self.weights[cell] = weight
+        if self.drift > DRIFT_THRESHOLD * self.table_total:
+            self.rebuild()
+
+    def pick_cell(self):
+        if self.rng.random() < EXPLORE_RATE:
+            return self.rng.randrange(len(self.prob))
+        slot = self.rng.randrange(len(self.prob))
+        return slot if self.rng.random() < self.prob[slot] else self.alias[slot]
+
+    def spawn(self):
+        """Cell and an integer point inside it"""
+        cell = self.pick_cell()
+        row, col = divmod(cell, self.cols)
+        width = self.max_x - self.min_x + 1
+        height = self.max_y - self.min_y + 1
+        x0 = self.min_x + col * width // self.cols
+        y0 = self.min_y + row * height // self.rows
+        x1 = self.min_x + (col + 1) * width // self.cols - 1
+        y1 = self.min_y + (row + 1) * height // self.rows - 1
+        return cell, (self.rng.randint(x0, max(x0, x1)), self.rng.randint(y0, max(y0, y1)))
+
+    def slowest(self):
+        """Slowest measured cell as (col, row, score), None before any cell has enough trials"""
+        measured = [i for i in range(len(self.count)) if self.count[i] >= MIN_CELL_TRIALS]
+        if not measured:
+            return None
+        cell = max(measured, key=self.score)
+        return cell % self.cols, cell // self.cols, self.score(cell)
@@ -0,0 +1,110 @@
+import threading
+import time
+import numpy as np
+import pygame
+import pygame._sdl2.sdl2 as sdl2
+from pygame._sdl2.audio import AudioDevice, AUDIO_S16, get_audio_device_names
+
+# Sound as a reaction stimulus.
+# pygame.mixer can't tell when a sound starts, so the cue plays through its own
+# SDL audio device and fills every output buffer itself:
+#   - the sound's leading silence is trimmed, its first sample is the audible onset
+#   - play() only arms the cue, the next callback puts the first sample at the
+#     start of its buffer and timestamps that callback
+#   - that buffer goes out once the one handed over before it has played
+#   - plus DEVICE_LATENCY_MS for the driver and hardware, measured once with a loopback
+# The buffer size is whatever SDL grants, not what was asked for. Until
+# DEVICE_LATENCY_MS is measured the onset is early by the OS and driver latency,
+# often tens of ms, so auditory RTs run long. Such runs are logged as uncalibrated.
+
+AUDIO_FREQUENCY = 48000
+AUDIO_BUFFER = 256          # Samples per callback asked for, 5.3ms at 48kHz
+DEVICE_LATENCY_MS = None    # Driver and hardware latency after a buffer is handed over, None until measured
+ONSET_THRESHOLD = 0.05      # Fraction of the sound's peak that counts as audible
+AUDIO_ALLOW_SAMPLES_CHANGE = 0x08  # SDL_AUDIO_ALLOW_SAMPLES_CHANGE, pygame doesn't export it
+
+
+def pre_init_mixer(frequency=AUDIO_FREQUENCY, buffer=AUDIO_BUFFER):
+    """Call before pygame.init(), the mixer only decodes the cue file"""
+    pygame.mixer.pre_init(frequency, -16, 2, buffer)
+
+
+def trim_leading_silence(samples, frequency, threshold=ONSET_THRESHOLD):
+    """Samples starting at the first audible one, and the seconds cut off"""
+    level = np.abs(samples.astype(np.int32))
+    if level.ndim > 1:
+        level = level.max(axis=1)  # Loudest channel
+    peak = level.max()
+    if peak == 0:
+        return samples, 0.0
+    first = int(np.argmax(level >= peak * threshold))
+    return samples[first:], first / frequency
+
+
+class AudioCue:
+    """A stimulus sound on its own output device, timestamped by the callback that starts it"""
+    def __init__(self, sound, buffer=AUDIO_BUFFER, device_latency_ms=DEVICE_LATENCY_MS):
+        frequency, _, channels = pygame.mixer.get_init()
+        samples = pygame.sndarray.array(sound).reshape(-1, channels)
+        self.samples, self.trimmed_s = trim_leading_silence(samples, frequency)
+        self.lock = threading.Lock()
+        self.armed = False
+        self.position = None  # Next sample to play, None while silent
+        self.onset = None     # Estimated audible onset of the last cue, set by the callback
+        # The cue needs the output to itself, the mixer was only there to decode it
+        pygame.mixer.quit()
+        try:
+            sdl2.init_subsystem(sdl2.INIT_AUDIO)
+            devices = get_audio_device_names(False)
+            if not devices:
+                raise pygame.error("No audio output device")
+            self.device = AudioDevice(devicename=devices[0], iscapture=False,
+                                      frequency=frequency, audioformat=AUDIO_S16, numchannels=channels,
+                                      chunksize=buffer, allowed_changes=AUDIO_ALLOW_SAMPLES_CHANGE,
+                                      callback=self.fill)
+        except sdl2.error as e:
+            raise pygame.error(str(e))
+        self.buffer = self.device.chunksize
+        self.buffer_s = self.buffer / frequency
+        self.calibrated = device_latency_ms is not None
+        self.output_latency = self.buffer_s + (device_latency_ms or 0.0) / 1000
+        # Half a buffer to the next callback on average, then the output latency
+        self.lead_time = self.buffer_s / 2 + self.output_latency
+        self.device.pause(0)
+
+    def fill(self, device, stream):
+        """SDL audio callback, runs on SDL's audio thread"""
+        now = time.time()
+        out = np.frombuffer(stream, dtype=np.int16).reshape(-1, self.samples.shape[1])
+        out[:] = 0
+        with self.lock:
+            if self.armed:
+                self.armed = False
+                self.position = 0
+                self.onset = now + self.output_latency
+            if self.position is None:
+                return
+            chunk = self.samples[self.position:self.position + len(out)]
+            out[:len(chunk)] = chunk
+            self.position += len(out)
+            if self.position >= len(self.samples):
+                self.position = None
+
+    def play(self):
+        """Start the cue with the next buffer, its onset shows up in self.onset once that is filled"""
+        with self.lock:
+            self.armed = True
+            self.onset = None
+
+    def stop(self):
+        with self.lock:
+            self.armed = False
+            self.position = None
+
+    def close(self):
+        self.device.close()
+
+    def status_text(self):
+        if not self.calibrated:
+            return f"Audio onset: callback +{self.output_latency * 1000:.1f}ms, UNCALIBRATED (set DEVICE_LATENCY_MS)"
+        return f"Audio onset: callback +{self.output_latency * 1000:.1f}ms ({self.buffer} sample buffer)"
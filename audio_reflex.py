@@ -0,0 +1,258 @@
+import pygame
+import random
+import time
+import os # Import os module for path handling
+from frame_pacing import FramePacer, set_display_mode
+from session_log import SessionLog
+from trial_protocol import TrialProtocol
+from audio_cue import AudioCue, pre_init_mixer, AUDIO_BUFFER, DEVICE_LATENCY_MS
+
+# Auditory vs visual reaction.
+# No aiming: after the foreperiod either a sound plays or the screen flashes,
+# and any click ends the trial. Auditory RT is measured from the cue's estimated
+# audible onset (see audio_cue.py), visual RT from the flip that showed the
+# flash, so the two can be compared. Expect roughly 140-160ms for sound, once
+# the device latency has been measured.
+
+# The mixer format has to be set before pygame.init(), the cue is decoded in it
+pre_init_mixer()
+pygame.init()
+
+# --- Screen Setup ---
+try:
+    display_info = pygame.display.Info()
+    WIDTH, HEIGHT = display_info.current_w, display_info.current_h
+except pygame.error:
+    print("Could not get display info, using default 800x600.")
+    WIDTH, HEIGHT = 800, 600
+
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
+pygame.display.set_caption("Aim Trainer - Auditory Reflex")
+
+# --- Stimulus Configuration ---
+# Any of the shipped sounds works, short sharp ones give the cleanest onset
+CUE_SOUND_FILE = "metal-hit-94-200422.mp3"
+STIMULUS_MIX = {"audio": 0.5, "visual": 0.5}  # Share of trials per modality
+FLASH_RADIUS = 40
+
+audio_cue = None
+try:
+    sound_path = os.path.join(os.path.dirname(__file__), CUE_SOUND_FILE)
+    print(f"Loading sound from: {sound_path}")
+    audio_cue = AudioCue(pygame.mixer.Sound(sound_path), AUDIO_BUFFER, DEVICE_LATENCY_MS)
+    print(f"Sound cue loaded, {audio_cue.buffer} sample buffer.")
+    if not audio_cue.calibrated:
+        print("DEVICE_LATENCY_MS isn't measured yet, auditory RTs include the output latency.")
+except (pygame.error, FileNotFoundError) as e:
+    print(f"Error loading sound cue: {e}")
+    print("Running visual trials only.")
+    STIMULUS_MIX = {"visual": 1.0}
+
+# --- Colors ---
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+YELLOW = (255, 255, 0)
+CYAN = (0, 255, 255)
+GREEN = (0, 255, 0)
+ORANGE = (255, 165, 0)
+GREY = (150, 150, 150)
+
+CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
+
+# --- Timing Configuration ---
+TARGET_TIMEOUT_MS = 1000
+DELAY_MIN_S = 1.0
+DELAY_MEAN_EXTRA_S = 0.8
+DELAY_MAX_S = 4.0
+ANTICIPATION_FLOOR_MS = 100
+protocol = TrialProtocol(0.0, ANTICIPATION_FLOOR_MS, DELAY_MIN_S, DELAY_MEAN_EXTRA_S, DELAY_MAX_S)
+STATS_WINDOW = 20  # Trials per modality in the running mean
+
+# --- Game Variables ---
+modality = None
+planned_onset = 0.0    # When the next stimulus is due
+stimulus_onset = None  # When it actually reached the player, None until then
+stimulus_pending = False
+visual_shown = False   # Flash drawn, onset is taken after the flip
+reaction_times = {"audio": [], "visual": []}
+last_result = None  # (text, color)
+
+font_large = pygame.font.Font(None, 36)
+font_small = pygame.font.Font(None, 22)
+
+pygame.mouse.set_visible(False)
+pygame.event.set_grab(True)
+
+# --- Session Log ---
+# One record per trial in sessions/audio_reflex_<date>.jsonl
+session_log = SessionLog("audio_reflex", {
+    "cue_sound": CUE_SOUND_FILE,
+    "stimulus_mix": STIMULUS_MIX,
+    "audio_buffer": audio_cue.buffer if audio_cue else None,  # As granted by SDL
+    "device_latency_ms": DEVICE_LATENCY_MS,
+    "audio_calibrated": audio_cue.calibrated if audio_cue else None,  # False: auditory RTs include the output latency
+    "target_timeout_ms": TARGET_TIMEOUT_MS,
+    "foreperiod_s": {"min": DELAY_MIN_S, "mean_extra": DELAY_MEAN_EXTRA_S, "max": DELAY_MAX_S},
+    "anticipation_floor_ms": ANTICIPATION_FLOOR_MS,
+})
+
+
+def schedule_trial(now):
+    """Pick the next modality and when its stimulus is due"""
+    global modality, planned_onset, stimulus_onset, stimulus_pending, visual_shown
+    modality = random.choices(list(STIMULUS_MIX), list(STIMULUS_MIX.values()))[0]
+    planned_onset = now + protocol.foreperiod()
+    stimulus_onset = None
+    stimulus_pending = True
+    visual_shown = False
+
+def start_stimulus(now):
+    """Audio starts lead_time early so it is heard at planned_onset, the flash goes out with this frame"""
+    global stimulus_pending, visual_shown
+    if modality == "audio":
+        if now >= planned_onset - audio_cue.lead_time:
+            audio_cue.play()
+            stimulus_pending = False
+    elif now >= planned_onset:
+        visual_shown = True
+        stimulus_pending = False
+
+def update_audio_onset():
+    """Pick up the onset the audio callback stamped on the cue"""
+    global stimulus_onset
+    if modality == "audio" and not stimulus_pending and stimulus_onset is None:
+        stimulus_onset = audio_cue.onset
+
+def log_trial(outcome, rt_ms, flagged=None):
+    session_log.write({
+        "type": "trial",
+        "time": stimulus_onset if stimulus_onset is not None else planned_onset,
+        "outcome": outcome,
+        "flagged": flagged,
+        "modality": modality,
+        "rt_ms": rt_ms,
+        "planned_onset_error_ms": (stimulus_onset - planned_onset) * 1000 if stimulus_onset is not None else None,
+    })
+
+def process_click(now):
+    global last_result
+    update_audio_onset()
+    if stimulus_onset is None or now < stimulus_onset:
+        # Nothing heard or seen yet, the wait starts over
+        if modality == "audio" and not stimulus_pending:
+            audio_cue.stop()  # Already started but not out of the speakers, it mustn't sound during the new wait
+        protocol.false_starts += 1
+        last_result = ("FALSE START", ORANGE)
+        log_trial("false_start", None, "false_start")
+        schedule_trial(now)
+        return
+
+    rt_ms = (now - stimulus_onset) * 1000
+    if protocol.is_anticipation(rt_ms):
+        protocol.anticipations += 1
+        last_result = (f"TOO EARLY ({rt_ms:.0f} ms)", ORANGE)
+        log_trial("hit", rt_ms, "anticipation")
+    else:
+        times = reaction_times[modality]
+        times.append(rt_ms)
+        if len(times) > STATS_WINDOW:
+            del times[0]
+        last_result = (f"{modality.capitalize()}: {rt_ms:.0f} ms", GREEN)
+        log_trial("hit", rt_ms)
+    schedule_trial(now)
+
+def expire_trial(now):
+    global last_result
+    if stimulus_onset is not None and (now - stimulus_onset) * 1000 >= TARGET_TIMEOUT_MS:
+        last_result = ("TOO SLOW", RED)
+        log_trial("timeout", TARGET_TIMEOUT_MS)
+        schedule_trial(now)
+
+
+def draw_instructions_and_fps(current_fps):
+    stats = []
+    for name, times in reaction_times.items():
+        if name in STIMULUS_MIX:
+            mean = f"{sum(times) / len(times):.0f}ms" if times else "-"
+            stats.append(f"{name.capitalize()} RT (last {STATS_WINDOW}): {mean} ({len(times)} trials)")
+    instructions = [
+        f"FPS: {current_fps:.0f}",
+        clock.stats_text(),
+        protocol.summary_text(),
+        *stats,
+        audio_cue.status_text() if audio_cue else "Audio: unavailable",
+        "-----------",
+        "Controls:",
+        "Left Click / Left CTRL: React",
+        "ESC: Quit"
+    ]
+    y_offset = 10
+    for i, line in enumerate(instructions):
+        color = GREEN if i == 0 else CYAN
+        text_surface = font_small.render(line, True, color)
+        text_rect = text_surface.get_rect(topleft=(10, y_offset))
+        screen.blit(text_surface, text_rect)
+        y_offset += text_rect.height + 3
+
+def draw_result():
+    if last_result:
+        text, color = last_result
+        text_surface = font_large.render(text, True, color)
+        screen.blit(text_surface, text_surface.get_rect(center=(WIDTH // 2, CENTER_Y - 100)))
+
+def draw_fixation():
+    pygame.draw.line(screen, GREY, (CENTER_X - 8, CENTER_Y), (CENTER_X + 8, CENTER_Y), 2)
+    pygame.draw.line(screen, GREY, (CENTER_X, CENTER_Y - 8), (CENTER_X, CENTER_Y + 8), 2)
+
+# --- Game Loop ---
+running = True
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
+schedule_trial(time.time())
+
+while running:
+    current_frame_time = time.time()
+
+    # --- Event Handling ---
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT: running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE: running = False
+            if event.key == pygame.K_LCTRL:
+                process_click(time.time())
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left mouse button
+                process_click(time.time())
+
+    # --- Game Logic ---
+    update_audio_onset()
+    expire_trial(current_frame_time)
+    if stimulus_pending:
+        # Checked as late as possible, right before the frame is drawn
+        start_stimulus(time.time())
+
+    # --- Drawing ---
+    screen.fill(BLACK)
+    draw_instructions_and_fps(clock.get_fps())
+    draw_result()
+    if visual_shown:
+        pygame.draw.circle(screen, YELLOW, (CENTER_X, CENTER_Y), FLASH_RADIUS)
+    else:
+        draw_fixation()
+    pygame.display.flip()
+    if visual_shown and stimulus_onset is None:
+        # The flash is on screen from this flip on
+        stimulus_onset = time.time()
+    session_log.flush()
+    clock.tick()
+
+# --- Cleanup ---
+session_log.close()
+if audio_cue: audio_cue.close()
+pygame.mouse.set_visible(True)
+pygame.event.set_grab(False)
+pygame.quit()
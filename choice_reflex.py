@@ -0,0 +1,452 @@
+import pygame
+import random
+import time
+import math
+import os # Import os module for path handling
+from target_sprites import TargetSpriteCache, convert_sprite
+from frame_pacing import FramePacer, set_display_mode
+from late_latch import drain_motion
+from session_log import SessionLog
+from trial_protocol import TrialProtocol
+from hick import HickAccumulator, balanced_sequence
+
+# Choice reflex: N fixed stimulus slots in a row around the center, one lights up
+# and the click has to land in it. With 2 slots of 20px radius 25px left and
+# right of the center it is the journal's left/right reflex click without aim.
+# Blocks cycle through CHOICE_COUNTS for Hick's law (see hick.py).
+
+# Initialize Pygame
+pygame.init()
+pygame.mixer.init()  # Initialize the sound mixer
+
+# --- Screen Setup ---
+try:
+    display_info = pygame.display.Info()
+    WIDTH, HEIGHT = display_info.current_w, display_info.current_h
+except pygame.error:
+    print("Could not get display info, using default 800x600.")
+    WIDTH, HEIGHT = 800, 600
+
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
+pygame.display.set_caption("Aim Trainer - Choice Reflex")
+
+# --- Load Sound Effects ---
+hit_sound = None
+wrong_sound = None
+
+try:
+    sound_path = os.path.join(os.path.dirname(__file__), "metal-hit-94-200422.mp3")
+    print(f"Loading sound from: {sound_path}")
+    hit_sound = pygame.mixer.Sound(sound_path)
+    print("Sound effect loaded successfully.")
+except (pygame.error, FileNotFoundError) as e:
+    print(f"Error loading sound effect: {e}")
+    print("Ensure the sound file is in the same directory as the script.")
+
+try:
+    sound_path = os.path.join(os.path.dirname(__file__), "76097_578556_Swords_-_woosh_Celine_Woodburn_Swords_51_stereo_normal.ogg")
+    print(f"Loading sound from: {sound_path}")
+    wrong_sound = pygame.mixer.Sound(sound_path)
+    print("Sound effect loaded successfully.")
+except (pygame.error, FileNotFoundError) as e:
+    print(f"Error loading sound effect: {e}")
+    print("Ensure the sound file is in the same directory as the script.")
+
+# --- Colors ---
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)          # Wrong slot and timeouts
+YELLOW = (255, 255, 0)     # Lit slot and sensitivity info
+CYAN = (0, 255, 255)       # Instructions
+GREEN = (0, 255, 0)        # FPS & Good Times
+ORANGE = (255, 165, 0)     # Medium Times and anticipations
+PINK = (255, 105, 180)     # Slower Times
+GREY = (150, 150, 150)     # Spectrogram Axis/Labels
+DARK_GREY = (50, 50, 50, 200) # Spectrogram Background (Add Alpha for slight transparency)
+SLOT_OUTLINE_COLOR = (90, 90, 90)
+
+# --- Slot Configuration ---
+SLOT_RADIUS = 20
+SLOT_SPACING = 50          # Center to center, 2 slots end up 25px either side of the center
+CHOICE_COUNTS = [1, 2, 4]  # Blocks cycle through these
+BLOCK_TRIALS = 24          # Trials per block, each slot lit equally often
+CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
+RECENTER_CURSOR = True     # Cursor goes back to the center when a trial ends
+
+def slot_positions(n_choices):
+    return [(CENTER_X + (i - (n_choices - 1) / 2) * SLOT_SPACING, CENTER_Y) for i in range(n_choices)]
+
+def make_slot_board(n_choices):
+    """Outlines of every slot of an N-choice block on one transparent surface, and its screen position"""
+    positions = slot_positions(n_choices)
+    left = round(positions[0][0]) - SLOT_RADIUS - 1
+    top = CENTER_Y - SLOT_RADIUS - 1
+    size = (round(positions[-1][0]) + SLOT_RADIUS + 2 - left, SLOT_RADIUS * 2 + 3)
+    board = pygame.Surface(size, pygame.SRCALPHA)
+    for x, y in positions:
+        pygame.draw.circle(board, SLOT_OUTLINE_COLOR, (round(x) - left, round(y) - top), SLOT_RADIUS, 1)
+    return convert_sprite(board), (left, top)
+
+# --- Slot Sprites ---
+# Boards and the lit slot are rendered once, a stimulus onset is a single blit
+slot_boards = {n: make_slot_board(n) for n in CHOICE_COUNTS}
+lit_sprites = TargetSpriteCache()
+lit_sprites.prebuild([SLOT_RADIUS], [YELLOW])
+
+# --- Timing Configuration ---
+TARGET_TIMEOUT_MS = 1000   # Choice RTs run longer than simple ones
+DELAY_MIN_S = 0.8
+DELAY_MEAN_EXTRA_S = 0.5
+DELAY_MAX_S = 3.0
+ANTICIPATION_FLOOR_MS = 100
+# Exponential foreperiod and anticipation floor, no catch trials here
+protocol = TrialProtocol(0.0, ANTICIPATION_FLOOR_MS, DELAY_MIN_S, DELAY_MEAN_EXTRA_S, DELAY_MAX_S)
+
+# --- Game Variables ---
+block_index = 0
+n_choices = CHOICE_COUNTS[0]
+slots = slot_positions(n_choices)
+slot_sequence = []
+lit_slot = None
+stimulus_active = False
+start_time = 0
+hit_times_ms = []
+miss_flags = []
+last_result = None  # (text, color)
+is_delaying = False
+delay_start_time = 0.0
+current_delay_duration = 0.0
+hick_stats = HickAccumulator()
+
+font_large = pygame.font.Font(None, 36)
+font_medium = pygame.font.Font(None, 24)
+font_small = pygame.font.Font(None, 22)
+font_tiny = pygame.font.Font(None, 18)
+
+# --- Spectrogram Configuration ---
+SPEC_HEIGHT = 120
+SPEC_Y_POS = HEIGHT - SPEC_HEIGHT - 40
+SPEC_MAX_TIME_MS = TARGET_TIMEOUT_MS
+SPEC_WINDOW_SIZE = 20
+TIME_BAR = 300
+
+# --- Sensitivity Simulation Settings ---
+target_dpi = 1600
+target_valorant_sens = 0.2
+VALORANT_SENS_INCREMENT_FINE = 0.005
+VALORANT_SENS_INCREMENT_COARSE = 0.05
+DPI_INCREMENT = 50
+REFERENCE_eDPI = 640.0
+
+def calculate_sensitivity_multiplier(dpi, sens):
+    current_eDPI = dpi * sens
+    return current_eDPI / REFERENCE_eDPI
+
+sensitivity_multiplier = calculate_sensitivity_multiplier(target_dpi, target_valorant_sens)
+
+# --- Custom Cursor ---
+cursor_x, cursor_y = CENTER_X, CENTER_Y
+pygame.mouse.set_visible(False)
+pygame.event.set_grab(True)
+
+# --- Session Log ---
+# One record per trial in sessions/choice_reflex_<date>.jsonl, python hick.py reports on them
+session_log = SessionLog("choice_reflex", {
+    "slot_radius": SLOT_RADIUS,
+    "slot_spacing": SLOT_SPACING,
+    "choice_counts": CHOICE_COUNTS,
+    "block_trials": BLOCK_TRIALS,
+    "target_timeout_ms": TARGET_TIMEOUT_MS,
+    "foreperiod_s": {"min": DELAY_MIN_S, "mean_extra": DELAY_MEAN_EXTRA_S, "max": DELAY_MAX_S},
+    "anticipation_floor_ms": ANTICIPATION_FLOOR_MS,
+    "dpi": target_dpi,
+    "sens": target_valorant_sens,
+})
+
+
+def start_block(index):
+    """Switch to the block's choice count and precompute its balanced slot order"""
+    global block_index, n_choices, slots, slot_sequence
+    block_index = index
+    n_choices = CHOICE_COUNTS[index % len(CHOICE_COUNTS)]
+    slots = slot_positions(n_choices)
+    slot_sequence = balanced_sequence(n_choices, max(1, BLOCK_TRIALS // n_choices), random)
+
+def show_stimulus():
+    global lit_slot, stimulus_active, start_time
+    lit_slot = slot_sequence.pop()
+    stimulus_active = True
+    start_time = None  # Taken after the flip that shows it
+
+def start_delay(now):
+    global is_delaying, delay_start_time, current_delay_duration, cursor_x, cursor_y
+    if not slot_sequence:
+        start_block(block_index + 1)  # Block done, the next one is built during the foreperiod
+    is_delaying = True
+    delay_start_time = now
+    current_delay_duration = protocol.foreperiod()
+    if RECENTER_CURSOR:
+        cursor_x, cursor_y = CENTER_X, CENTER_Y
+
+def slot_at(x, y):
+    """Index of the slot under (x, y), None between slots"""
+    for i, (slot_x, slot_y) in enumerate(slots):
+        if math.hypot(x - slot_x, y - slot_y) <= SLOT_RADIUS:
+            return i
+    return None
+
+def record_result(outcome, rt_ms, response_slot=None, flagged=None):
+    global hit_times_ms, miss_flags
+    correct = outcome == "correct"
+    if not flagged:
+        hick_stats.add(n_choices, correct, rt_ms)
+        hit_times_ms.append(rt_ms)
+        miss_flags.append(not correct)
+        if len(hit_times_ms) > SPEC_WINDOW_SIZE:
+            hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
+            miss_flags = miss_flags[-SPEC_WINDOW_SIZE:]
+    session_log.write({
+        "type": "trial",
+        "time": start_time,
+        "outcome": outcome,
+        "flagged": flagged,
+        "choices": n_choices,
+        "slot": lit_slot,
+        "response_slot": response_slot,
+        "rt_ms": rt_ms,
+        "target": list(slots[lit_slot]),
+        "radius": SLOT_RADIUS,
+        "dpi": target_dpi,
+        "sens": target_valorant_sens,
+    })
+
+def process_click():
+    """Classify a click by the slot it lands in"""
+    global stimulus_active, last_result, delay_start_time, current_delay_duration
+    now = time.time()
+    if not stimulus_active:
+        if is_delaying:
+            # Fired before the stimulus, the wait starts over
+            protocol.false_starts += 1
+            last_result = ("FALSE START", ORANGE)
+            start_delay(now)
+        return
+
+    rt_ms = (now - start_time) * 1000
+    response_slot = slot_at(cursor_x, cursor_y)
+    if response_slot == lit_slot:
+        outcome = "correct"
+    elif response_slot is None:
+        outcome = "no_slot"
+    else:
+        outcome = "wrong_slot"
+
+    flagged = None
+    if protocol.is_anticipation(rt_ms):
+        protocol.anticipations += 1
+        flagged = "anticipation"
+        last_result = (f"TOO EARLY ({rt_ms:.0f} ms)", ORANGE)
+    elif outcome == "correct":
+        last_result = (f"{rt_ms:.0f} ms", get_time_color(rt_ms, False))
+        if hit_sound: hit_sound.play()
+    else:
+        last_result = ("WRONG SLOT" if outcome == "wrong_slot" else "MISSED SLOT", RED)
+        if wrong_sound: wrong_sound.play()
+
+    record_result(outcome, rt_ms, response_slot, flagged)
+    stimulus_active = False
+    start_delay(now)
+
+def expire_stimulus(now):
+    global stimulus_active, last_result
+    if stimulus_active and (now - start_time) * 1000 >= TARGET_TIMEOUT_MS:
+        stimulus_active = False
+        last_result = ("TOO SLOW", RED)
+        record_result("timeout", TARGET_TIMEOUT_MS)
+        start_delay(start_time + TARGET_TIMEOUT_MS / 1000)
+
+
+def get_time_color(time_ms, is_miss):
+    if is_miss:
+        return RED
+    elif time_ms <= TIME_BAR:
+        return GREEN
+    elif time_ms <= TARGET_TIMEOUT_MS:
+        return ORANGE
+    else:
+        return PINK
+
+def draw_sensitivity_info():
+    dpi_surf = font_large.render(f"Target DPI: {target_dpi}", True, YELLOW)
+    sens_surf = font_large.render(f"Target Val Sens: {target_valorant_sens:.3f}", True, YELLOW)
+    block_surf = font_large.render(f"Choices: {n_choices} (block {block_index + 1})", True, YELLOW)
+    dpi_rect = dpi_surf.get_rect(topright=(WIDTH - 20, 10))
+    sens_rect = sens_surf.get_rect(topright=(WIDTH - 20, dpi_rect.bottom + 5))
+    block_rect = block_surf.get_rect(topright=(WIDTH - 20, sens_rect.bottom + 5))
+    screen.blit(dpi_surf, dpi_rect)
+    screen.blit(sens_surf, sens_rect)
+    screen.blit(block_surf, block_rect)
+
+def draw_instructions_and_fps(current_fps):
+    instructions = [
+        f"FPS: {current_fps:.0f}",
+        clock.stats_text(),
+        protocol.summary_text(),
+        *hick_stats.summary_lines(),
+        f"Slots: {SLOT_RADIUS}px radius, {SLOT_SPACING}px apart",
+        f"Timeout: {TARGET_TIMEOUT_MS}ms",
+        "-----------",
+        "Controls:",
+        "Left Click / Left CTRL: Fire",
+        "N: Next Block",
+        "UP/DOWN: Adjust Val Sens (Fine)",
+        "SHIFT+UP/DOWN: Adjust Val Sens (Coarse)",
+        "LEFT/RIGHT: Adjust DPI",
+        "ESC: Quit"
+    ]
+    y_offset = 10
+    for i, line in enumerate(instructions):
+        color = GREEN if i == 0 else CYAN
+        text_surface = font_small.render(line, True, color)
+        text_rect = text_surface.get_rect(topleft=(10, y_offset))
+        screen.blit(text_surface, text_rect)
+        y_offset += text_rect.height + 3
+
+def draw_result():
+    if last_result:
+        text, color = last_result
+        text_surface = font_large.render(text, True, color)
+        bg_rect = text_surface.get_rect(center=(WIDTH // 2, CENTER_Y - 100)).inflate(20, 10)
+        pygame.draw.rect(screen, BLACK, bg_rect)
+        pygame.draw.rect(screen, DARK_GREY, bg_rect, 1)
+        screen.blit(text_surface, text_surface.get_rect(center=(WIDTH // 2, CENTER_Y - 100)))
+
+def draw_spectrogram():
+    if not hit_times_ms:
+        return
+
+    total_spec_width = WIDTH * 0.8
+    spec_start_x = (WIDTH - total_spec_width) / 2
+    slot_width = total_spec_width / SPEC_WINDOW_SIZE
+    bar_width = slot_width * 0.7
+
+    spec_surface = pygame.Surface((total_spec_width, SPEC_HEIGHT), pygame.SRCALPHA)
+    spec_surface.fill(DARK_GREY)
+
+    for ms_level in [0, TIME_BAR, SPEC_MAX_TIME_MS]:
+        y_pos = SPEC_HEIGHT * (1.0 - ms_level / SPEC_MAX_TIME_MS)
+        pygame.draw.line(spec_surface, GREY, (0, y_pos), (total_spec_width, y_pos), 1)
+        label_surf = font_tiny.render(f"{ms_level}ms", True, WHITE)
+        screen.blit(label_surf, label_surf.get_rect(centery=SPEC_Y_POS + y_pos, right=spec_start_x - 5))
+
+    for i, (hit_time, is_miss) in enumerate(zip(hit_times_ms, miss_flags)):
+        bar_height = SPEC_HEIGHT * min(hit_time / SPEC_MAX_TIME_MS, 1.0)
+        bar_x = i * slot_width + (slot_width - bar_width) / 2
+        bar_y = SPEC_HEIGHT - bar_height
+        pygame.draw.rect(spec_surface, get_time_color(hit_time, is_miss), (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(spec_surface, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
+
+    screen.blit(spec_surface, (spec_start_x, SPEC_Y_POS))
+    pygame.draw.rect(screen, GREY, (spec_start_x, SPEC_Y_POS, total_spec_width, SPEC_HEIGHT), 1)
+
+def draw_cursor():
+    # Draw a small white rectangle with black border
+    rect_x = int(cursor_x) - 1
+    rect_y = int(cursor_y) - 1
+    pygame.draw.rect(screen, BLACK, (rect_x - 1, rect_y - 1, 4, 4))
+    pygame.draw.rect(screen, WHITE, (rect_x, rect_y, 2, 2))
+
+# --- Game Loop ---
+running = True
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
+start_block(0)
+start_delay(time.time())
+
+while running:
+    current_frame_time = time.time()
+
+    # --- Event Handling ---
+    keys_pressed = pygame.key.get_pressed()
+    shift_pressed = keys_pressed[pygame.K_LSHIFT] or keys_pressed[pygame.K_RSHIFT]
+
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT: running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE: running = False
+
+            # Fire with left CTRL key (single press)
+            if event.key == pygame.K_LCTRL:
+                process_click()
+
+            # Skip to the next choice count, the current trial is dropped
+            if event.key == pygame.K_n:
+                stimulus_active = False
+                start_block(block_index + 1)
+                start_delay(time.time())
+
+            # Sensitivity Adjustments
+            current_sens_increment = VALORANT_SENS_INCREMENT_COARSE if shift_pressed else VALORANT_SENS_INCREMENT_FINE
+            sens_changed = False
+            if event.key == pygame.K_UP: target_valorant_sens += current_sens_increment; sens_changed = True
+            elif event.key == pygame.K_DOWN: target_valorant_sens -= current_sens_increment; sens_changed = True
+            elif event.key == pygame.K_RIGHT: target_dpi += DPI_INCREMENT; sens_changed = True
+            elif event.key == pygame.K_LEFT: target_dpi -= DPI_INCREMENT; sens_changed = True
+
+            target_valorant_sens = max(0.001, round(target_valorant_sens, 5))
+            target_dpi = max(50, target_dpi)
+            if sens_changed:
+                 sensitivity_multiplier = calculate_sensitivity_multiplier(target_dpi, target_valorant_sens)
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left mouse button
+                process_click()
+
+        if event.type == pygame.MOUSEMOTION:
+            dx, dy = event.rel
+            cursor_x += dx * sensitivity_multiplier
+            cursor_y += dy * sensitivity_multiplier
+            cursor_x = max(0, min(WIDTH - 1, cursor_x))
+            cursor_y = max(0, min(HEIGHT - 1, cursor_y))
+
+    # --- Game Logic ---
+    expire_stimulus(current_frame_time)
+    if is_delaying and current_frame_time - delay_start_time >= current_delay_duration:
+        is_delaying = False
+        show_stimulus()
+
+    # --- Drawing ---
+    screen.fill(BLACK)
+    draw_instructions_and_fps(clock.get_fps())
+    draw_sensitivity_info()
+    draw_result()
+    draw_spectrogram()
+    board, board_pos = slot_boards[n_choices]
+    screen.blit(board, board_pos)
+
+    # --- Late Latch ---
+    # Motion that arrived while the UI was drawn, so the cursor goes out where the mouse is now
+    latch_dx, latch_dy = drain_motion()
+    cursor_x = max(0, min(WIDTH - 1, cursor_x + latch_dx * sensitivity_multiplier))
+    cursor_y = max(0, min(HEIGHT - 1, cursor_y + latch_dy * sensitivity_multiplier))
+
+    # Stimulus: one blit of the pre-built lit slot
+    if stimulus_active:
+        lit_sprites.blit(screen, SLOT_RADIUS, YELLOW, slots[lit_slot])
+
+    draw_cursor() # Draw cursor last, on top of everything
+    pygame.display.flip()
+    if stimulus_active and start_time is None:
+        # The stimulus is on screen from this flip on
+        start_time = time.time()
+    session_log.flush()
+    clock.tick()
+
+# --- Cleanup ---
+session_log.close()
+pygame.mouse.set_visible(True)
+pygame.event.set_grab(False)
+pygame.quit()
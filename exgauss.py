@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import sys
+import time
+import numpy as np
+from session_log import SESSIONS_DIR, list_sessions, read_session
+
+# Ex-Gaussian reaction time analytics.
+# RT distributions are a normal part (mu, sigma) plus an exponential tail (tau):
+# mu moving is the typical speed changing, tau growing is more occasional lapses,
+# and the mean (mu + tau) can't tell the two apart.
+# Parameters are maximum-likelihood fits, the log-likelihood is evaluated over
+# the whole RT array at once. Timeouts are right-censored at their timeout
+# rather than dropped, they are exactly the lapses tau is about.
+#
+# Parsing years of session files is the slow part, so each file's RTs (and its
+# own fit) are cached in CACHE_FILE keyed by size and mtime, and the pooled fits
+# are only redone when the set of session files has changed.
+#
+# Run directly for a report over all logged sessions: python exgauss.py [mode] [day|sens|session]
+
+CACHE_FILE = os.path.join(SESSIONS_DIR, "exgauss_cache.json")
+CACHE_VERSION = 1
+MIN_TRIALS = 20           # Fewer RTs than this give no meaningful tail
+HIT_OUTCOMES = ("hit", "correct")
+MAX_ITERATIONS = 600
+
+
+def log_erfc(y):
+    """log(erfc(y)) without underflow, Chebyshev fit from Numerical Recipes (rel. error < 1.2e-7)"""
+    y = np.asarray(y, dtype=float)
+    t = 1.0 / (1.0 + 0.5 * np.abs(y))
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (
+        0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))))))
+    log_tail = np.log(t) - y * y + poly  # log(erfc(|y|))
+    return np.where(y >= 0, log_tail, np.log(2.0 - np.exp(log_tail)))
+
+
+def log_norm_cdf(z):
+    return np.log(0.5) + log_erfc(-np.asarray(z) / np.sqrt(2.0))
+
+
+def log_likelihood(params, rt, censored):
+    """Ex-Gaussian log-likelihood, censored entries contribute log P(RT > rt)"""
+    mu, sigma, tau = params
+    z = (rt - mu) / sigma - sigma / tau
+    tail = (mu - rt) / tau + sigma * sigma / (2 * tau * tau) + log_norm_cdf(z)
+    log_pdf = tail - np.log(tau)
+    log_survival = np.logaddexp(log_norm_cdf((mu - rt) / sigma), tail)
+    return np.where(censored, log_survival, log_pdf).sum()
+
+
+def moment_estimate(rt):
+    """Method of moments starting point, the tail from the skewness"""
+    mean = rt.mean()
+    sd = max(rt.std(), 1.0)
+    skew = max(((rt - mean) ** 3).mean() / sd ** 3, 0.1)
+    tau = sd * min((skew / 2) ** (1 / 3), 0.9)
+    sigma = np.sqrt(max(sd * sd - tau * tau, 1.0))
+    return mean - tau, sigma, tau
+
+
+def nelder_mead(f, x0, steps, iterations=MAX_ITERATIONS, tolerance=1e-6):
+    """Minimize f from x0, standard reflection/expansion/contraction/shrink"""
+    simplex = [np.array(x0, dtype=float)]
+    for i, step in enumerate(steps):
+        point = simplex[0].copy()
+        point[i] += step
+        simplex.append(point)
+    values = [f(p) for p in simplex]
+    for _ in range(iterations):
+        order = np.argsort(values)
+        simplex = [simplex[i] for i in order]
+        values = [values[i] for i in order]
+        if abs(values[-1] - values[0]) <= tolerance * (abs(values[0]) + tolerance):
+            break
+        centroid = np.mean(simplex[:-1], axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        f_reflected = f(reflected)
+        if f_reflected < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            f_expanded = f(expanded)
+            simplex[-1], values[-1] = (expanded, f_expanded) if f_expanded < f_reflected else (reflected, f_reflected)
+        elif f_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, f_reflected
+        else:
+            contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            f_contracted = f(contracted)
+            if f_contracted < values[-1]:
+                simplex[-1], values[-1] = contracted, f_contracted
+            else:
+                simplex = [simplex[0] + 0.5 * (p - simplex[0]) for p in simplex]
+                values = [values[0]] + [f(p) for p in simplex[1:]]
+    best = int(np.argmin(values))
+    return simplex[best], values[best]
+
+
+def fit_exgauss(rt, censored=None):
+    """(mu, sigma, tau) in ms, None with too few uncensored RTs"""
+    rt = np.asarray(rt, dtype=float)
+    censored = np.zeros(len(rt), dtype=bool) if censored is None else np.asarray(censored, dtype=bool)
+    if (~censored).sum() < MIN_TRIALS:
+        return None
+    mu, sigma, tau = moment_estimate(rt[~censored])
+
+    def cost(x):
+        # sigma and tau on a log scale, so the search can't make them negative
+        value = -log_likelihood((x[0], np.exp(x[1]), np.exp(x[2])), rt, censored)
+        return value if np.isfinite(value) else np.inf
+
+    best, _ = nelder_mead(cost, [mu, np.log(sigma), np.log(tau)], [sigma * 0.5, 0.3, 0.3])
+    return float(best[0]), float(np.exp(best[1])), float(np.exp(best[2]))
+
+
+def session_rows(path):
+    """Cache entry of one session file: its mode, day and per-trial sens, RT and censoring"""
+    header, trials = read_session(path)
+    sens, rt, censored = [], [], []
+    for trial in trials:
+        if trial.get("flagged") or trial.get("rt_ms") is None:
+            continue
+        outcome = trial.get("outcome")
+        if outcome in HIT_OUTCOMES or outcome == "timeout":
+            sens.append(trial.get("sens"))
+            rt.append(trial["rt_ms"])
+            censored.append(outcome == "timeout")
+    start = header.get("start", os.path.getmtime(path))
+    entry = {
+        "mode": header.get("mode", "unknown"),
+        "day": time.strftime("%Y-%m-%d", time.localtime(start)),
+        "sens": sens, "rt": rt, "censored": censored,
+    }
+    entry["fit"] = fit_exgauss(rt, censored)
+    return entry
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"version": CACHE_VERSION, "files": {}, "pooled": {}}
+    if cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION, "files": {}, "pooled": {}}
+    return cache
+
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+
+def refresh_cache(cache, mode=None):
+    """Re-read only session files that are new or changed, returns the current ones' entries and whether any were"""
+    entries = {}
+    changed = False
+    for path in list_sessions(mode):
+        name = os.path.basename(path)
+        stat = os.stat(path)
+        stamp = [stat.st_size, stat.st_mtime]
+        cached = cache["files"].get(name)
+        if cached is None or cached["stamp"] != stamp:
+            cached = session_rows(path)
+            cached["stamp"] = stamp
+            cache["files"][name] = cached
+            changed = True
+        entries[name] = cached
+    for name in list(cache["files"]):
+        if not os.path.exists(os.path.join(SESSIONS_DIR, name)):
+            del cache["files"][name]  # Deleted session
+            changed = True
+    return entries, changed
+
+
+def group_key(entry, sens, by):
+    if by == "day":
+        return entry["mode"], entry["day"]
+    if by == "sens":
+        return entry["mode"], sens
+    return (entry["mode"],)
+
+
+def pooled_fits(entries, by=None):
+    """Fit per (mode[, day or sens]) over all trials of all sessions"""
+    groups = {}
+    for entry in entries.values():
+        for sens, rt, censored in zip(entry["sens"], entry["rt"], entry["censored"]):
+            rows = groups.setdefault(group_key(entry, sens, by), ([], []))
+            rows[0].append(rt)
+            rows[1].append(censored)
+    results = []
+    for key in sorted(groups, key=lambda k: tuple("" if v is None else str(v) for v in k)):
+        rt, censored = groups[key]
+        fit = fit_exgauss(rt, censored)
+        if fit is None:
+            continue
+        mu, sigma, tau = fit
+        results.append({"group": list(key), "trials": len(rt), "timeouts": int(sum(censored)),
+                        "mu": mu, "sigma": sigma, "tau": tau})
+    return results
+
+
+def session_fits(entries):
+    """Each session file's own fit, straight from its cache entry"""
+    results = []
+    for name, entry in sorted(entries.items(), key=lambda item: item[1]["stamp"][1]):
+        if entry["fit"] is None:
+            continue
+        mu, sigma, tau = entry["fit"]
+        stamp = name[len(entry["mode"]) + 1:-len(".jsonl")]  # <mode>_<date>_<time>.jsonl
+        results.append({"group": [entry["mode"], stamp], "trials": len(entry["rt"]),
+                        "timeouts": int(sum(entry["censored"])), "mu": mu, "sigma": sigma, "tau": tau})
+    return results
+
+
+def history_fits(mode=None, by=None, cache_path=CACHE_FILE):
+    """Pooled fits over the session history, from cache while no session file has changed"""
+    cache = load_cache(cache_path)
+    entries, changed = refresh_cache(cache, mode)
+    if by == "session":
+        if changed:
+            save_cache(cache, cache_path)
+        return session_fits(entries)
+    signature = hashlib.sha1(json.dumps(sorted((name, e["stamp"]) for name, e in entries.items())).encode()).hexdigest()
+    key = f"{mode or '*'}:{by or 'mode'}"
+    pooled = cache["pooled"].get(key)
+    if pooled is None or pooled["signature"] != signature:
+        pooled = {"signature": signature, "results": pooled_fits(entries, by)}
+        cache["pooled"][key] = pooled
+        save_cache(cache, cache_path)
+    return pooled["results"]
+
+
+def main():
+    args = sys.argv[1:]
+    by = args.pop() if args and args[-1] in ("day", "sens", "session") else None
+    mode = args[0] if args else None
+    results = history_fits(mode, by)
+    if not results:
+        print(f"Not enough logged trials yet, need {MIN_TRIALS} reaction times per group.")
+        return
+
+    label = by or ""
+    print(f"{'mode':<16} {label:>15} {'n':>6} {'miss':>5} {'mu':>6} {'sigma':>6} {'tau':>6} {'mean':>6}")
+    for r in results:
+        mode_name, *rest = r["group"]
+        extra = "-" if not rest or rest[0] is None else (f"{rest[0]:.3f}" if by == "sens" else rest[0])
+        print(f"{mode_name:<16} {extra if by else '':>15} {r['trials']:>6} {r['timeouts']:>5} {r['mu']:>6.0f} "
+              f"{r['sigma']:>6.0f} {r['tau']:>6.0f} {r['mu'] + r['tau']:>6.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import math
+
+# Fatigue detection.
+# Two one-sided CUSUM charts run over the session's trials: one over reaction
+# times, one over misses. The session's first trials set the reference level,
+# after that each trial adds its excess over the reference, minus an allowance,
+# to a running sum that is floored at zero. Noise keeps the sum near zero,
+# while a lasting slowdown makes it climb past the threshold. That is a change
+# point. Its onset is where the sum last left zero. The RT baseline is the
+# first BASELINE_TRIALS hits, the miss baseline the first BASELINE_TRIALS trials.
+# After an alarm the reference moves to the level since the onset, so the next
+# alarm means a further drop, not the same one again.
+# Everything is running sums, one trial costs the same however long the session.
+
+BASELINE_TRIALS = 40
+RT_ALLOWANCE_SD = 0.5      # k: shifts smaller than this many SDs are ignored
+RT_THRESHOLD_SD = 8.0      # h: alarm once the sum passes this many SDs, high as the baseline is only an estimate
+RT_MIN_SD_MS = 15.0        # Floor for the baseline SD, a very steady start shouldn't make it twitchy
+MISS_RATE_RATIO = 2.0      # Miss chart looks for the miss rate doubling
+MISS_THRESHOLD = 5.0       # Log-likelihood ratio that raises a miss alarm
+MISS_RATE_FLOOR = 0.03     # Baseline miss rate used when the start had next to no misses
+MISS_RATE_CAP = 0.9        # Reference never goes above this, doubling must stay a probability
+
+
+class Cusum:
+    """One-sided upper CUSUM, reports (onset, mean since onset) when it crosses its threshold"""
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.sum = 0.0
+        self.onset = 0
+        self.since_total = 0.0
+        self.since_count = 0
+
+    def add(self, index, score, value):
+        """score is the trial's log-likelihood (or standardized) increment, value what gets averaged"""
+        if self.sum <= 0.0:
+            self.onset = index
+            self.since_total = 0.0
+            self.since_count = 0
+        self.sum = max(0.0, self.sum + score)
+        self.since_total += value
+        self.since_count += 1
+        if self.sum <= self.threshold:
+            return None
+        change = (self.onset, self.since_total / self.since_count)
+        self.sum = 0.0
+        return change
+
+
+class FatigueMonitor:
+    """Baseline from the first trials, then RT and miss CUSUMs against it"""
+    def __init__(self, baseline_trials=BASELINE_TRIALS):
+        self.baseline_trials = baseline_trials
+        self.trials = 0
+        self.rt_count = 0
+        self.rt_mean = 0.0
+        self.rt_m2 = 0.0
+        self.misses = 0
+        self.rt_ref = None
+        self.rt_sd = None
+        self.miss_ref = None
+        self.rt_chart = Cusum(RT_THRESHOLD_SD)
+        self.miss_chart = Cusum(MISS_THRESHOLD)
+        self.change_points = []
+
+    def add(self, rt_ms, missed):
+        """Feed one trial, rt_ms None for misses. Returns the change points it set off"""
+        self.trials += 1
+        found = []
+        if rt_ms is not None and self.rt_ref is None:
+            self.add_rt_baseline(rt_ms)
+        elif rt_ms is not None:
+            change = self.rt_chart.add(self.trials, (rt_ms - self.rt_ref) / self.rt_sd - RT_ALLOWANCE_SD, rt_ms)
+            if change:
+                found.append(self.change_point("rt", change, self.rt_ref))
+                self.rt_ref = change[1]
+        if self.miss_ref is None:
+            self.add_miss_baseline(missed)
+        else:
+            found.extend(self.add_miss(missed))
+        self.change_points.extend(found)
+        return found
+
+    def add_miss(self, missed):
+        p0 = self.miss_ref
+        p1 = min(p0 * MISS_RATE_RATIO, 0.95)
+        score = math.log(p1 / p0) if missed else math.log((1 - p1) / (1 - p0))
+        change = self.miss_chart.add(self.trials, score, 1.0 if missed else 0.0)
+        if not change:
+            return []
+        found = [self.change_point("miss_rate", change, self.miss_ref)]
+        self.miss_ref = min(max(change[1], MISS_RATE_FLOOR), MISS_RATE_CAP)
+        return found
+
+    def add_rt_baseline(self, rt_ms):
+        # Welford's running mean and variance
+        self.rt_count += 1
+        delta = rt_ms - self.rt_mean
+        self.rt_mean += delta / self.rt_count
+        self.rt_m2 += delta * (rt_ms - self.rt_mean)
+        if self.rt_count >= self.baseline_trials:
+            self.rt_ref = self.rt_mean
+            self.rt_sd = max(math.sqrt(self.rt_m2 / (self.rt_count - 1)), RT_MIN_SD_MS)
+
+    def add_miss_baseline(self, missed):
+        self.misses += missed
+        if self.trials >= self.baseline_trials:
+            self.miss_ref = min(max(self.misses / self.trials, MISS_RATE_FLOOR), MISS_RATE_CAP)
+
+    def change_point(self, signal, change, reference):
+        onset, level = change
+        return {"signal": signal, "trial": self.trials, "onset_trial": onset,
+                "reference": reference, "level": level}
+
+    def alert_text(self):
+        """HUD alert for the latest change point, None while there is nothing to report"""
+        if not self.change_points:
+            return None
+        latest = self.change_points[-1]
+        if latest["signal"] == "rt":
+            drop = f"RT +{latest['level'] - latest['reference']:.0f}ms"
+        else:
+            drop = f"misses {latest['reference']:.0%} -> {latest['level']:.0%}"
+        return f"FATIGUE: {drop} since trial {latest['onset_trial']} ({len(self.change_points)} change points)"
+
+    def status_text(self):
+        rt = f"{self.rt_ref:.0f}ms" if self.rt_ref is not None else f"{self.rt_count}/{self.baseline_trials} hits"
+        misses = f"{self.miss_ref:.0%} misses" if self.miss_ref is not None else f"{self.trials}/{self.baseline_trials} trials"
+        return f"Fatigue baseline: {rt}, {misses}  Change points: {len(self.change_points)}"
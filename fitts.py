@@ -0,0 +1,228 @@
+import math
+import sys
+import numpy as np
+from session_log import SessionLog, list_sessions, read_session
+
+# Fitts' law analytics.
+# Per trial: nominal index of difficulty ID = log2(D / W + 1), with D the distance
+# from the cursor at spawn to the target center and W the target diameter.
+# Per condition: effective width We = 4.133 * SD of the click endpoints along the
+# movement axis, effective distance De = mean movement amplitude, and
+# throughput TP = log2(De / We + 1) / mean movement time, in bits/s.
+# The endpoint is each trial's first click, hit or not, so misses widen We.
+#
+# Run directly for a report over all logged sessions: python fitts.py [mode]
+
+EFFECTIVE_WIDTH_FACTOR = 4.133  # sqrt(2*pi*e), the width holding 96% of a normal scatter
+MIN_TRIALS = 5                  # Fewer endpoints than this give no meaningful SD
+
+
+def index_of_difficulty(distance, width):
+    """Shannon formulation, works on scalars and arrays"""
+    return np.log2(np.asarray(distance, dtype=float) / np.asarray(width, dtype=float) + 1.0)
+
+
+def fitts_trial(start, target, click, radius, movement_ms):
+    """Fitts fields of one trial, stored in the session log as record["fitts"]"""
+    ax = target[0] - start[0]
+    ay = target[1] - start[1]
+    distance = math.hypot(ax, ay)
+    if distance > 0:
+        # Project the click onto the start -> target axis
+        amplitude = ((click[0] - start[0]) * ax + (click[1] - start[1]) * ay) / distance
+    else:
+        amplitude = 0.0
+    width = radius * 2
+    return {
+        "distance": distance,
+        "width": width,
+        "id": float(index_of_difficulty(distance, width)),
+        "amplitude": amplitude,
+        "deviation": amplitude - distance,
+        "movement_ms": movement_ms,
+    }
+
+
+def effective_throughput(amplitude_mean, deviation_sd, movement_ms_mean):
+    """Effective width, effective ID and throughput in bits/s, scalars or arrays"""
+    we = EFFECTIVE_WIDTH_FACTOR * np.asarray(deviation_sd, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ide = np.log2(np.maximum(amplitude_mean, 0.0) / we + 1.0)
+        tp = ide / (np.asarray(movement_ms_mean, dtype=float) / 1000.0)
+    return we, ide, tp
+
+
+class FittsAccumulator:
+    """Running session throughput, updated one trial at a time (Welford for the SD)"""
+    def __init__(self):
+        self.count = 0
+        self.id_sum = 0.0
+        self.amplitude_sum = 0.0
+        self.movement_ms_sum = 0.0
+        self.deviation_mean = 0.0
+        self.deviation_m2 = 0.0
+
+    def add(self, trial):
+        self.count += 1
+        self.id_sum += trial["id"]
+        self.amplitude_sum += trial["amplitude"]
+        self.movement_ms_sum += trial["movement_ms"]
+        delta = trial["deviation"] - self.deviation_mean
+        self.deviation_mean += delta / self.count
+        self.deviation_m2 += delta * (trial["deviation"] - self.deviation_mean)
+
+    def summary(self):
+        """(mean ID, effective width, throughput) or None until there are enough trials"""
+        if self.count < MIN_TRIALS:
+            return None
+        sd = math.sqrt(self.deviation_m2 / (self.count - 1))
+        if sd == 0:
+            return None
+        we, _, tp = effective_throughput(self.amplitude_sum / self.count, sd,
+                                         self.movement_ms_sum / self.count)
+        return self.id_sum / self.count, float(we), float(tp)
+
+    def summary_text(self):
+        summary = self.summary()
+        if summary is None:
+            return f"Throughput: need {MIN_TRIALS} trials"
+        mean_id, we, tp = summary
+        return f"Throughput: {tp:.2f} bits/s (ID {mean_id:.2f}, We {we:.0f}px)"
+
+
+class TrialLog:
+    """A circle trainer's session log, with the Fitts fields of each trial's first click"""
+    def __init__(self, mode, settings, cursor):
+        self.session_log = SessionLog(mode, settings)
+        self.stats = FittsAccumulator()  # This session's throughput, shown in the instructions
+        self.start_trial(cursor)
+
+    def start_trial(self, cursor):
+        """Call at every spawn with the cursor position, the movement starts there"""
+        self.spawn_cursor = cursor
+        self.clicked = False
+        self.fitts = None
+
+    def click(self, target, cursor, radius, movement_ms):
+        """The trial's first click is its Fitts endpoint, whether it hit or not"""
+        if self.clicked:
+            return
+        self.clicked = True
+        self.fitts = fitts_trial(self.spawn_cursor, target, cursor, radius, movement_ms)
+        self.stats.add(self.fitts)
+
+    def write(self, start_time, outcome, rt_ms, target, radius, dpi, sens, **fields):
+        """One trial record, fields are the trainer's own extras"""
+        self.session_log.write({
+            "type": "trial",
+            "time": start_time,
+            "outcome": outcome,
+            "rt_ms": rt_ms,
+            "target": list(target),
+            "radius": radius,
+            **fields,
+            "dpi": dpi,
+            "sens": sens,
+            "fitts": self.fitts,
+        })
+
+    def summary_text(self):
+        return self.stats.summary_text()
+
+    def flush(self):
+        self.session_log.flush()
+
+    def close(self):
+        self.session_log.close()
+
+
+def bulk_throughput(rows):
+    """Throughput per condition over many trials at once
+
+    rows are (mode, width, sens, distance, amplitude, deviation, movement_ms)
+    tuples. Trials are grouped by (mode, width, sens), and each group gets
+    its trial count, mean ID, effective width, effective ID and throughput.
+    """
+    if not rows:
+        return []
+    keys = [(mode, width, sens) for mode, width, sens, *_ in rows]
+    unique_keys = sorted(set(keys), key=lambda k: (k[0], k[1], -1 if k[2] is None else k[2]))
+    index = {key: i for i, key in enumerate(unique_keys)}
+    group = np.array([index[key] for key in keys])
+    data = np.array([row[3:] for row in rows], dtype=float)
+    distance, amplitude, deviation, movement_ms = data.T
+    width = np.array([key[1] for key in keys], dtype=float)
+
+    n_groups = len(unique_keys)
+    count = np.bincount(group, minlength=n_groups)
+
+    def mean(values):
+        return np.bincount(group, values, n_groups) / count
+
+    mean_id = mean(index_of_difficulty(distance, width))
+    amplitude_mean = mean(amplitude)
+    movement_mean = mean(movement_ms)
+    deviation_mean = mean(deviation)
+    squares = np.bincount(group, (deviation - deviation_mean[group]) ** 2, n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation_sd = np.sqrt(squares / (count - 1))
+    we, ide, tp = effective_throughput(amplitude_mean, deviation_sd, movement_mean)
+
+    results = []
+    for i, (mode, w, sens) in enumerate(unique_keys):
+        if count[i] < MIN_TRIALS or not np.isfinite(tp[i]):
+            continue
+        results.append({
+            "mode": mode, "width": w, "sens": sens, "trials": int(count[i]),
+            "id": float(mean_id[i]), "we": float(we[i]), "ide": float(ide[i]),
+            "movement_ms": float(movement_mean[i]), "throughput": float(tp[i]),
+        })
+    return results
+
+
+def fit_mode_regressions(conditions):
+    """Least-squares MT = a + b * IDe per mode over its conditions, b in ms/bit"""
+    fits = {}
+    for mode in sorted({c["mode"] for c in conditions}):
+        ide = np.array([c["ide"] for c in conditions if c["mode"] == mode])
+        mt = np.array([c["movement_ms"] for c in conditions if c["mode"] == mode])
+        if len(ide) < 2 or np.ptp(ide) == 0:
+            continue
+        b, a = np.polyfit(ide, mt, 1)
+        fits[mode] = (float(a), float(b))
+    return fits
+
+
+def history_rows(mode=None):
+    """Fitts rows of every logged trial, for bulk_throughput()"""
+    rows = []
+    for path in list_sessions(mode):
+        header, trials = read_session(path)
+        session_mode = header.get("mode", "unknown")
+        for trial in trials:
+            fitts = trial.get("fitts")
+            if not fitts or fitts["distance"] <= 0 or trial.get("flagged"):
+                continue
+            rows.append((session_mode, fitts["width"], trial.get("sens"), fitts["distance"],
+                         fitts["amplitude"], fitts["deviation"], fitts["movement_ms"]))
+    return rows
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+    conditions = bulk_throughput(history_rows(mode))
+    if not conditions:
+        print("No logged trials with Fitts data yet.")
+        return
+
+    print(f"{'mode':<16} {'W':>4} {'sens':>6} {'n':>5} {'ID':>5} {'We':>6} {'IDe':>5} {'MT ms':>7} {'TP bit/s':>9}")
+    for c in conditions:
+        sens = f"{c['sens']:.3f}" if c["sens"] is not None else "-"
+        print(f"{c['mode']:<16} {c['width']:>4.0f} {sens:>6} {c['trials']:>5} {c['id']:>5.2f} "
+              f"{c['we']:>6.1f} {c['ide']:>5.2f} {c['movement_ms']:>7.0f} {c['throughput']:>9.2f}")
+
+    for mode, (a, b) in fit_mode_regressions(conditions).items():
+        print(f"{mode}: MT = {a:.0f} + {b:.0f} * IDe ms")
+
+if __name__ == "__main__":
+    main()
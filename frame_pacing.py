@@ -0,0 +1,171 @@
+import ctypes
+import glob
+import os
+import sys
+import time
+from collections import deque
+import pygame
+
+# Frame pacing locked to the display's refresh rate.
+# Drop-in replacement for pygame.time.Clock: call tick() right after
+# pygame.display.flip(). Instead of sleeping right away, tick() sleeps until
+# just enough time is left before the next refresh to run one more frame, so
+# input is sampled as late as possible and shown on the next refresh.
+#
+# Modes:
+#   "refresh"  - paced to the detected refresh rate by the CPU, no vsync
+#   "vsync"    - flip() waits for vblank, tick() only delays the start of the frame
+#   "uncapped" - no waiting at all
+
+FALLBACK_REFRESH_HZ = 60
+SAFETY_MARGIN_S = 0.0015   # Headroom between the end of a frame and the refresh
+SPIN_THRESHOLD_S = 0.002   # Below this, spin instead of trusting time.sleep()
+WORK_HISTORY = 120         # Frames of render cost used for the estimate
+INTERVAL_HISTORY = 240     # Present intervals kept for the stats
+
+
+class SDLDisplayMode(ctypes.Structure):
+    _fields_ = [("format", ctypes.c_uint32), ("w", ctypes.c_int), ("h", ctypes.c_int),
+                ("refresh_rate", ctypes.c_int), ("driverdata", ctypes.c_void_p)]
+
+
+def load_sdl_library():
+    """The SDL2 library pygame itself runs on, None if it can't be found"""
+    base = os.path.dirname(pygame.__file__)
+    # Wheels bundle it next to the package, system builds link the shared one
+    patterns = [os.path.join(base, "SDL2.dll"), os.path.join(base, ".dylibs", "libSDL2*.dylib"),
+                os.path.join(base + ".libs", "libSDL2-2*.so*")]
+    candidates = [path for pattern in patterns for path in glob.glob(pattern)]
+    candidates += ["libSDL2-2.0.so.0", "libSDL2.dylib", "SDL2.dll"]
+    for path in candidates:
+        try:
+            return ctypes.CDLL(path)
+        except OSError:
+            continue
+    return None
+
+
+def sdl_refresh_rate(display=0):
+    """Refresh rate of a display's desktop mode via SDL_GetDesktopDisplayMode, set_mode() opens on display 0"""
+    # Not through pygame._sdl2.video.Window: dropping the one from_display_module()
+    # returns destroys pygame's own window
+    sdl = load_sdl_library()
+    if sdl is None or not pygame.display.get_init():
+        return None
+    mode = SDLDisplayMode()
+    if sdl.SDL_GetDesktopDisplayMode(display, ctypes.byref(mode)) != 0:
+        return None
+    return mode.refresh_rate if mode.refresh_rate > 1 else None  # 0 means unknown
+
+
+def detect_refresh_rate(fallback=FALLBACK_REFRESH_HZ):
+    """Refresh rate of the desktop display mode, fallback if it can't be queried"""
+    # pygame-ce
+    get_rates = getattr(pygame.display, "get_desktop_refresh_rates", None)
+    if get_rates:
+        try:
+            rates = get_rates()
+            if rates and rates[0] > 1:
+                return rates[0]
+        except pygame.error:
+            pass
+
+    # Stock pygame, any platform
+    hz = sdl_refresh_rate()
+    if hz:
+        return hz
+
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            user32 = ctypes.windll.user32
+            dc = user32.GetDC(0)
+            hz = ctypes.windll.gdi32.GetDeviceCaps(dc, 116)  # VREFRESH
+            user32.ReleaseDC(0, dc)
+            if hz > 1:  # 0 and 1 mean "hardware default"
+                return hz
+        except (AttributeError, OSError):
+            pass
+
+    print(f"Could not detect the display refresh rate, assuming {fallback}Hz. "
+          f"Pass refresh_hz to FramePacer if that's wrong.")
+    return fallback
+
+
+def set_display_mode(size, flags=0, pacing="refresh"):
+    """pygame.display.set_mode() with vsync requested when the pacing mode asks for it"""
+    if pacing == "vsync":
+        try:
+            # SDL only honors vsync for the SCALED renderer path
+            return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+        except pygame.error as e:
+            print(f"VSync unavailable: {e}")
+            print("Falling back to refresh-paced frames without vsync.")
+    return pygame.display.set_mode(size, flags)
+
+
+class FramePacer:
+    """Frame limiter that starts each frame as late as the refresh interval allows"""
+    def __init__(self, pacing="refresh", refresh_hz=None, fallback_hz=FALLBACK_REFRESH_HZ):
+        self.pacing = pacing
+        self.refresh_hz = refresh_hz or detect_refresh_rate(fallback_hz)
+        self.period = 1.0 / self.refresh_hz
+
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last_present = now
+        self.deadline = now + self.period
+        self.work_times = deque(maxlen=WORK_HISTORY)
+        self.intervals = deque(maxlen=INTERVAL_HISTORY)
+
+    def work_estimate(self):
+        """Render cost to plan for, the 90th percentile of recent frames"""
+        if not self.work_times:
+            return 0.0
+        ordered = sorted(self.work_times)
+        return ordered[int(len(ordered) * 0.9)]
+
+    def wait_until(self, wake):
+        remaining = wake - time.perf_counter()
+        if remaining > SPIN_THRESHOLD_S:
+            time.sleep(remaining - SPIN_THRESHOLD_S)
+        while time.perf_counter() < wake:
+            pass
+
+    def tick(self, framerate=None):
+        """Call right after flip(), returns milliseconds since the previous call like Clock.tick()"""
+        present = time.perf_counter()
+        interval = present - self.last_present
+        self.intervals.append(interval)
+        self.work_times.append(present - self.frame_start)
+        self.last_present = present
+
+        if self.pacing != "uncapped":
+            if self.pacing == "vsync":
+                # flip() just returned at a vblank, the next one is a period away
+                self.deadline = present + self.period
+            else:
+                self.deadline += self.period
+                if self.deadline <= present:
+                    # Missed refreshes, stay on the same grid
+                    missed = int((present - self.deadline) / self.period) + 1
+                    self.deadline += missed * self.period
+            self.wait_until(self.deadline - self.work_estimate() - SAFETY_MARGIN_S)
+
+        self.frame_start = time.perf_counter()
+        return int(interval * 1000)
+
+    def get_fps(self):
+        if not self.intervals:
+            return 0.0
+        return len(self.intervals) / sum(self.intervals)
+
+    def present_stats(self):
+        """Average and worst present interval in milliseconds over the recent frames"""
+        if not self.intervals:
+            return 0.0, 0.0
+        return sum(self.intervals) / len(self.intervals) * 1000, max(self.intervals) * 1000
+
+    def stats_text(self):
+        avg_ms, worst_ms = self.present_stats()
+        return f"Present: {avg_ms:.2f}ms avg / {worst_ms:.2f}ms max @ {self.refresh_hz}Hz {self.pacing}"
@@ -0,0 +1,148 @@
+import math
+import sys
+import numpy as np
+from session_log import list_sessions, read_session
+
+# Hick's law analytics for the choice reflex mode.
+# Choice reaction time grows with the information in the stimulus:
+# RT = a + b * log2(N) for N equally likely choices, so a is the simple
+# reaction time (N = 1) and b the cost per bit in ms.
+# Only correct, unflagged trials count towards the RTs, accuracy is kept per N.
+#
+# Run directly for a report over all logged sessions: python hick.py
+
+MODE = "choice_reflex"
+MIN_TRIALS = 5  # Per choice count, before its mean RT is shown or fitted
+SEQUENCE_ATTEMPTS = 50  # Greedy draws before balanced_sequence gives up on a clean one
+
+
+def balanced_sequence(n_slots, repeats, rng):
+    """Slot order for one block, every slot exactly repeats times, shuffled
+
+    No slot follows itself more than twice in a row, so a streak can't be
+    used to predict the next stimulus. Slots are drawn one at a time weighted by
+    how many of each are left, skipping the slot that just ran twice.
+    """
+    if n_slots < 2:
+        return [0] * repeats * n_slots
+    for _ in range(SEQUENCE_ATTEMPTS):
+        left = [repeats] * n_slots
+        sequence = []
+        while len(sequence) < n_slots * repeats:
+            blocked = sequence[-1] if len(sequence) >= 2 and sequence[-1] == sequence[-2] else None
+            weights = [0 if slot == blocked else count for slot, count in enumerate(left)]
+            if not any(weights):
+                break  # Only the blocked slot is left, start over
+            slot = rng.choices(range(n_slots), weights)[0]
+            left[slot] -= 1
+            sequence.append(slot)
+        if len(sequence) == n_slots * repeats:
+            return sequence
+    # Practically unreachable, keep the counts balanced and accept one long run at the end
+    return sequence + [slot for slot in range(n_slots) for _ in range(left[slot])]
+
+
+def information_bits(n_choices):
+    return math.log2(n_choices)
+
+
+class HickAccumulator:
+    """Running RT and accuracy per number of choices for this session"""
+    def __init__(self):
+        self.rt_sum = {}
+        self.correct = {}
+        self.total = {}
+
+    def add(self, n_choices, correct, rt_ms=None):
+        self.total[n_choices] = self.total.get(n_choices, 0) + 1
+        if correct:
+            self.correct[n_choices] = self.correct.get(n_choices, 0) + 1
+            self.rt_sum[n_choices] = self.rt_sum.get(n_choices, 0.0) + rt_ms
+
+    def mean_rt(self, n_choices):
+        count = self.correct.get(n_choices, 0)
+        if count < MIN_TRIALS:
+            return None
+        return self.rt_sum[n_choices] / count
+
+    def accuracy(self, n_choices):
+        total = self.total.get(n_choices, 0)
+        return self.correct.get(n_choices, 0) / total if total else None
+
+    def fit(self):
+        """(a, b) of RT = a + b * log2(N) over the choice counts with enough trials"""
+        points = [(information_bits(n), self.mean_rt(n)) for n in sorted(self.total)]
+        points = [(bits, rt) for bits, rt in points if rt is not None]
+        return fit_line(points)
+
+    def summary_lines(self):
+        lines = []
+        for n in sorted(self.total):
+            rt = self.mean_rt(n)
+            rt_text = f"{rt:.0f}ms" if rt is not None else "-"
+            lines.append(f"N={n}: RT {rt_text}, {self.accuracy(n) * 100:.0f}% correct ({self.total[n]} trials)")
+        fit = self.fit()
+        if fit:
+            lines.append(f"Hick: RT = {fit[0]:.0f} + {fit[1]:.0f} * log2(N) ms")
+        return lines
+
+
+def fit_line(points):
+    """Least-squares (intercept, slope) through (bits, rt) points, None with too few"""
+    if len(points) < 2:
+        return None
+    bits = np.array([p[0] for p in points])
+    rt = np.array([p[1] for p in points])
+    if np.ptp(bits) == 0:
+        return None
+    slope, intercept = np.polyfit(bits, rt, 1)
+    return float(intercept), float(slope)
+
+
+def history_table(mode=MODE):
+    """Per choice count over every logged session: trials, accuracy, mean and SD of the correct RTs"""
+    rts = {}
+    totals = {}
+    for path in list_sessions(mode):
+        _, trials = read_session(path)
+        for trial in trials:
+            n = trial.get("choices")
+            if n is None or trial.get("flagged"):
+                continue
+            totals[n] = totals.get(n, 0) + 1
+            if trial.get("outcome") == "correct":
+                rts.setdefault(n, []).append(trial["rt_ms"])
+
+    table = []
+    for n in sorted(totals):
+        values = np.array(rts.get(n, []))
+        table.append({
+            "choices": n,
+            "trials": totals[n],
+            "accuracy": len(values) / totals[n],
+            "rt_ms": float(values.mean()) if len(values) >= MIN_TRIALS else None,
+            "rt_sd": float(values.std(ddof=1)) if len(values) >= MIN_TRIALS else None,
+        })
+    return table
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else MODE
+    table = history_table(mode)
+    if not table:
+        print("No logged choice trials yet.")
+        return
+
+    print(f"{'N':>3} {'bits':>5} {'n':>5} {'correct':>8} {'RT ms':>7} {'SD':>6}")
+    for row in table:
+        rt = f"{row['rt_ms']:.0f}" if row["rt_ms"] is not None else "-"
+        sd = f"{row['rt_sd']:.0f}" if row["rt_sd"] is not None else "-"
+        print(f"{row['choices']:>3} {information_bits(row['choices']):>5.2f} {row['trials']:>5} "
+              f"{row['accuracy'] * 100:>7.0f}% {rt:>7} {sd:>6}")
+
+    fit = fit_line([(information_bits(row["choices"]), row["rt_ms"]) for row in table if row["rt_ms"] is not None])
+    if fit:
+        print(f"RT = {fit[0]:.0f} + {fit[1]:.0f} * log2(N) ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import pygame
+import sys
+import time
+from bisect import bisect_right
+import numpy as np
+from frame_pacing import FramePacer, set_display_mode
+from minmax_pyramid import MinMaxPyramid
+from exgauss import load_cache, refresh_cache, save_cache
+
+# Session history chart.
+# Every logged trial, oldest on the left: the grey band spans the fastest to the
+# slowest trial under each pixel column, the line is their mean and the red bars
+# at the bottom are the share of timeouts. Drawing goes through min/max pyramids
+# (see minmax_pyramid.py), so zooming and panning cost the same at any history length.
+# Trials come from the ex-Gaussian cache (see exgauss.py), new sessions are read once.
+#
+# Run: python history_view.py [mode]
+
+pygame.init()
+
+# --- Screen Setup ---
+WIDTH, HEIGHT = 1280, 720
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.RESIZABLE, FRAME_PACING)
+pygame.display.set_caption("Aim Trainer - History")
+
+# --- Colors ---
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+CYAN = (0, 255, 255)
+GREEN = (0, 255, 0)
+GREY = (150, 150, 150)
+BAND_COLOR = (70, 70, 90)
+GRID_COLOR = (40, 40, 40)
+SESSION_COLOR = (60, 60, 140)
+
+# --- Chart Configuration ---
+MARGIN_LEFT = 60
+MARGIN_RIGHT = 20
+MARGIN_TOP = 60
+MARGIN_BOTTOM = 40
+Y_MAX_MS = 600           # Top of the chart, slower trials are clipped
+GRID_STEP_MS = 100
+MISS_BAR_HEIGHT = 40     # A column of only timeouts fills this many px
+ZOOM_STEP = 1.25         # Per mouse wheel notch
+PAN_STEP = 0.1           # Share of the visible range per arrow key press
+VIEW_SMOOTHING = 0.3     # Share of the way to the target view covered each frame
+MIN_VISIBLE_TRIALS = 20
+
+# --- Trial History ---
+mode = sys.argv[1] if len(sys.argv) > 1 else None
+load_start = time.perf_counter()
+cache = load_cache()
+entries, changed = refresh_cache(cache, mode)
+if changed:
+    save_cache(cache)
+sessions = sorted(entries.items(), key=lambda item: item[1]["stamp"][1])
+rt = np.concatenate([np.asarray(e["rt"], dtype=np.float32) for _, e in sessions]) if sessions else np.zeros(0)
+missed = np.concatenate([np.asarray(e["censored"], dtype=np.float32) for _, e in sessions]) if sessions else np.zeros(0)
+session_starts = np.cumsum([0] + [len(e["rt"]) for _, e in sessions])[:-1].tolist()
+session_names = [name[:-len(".jsonl")] for name, _ in sessions]
+rt_pyramid = MinMaxPyramid(rt)
+miss_pyramid = MinMaxPyramid(missed)
+load_ms = (time.perf_counter() - load_start) * 1000
+total_trials = len(rt)
+print(f"{total_trials} trials from {len(sessions)} sessions, loaded in {load_ms:.0f}ms")
+
+font_small = pygame.font.Font(None, 22)
+font_tiny = pygame.font.Font(None, 18)
+
+# --- View State ---
+# Visible trial range, view_* is drawn and eases towards target_*
+view_start = target_start = 0.0
+view_end = target_end = float(max(total_trials, MIN_VISIBLE_TRIALS))
+dragging = False
+drag_x = 0
+
+
+def chart_rect():
+    width, height = screen.get_size()
+    return pygame.Rect(MARGIN_LEFT, MARGIN_TOP, width - MARGIN_LEFT - MARGIN_RIGHT,
+                       height - MARGIN_TOP - MARGIN_BOTTOM)
+
+def clamp_target():
+    """Keep the target range inside the history and no narrower than MIN_VISIBLE_TRIALS"""
+    global target_start, target_end
+    limit = float(max(total_trials, MIN_VISIBLE_TRIALS))
+    span = min(max(target_end - target_start, MIN_VISIBLE_TRIALS), limit)
+    target_start = min(max(target_start, 0.0), limit - span)
+    target_end = target_start + span
+
+def trial_at(x):
+    rect = chart_rect()
+    return view_start + (x - rect.left) / max(rect.width, 1) * (view_end - view_start)
+
+def zoom(factor, anchor_x):
+    """Zoom the target range about the trial under anchor_x"""
+    global target_start, target_end
+    anchor = trial_at(anchor_x)
+    target_start = anchor - (anchor - target_start) * factor
+    target_end = anchor + (target_end - anchor) * factor
+    clamp_target()
+
+def pan(trials):
+    global target_start, target_end
+    target_start += trials
+    target_end += trials
+    clamp_target()
+
+def ease_view():
+    global view_start, view_end
+    view_start += (target_start - view_start) * VIEW_SMOOTHING
+    view_end += (target_end - view_end) * VIEW_SMOOTHING
+    if abs(target_start - view_start) < 0.01 and abs(target_end - view_end) < 0.01:
+        view_start, view_end = target_start, target_end
+
+def y_for(ms, rect):
+    return rect.bottom - np.clip(ms, 0, Y_MAX_MS) / Y_MAX_MS * rect.height
+
+
+def draw_grid(rect):
+    for ms in range(0, Y_MAX_MS + 1, GRID_STEP_MS):
+        y = int(y_for(ms, rect))
+        pygame.draw.line(screen, GRID_COLOR, (rect.left, y), (rect.right, y))
+        label = font_tiny.render(f"{ms}", True, GREY)
+        screen.blit(label, label.get_rect(midright=(rect.left - 6, y)))
+    pygame.draw.rect(screen, GREY, rect, 1)
+
+def draw_session_marks(rect):
+    """Session boundaries, only when few enough are on screen to tell apart"""
+    first = bisect_right(session_starts, view_start)
+    last = bisect_right(session_starts, view_end)
+    if last - first > rect.width // 8:
+        return
+    scale = rect.width / (view_end - view_start)
+    for start in session_starts[first:last]:
+        x = rect.left + (start - view_start) * scale
+        pygame.draw.line(screen, SESSION_COLOR, (x, rect.top), (x, rect.bottom))
+
+def draw_series(rect):
+    lo, hi, mean = rt_pyramid.columns(view_start, view_end, rect.width)
+    _, _, miss_rate = miss_pyramid.columns(view_start, view_end, rect.width)
+    visible = ~np.isnan(mean)
+    xs = rect.left + np.nonzero(visible)[0]
+    y_lo = y_for(lo[visible], rect)
+    y_hi = y_for(hi[visible], rect)
+    y_mean = y_for(mean[visible], rect)
+    miss_heights = miss_rate[visible] * MISS_BAR_HEIGHT
+    for x, top, bottom, miss in zip(xs.tolist(), y_hi.tolist(), y_lo.tolist(), miss_heights.tolist()):
+        pygame.draw.line(screen, BAND_COLOR, (x, top), (x, bottom))
+        if miss >= 1:
+            pygame.draw.line(screen, RED, (x, rect.bottom - miss), (x, rect.bottom - 1))
+    if len(xs) > 1:
+        pygame.draw.lines(screen, GREEN, False, list(zip(xs.tolist(), y_mean.tolist())))
+
+def draw_hover(rect):
+    mouse_x, mouse_y = pygame.mouse.get_pos()
+    if not rect.collidepoint(mouse_x, mouse_y) or total_trials == 0:
+        return
+    per_column = (view_end - view_start) / rect.width
+    first = trial_at(mouse_x)
+    lo, hi, mean = rt_pyramid.columns(first, first + per_column, 1)
+    if np.isnan(mean[0]):
+        return
+    _, _, miss_rate = miss_pyramid.columns(first, first + per_column, 1)
+    session = max(bisect_right(session_starts, first) - 1, 0)
+    pygame.draw.line(screen, GREY, (mouse_x, rect.top), (mouse_x, rect.bottom))
+    text = (f"Trial {int(first)}  {session_names[session]}  "
+            f"min {lo[0]:.0f} / mean {mean[0]:.0f} / max {hi[0]:.0f} ms  timeouts {miss_rate[0]:.0%}")
+    surface = font_small.render(text, True, WHITE)
+    screen.blit(surface, surface.get_rect(bottomleft=(rect.left, rect.top - 6)))
+
+def draw_instructions(current_fps, draw_ms):
+    lines = [
+        f"FPS: {current_fps:.0f}  Draw: {draw_ms:.1f}ms",
+        f"{total_trials} trials, {len(sessions)} sessions{f' ({mode})' if mode else ''}  "
+        f"Showing {int(view_start)}-{int(view_end)}",
+        "Wheel: Zoom  Drag / LEFT/RIGHT: Pan  HOME: All  ESC: Quit",
+    ]
+    x = MARGIN_LEFT
+    for i, line in enumerate(lines):
+        surface = font_tiny.render(line, True, GREEN if i == 0 else CYAN)
+        screen.blit(surface, (x, 6))
+        x += surface.get_width() + 30
+
+
+# --- Main Loop ---
+running = True
+clock = FramePacer(FRAME_PACING, fallback_hz=60)
+draw_ms = 0.0
+
+while running:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT: running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE: running = False
+            if event.key == pygame.K_LEFT: pan(-(target_end - target_start) * PAN_STEP)
+            if event.key == pygame.K_RIGHT: pan((target_end - target_start) * PAN_STEP)
+            if event.key == pygame.K_HOME:
+                target_start, target_end = 0.0, float(max(total_trials, MIN_VISIBLE_TRIALS))
+        if event.type == pygame.MOUSEWHEEL:
+            zoom(ZOOM_STEP ** -event.y, pygame.mouse.get_pos()[0])
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            dragging = True
+            drag_x = event.pos[0]
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            dragging = False
+        if event.type == pygame.MOUSEMOTION and dragging:
+            rect = chart_rect()
+            pan(-(event.pos[0] - drag_x) / max(rect.width, 1) * (target_end - target_start))
+            drag_x = event.pos[0]
+
+    ease_view()
+    draw_start = time.perf_counter()
+    screen.fill(BLACK)
+    rect = chart_rect()
+    if rect.width > 0 and rect.height > 0:
+        draw_grid(rect)
+        draw_session_marks(rect)
+        draw_series(rect)
+        draw_hover(rect)
+    draw_instructions(clock.get_fps(), draw_ms)
+    draw_ms = (time.perf_counter() - draw_start) * 1000
+    pygame.display.flip()
+    clock.tick()
+
+pygame.quit()
@@ -3,6 +3,10 @@ import random
 import time
 import math
 import os # Import os module for path handling
+from target_sprites import TargetSpriteCache, ramp_color, ramp_colors
+from frame_pacing import FramePacer, set_display_mode
+from late_latch import drain_motion
+from fitts import TrialLog
 
 # Initialize Pygame
 pygame.init()
@@ -16,7 +20,11 @@ except pygame.error:
     print("Could not get display info, using default 800x600.")
     WIDTH, HEIGHT = 800, 600
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
 pygame.display.set_caption("Aim Trainer - Reaction Time Spectrogram")
 
 # --- Load Background Image and Sound Effect ---
@@ -108,6 +116,11 @@ last_color_change_time = 0
 # --- Circle Properties ---
 CIRCLE_RADIUS = 5
 
+# --- Target Sprites ---
+# Circle and image pre-rendered once for every color the target can take
+target_sprites = TargetSpriteCache(image, (-19, -6))
+target_sprites.prebuild([CIRCLE_RADIUS], [YELLOW] + ramp_colors())
+
 # --- Spawn Area Configuration ---
 SPAWN_AREA_SIZE = 300
 CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
@@ -194,6 +207,16 @@ cursor_x, cursor_y = CENTER_X, CENTER_Y
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
+# --- Session Log ---
+# One record per trial in sessions/horizontal_2_<date>.jsonl, with the Fitts fields
+# of the trial's first click (see fitts.py)
+trial_log = TrialLog("horizontal_2", {
+    "circle_radius": CIRCLE_RADIUS,
+    "spawn_area_size": SPAWN_AREA_SIZE,
+    "dpi": target_dpi,
+    "sens": target_valorant_sens,
+}, (cursor_x, cursor_y))
+
 
 def spawn_circle():
     global circle_x, circle_y, circle_active, start_time, timeout_expired, last_color_change_time, target_color, target_type
@@ -220,6 +243,7 @@ def spawn_circle():
     start_time = time.time()
     last_color_change_time = start_time
     target_color = YELLOW  # Reset target color when spawning
+    trial_log.start_trial((cursor_x, cursor_y))
     
     # Add target activation event to timeline
     # Use appropriate timeout based on target type
@@ -245,11 +269,7 @@ def update_target_color(current_time):
         progress = min(time_visible_ms / TARGET_TIMEOUT_MS, 1.0)
         
         # Generate a color that shifts from red to yellow as time progresses
-        r = 255
-        g = int(255 * progress)
-        b = 0
-        
-        target_color = (r, g, b)
+        target_color = ramp_color(progress)
 
 
 def draw_sensitivity_info():
@@ -269,6 +289,8 @@ def draw_sensitivity_info():
 def draw_instructions_and_fps(current_fps):
     instructions = [
         f"FPS: {current_fps:.0f}",
+        clock.stats_text(),
+        trial_log.summary_text(),
         f"Spawn Size: {SPAWN_AREA_SIZE}px",
         f"Hits (Last {SPEC_WINDOW_SIZE}): {len(hit_times_ms)}",
         f"Target Timeout: {TARGET_TIMEOUT_MS}ms / Center: {TARGET_CENTER_TIMEOUT_MS}ms",
@@ -529,6 +551,10 @@ def draw_cursor():
     # Draw white inner rectangle
     pygame.draw.rect(screen, WHITE, (rect_x, rect_y, rect_width, rect_height))
 
+# --- Trial Logging ---
+def log_trial(outcome, time_ms):
+    trial_log.write(start_time, outcome, time_ms, (circle_x, circle_y), CIRCLE_RADIUS, target_dpi, target_valorant_sens)
+
 # Function to process hit detection
 def process_hit():
     global circle_active, is_delaying, delay_start_time, current_delay_duration, last_hit_info, hit_times_ms, miss_flags, target_type
@@ -540,12 +566,14 @@ def process_hit():
     
     if circle_active:
         distance = math.hypot(cursor_x - circle_x, cursor_y - circle_y)
+        trial_log.click((circle_x, circle_y), (cursor_x, cursor_y), CIRCLE_RADIUS, (time.time() - start_time) * 1000)
         if distance <= CIRCLE_RADIUS:
             # --- HIT! ---
             time_taken_sec = time.time() - start_time
             time_taken_ms = time_taken_sec * 1000
             hit_times_ms.append(time_taken_ms)
             miss_flags.append(False)  # Not a miss
+            log_trial("hit", time_taken_ms)
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -583,7 +611,7 @@ def process_hit():
 
 # --- Game Loop ---
 running = True
-clock = pygame.time.Clock()
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
 
 while running:
     current_frame_time = time.time()
@@ -660,6 +688,7 @@ while running:
             last_hit_info = (circle_x, circle_y, current_timeout, True)  # True means it was a timeout
             hit_times_ms.append(current_timeout)  # Add timeout value to hit times
             miss_flags.append(True)  # This was a miss
+            log_trial("timeout", hit_times_ms[-1])
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -695,19 +724,26 @@ while running:
     draw_spectrogram()
     draw_timeline()  # Draw the timeline if visible
 
+    # --- Late Latch ---
+    # Motion that arrived while the UI was drawn, so the cursor goes out where the mouse is now
+    latch_dx, latch_dy = drain_motion()
+    cursor_x = max(0, min(WIDTH - 1, cursor_x + latch_dx * sensitivity_multiplier))
+    cursor_y = max(0, min(HEIGHT - 1, cursor_y + latch_dy * sensitivity_multiplier))
+
     # Game Elements (drawn OVER background and some UI)
     if circle_active and not timeout_expired:
-        pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS)
+        target_sprites.blit(screen, CIRCLE_RADIUS, target_color, (circle_x, circle_y))
         # Display different colors or indicators based on target type
         #if target_type == "center":
         #    pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS + 2, 1)  # Cyan outline for center targets
-        screen.blit(image, (circle_x-19, circle_y-6))
 
     draw_cursor() # Draw cursor last, on top of everything
     pygame.display.flip()
-    clock.tick(144)
+    trial_log.flush()
+    clock.tick()
 
 # --- Cleanup ---
+trial_log.close()
 pygame.mouse.set_visible(True)
 pygame.event.set_grab(False)
 pygame.quit()
@@ -3,6 +3,10 @@ import random
 import time
 import math
 import os # Import os module for path handling
+from target_sprites import TargetSpriteCache, ramp_color, ramp_colors
+from frame_pacing import FramePacer, set_display_mode
+from late_latch import drain_motion
+from fitts import TrialLog
 
 # Initialize Pygame
 pygame.init()
@@ -16,7 +20,11 @@ except pygame.error:
     print("Could not get display info, using default 800x600.")
     WIDTH, HEIGHT = 800, 600
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
 pygame.display.set_caption("Aim Trainer - Reaction Time Spectrogram")
 
 # --- Load Background Image and Sound Effect ---
@@ -110,35 +118,23 @@ last_color_change_time = 0
 # --- Level Configuration ---
 current_level = 0 # Start at level 0
 BASE_CIRCLE_RADIUS = 35
+# Each level shrinks the target by 5px, level 6 is the smallest
+LEVEL_RADII = [BASE_CIRCLE_RADIUS - 5 * level for level in range(7)]
 circle_radius = BASE_CIRCLE_RADIUS # This will be updated based on the level
-target_image_scaled = None # Initialize scaled target image
+
+# --- Target Sprites ---
+# Circle and image pre-rendered for every level radius and color, so a level change is just a lookup
+target_sprites = TargetSpriteCache(target_image_raw, (-19, -6))
+target_sprites.prebuild(LEVEL_RADII, [YELLOW] + ramp_colors())
 
 def update_radius_and_target_image(level):
-    """Updates the circle radius and scales the target image based on the level."""
-    global circle_radius, target_image_scaled, BASE_CIRCLE_RADIUS, target_image_raw
-    if level == 1:
-        circle_radius = BASE_CIRCLE_RADIUS - 5
-    elif level == 2:
-        circle_radius = BASE_CIRCLE_RADIUS - 10
-    elif level == 3:
-        circle_radius = BASE_CIRCLE_RADIUS - 15
-    elif level == 4:
-        circle_radius = BASE_CIRCLE_RADIUS - 20
-    elif level == 5:
-        circle_radius = BASE_CIRCLE_RADIUS - 25
-    elif level == 6:
-        circle_radius = BASE_CIRCLE_RADIUS - 30
-    else: # Level 0 or default
+    """Updates the circle radius based on the level, the sprites for it are already built."""
+    global circle_radius
+    if 0 <= level < len(LEVEL_RADII):
+        circle_radius = LEVEL_RADII[level]
+    else: # Default
         circle_radius = BASE_CIRCLE_RADIUS
 
-    # Scale the target image if it was loaded successfully
-    if target_image_raw:
-        # Scale image to roughly match the circle diameter
-        img_size = int(circle_radius * 2 * 0.8) # Scale factor (e.g., 80%)
-        target_image_scaled = pygame.transform.scale(target_image_raw, (img_size, img_size))
-    else:
-        target_image_scaled = None
-
 # Initialize radius and image for the starting level
 update_radius_and_target_image(current_level)
 
@@ -232,6 +228,16 @@ cursor_x, cursor_y = CENTER_X, CENTER_Y
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
+# --- Session Log ---
+# One record per trial in sessions/horizontal_5_<date>.jsonl, with the Fitts fields
+# of the trial's first click (see fitts.py)
+trial_log = TrialLog("horizontal_5", {
+    "circle_radius": BASE_CIRCLE_RADIUS,
+    "spawn_area_size": SPAWN_AREA_SIZE,
+    "dpi": target_dpi,
+    "sens": target_valorant_sens,
+}, (cursor_x, cursor_y))
+
 
 def spawn_circle():
     global circle_x, circle_y, circle_active, start_time, timeout_expired, last_color_change_time, target_color, target_type
@@ -253,6 +259,7 @@ def spawn_circle():
     start_time = time.time()
     last_color_change_time = start_time
     target_color = YELLOW  # Reset target color when spawning
+    trial_log.start_trial((cursor_x, cursor_y))
 
     # Add target activation event to timeline
     # Use appropriate timeout based on target type
@@ -278,11 +285,7 @@ def update_target_color(current_time):
         progress = min(time_visible_ms / TARGET_TIMEOUT_MS, 1.0)
 
         # Generate a color that shifts from red to yellow as time progresses
-        r = 255
-        g = int(255 * progress)
-        b = 0
-
-        target_color = (r, g, b)
+        target_color = ramp_color(progress)
 
 
 def draw_sensitivity_info():
@@ -304,6 +307,8 @@ def draw_instructions_and_fps(current_fps):
     global circle_radius, current_level
     instructions = [
         f"FPS: {current_fps:.0f}",
+        clock.stats_text(),
+        trial_log.summary_text(),
         f"Level: {current_level} (Radius: {circle_radius}px)", # Display current level and radius
         f"Spawn Size: {SPAWN_AREA_SIZE}px",
         f"Hits (Last {SPEC_WINDOW_SIZE}): {len(hit_times_ms)}",
@@ -566,6 +571,10 @@ def draw_cursor():
     # Draw white inner rectangle
     pygame.draw.rect(screen, WHITE, (rect_x, rect_y, rect_width, rect_height))
 
+# --- Trial Logging ---
+def log_trial(outcome, time_ms):
+    trial_log.write(start_time, outcome, time_ms, (circle_x, circle_y), circle_radius, target_dpi, target_valorant_sens)
+
 # Function to process hit detection
 def process_hit():
     # Use global circle_radius here for hit detection
@@ -585,12 +594,14 @@ def process_hit():
     # If circle is active, check for hit
     if circle_active:
         distance = math.hypot(cursor_x - circle_x, cursor_y - circle_y)
+        trial_log.click((circle_x, circle_y), (cursor_x, cursor_y), circle_radius, (time.time() - start_time) * 1000)
         if distance <= circle_radius: # Use the current circle_radius
             # --- HIT! ---
             time_taken_sec = time.time() - start_time
             time_taken_ms = time_taken_sec * 1000
             hit_times_ms.append(time_taken_ms)
             miss_flags.append(False)  # Not a miss
+            log_trial("hit", time_taken_ms)
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -630,7 +641,7 @@ def process_hit():
 
 # --- Game Loop ---
 running = True
-clock = pygame.time.Clock()
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
 
 while running:
     current_frame_time = time.time()
@@ -735,6 +746,7 @@ while running:
             last_hit_info = (circle_x, circle_y, current_timeout, True)  # True means it was a timeout
             hit_times_ms.append(current_timeout)  # Add timeout value to hit times
             miss_flags.append(True)  # This was a miss
+            log_trial("timeout", hit_times_ms[-1])
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -771,27 +783,25 @@ while running:
     draw_spectrogram()
     draw_timeline()  # Draw the timeline if visible
 
+    # --- Late Latch ---
+    # Motion that arrived while the UI was drawn, so the cursor goes out where the mouse is now
+    latch_dx, latch_dy = drain_motion()
+    cursor_x = max(0, min(WIDTH - 1, cursor_x + latch_dx * sensitivity_multiplier))
+    cursor_y = max(0, min(HEIGHT - 1, cursor_y + latch_dy * sensitivity_multiplier))
+
     # Game Elements (drawn OVER background and some UI)
     if circle_active and not timeout_expired:
-        # Draw the circle itself (optional, can be background for image)
-        pygame.draw.circle(screen, target_color, (circle_x, circle_y), circle_radius)
-
-        # Draw the scaled target image if it exists
-        if target_image_scaled:
-            # Calculate top-left corner for blitting based on center and image size
-
-            #img_rect = target_image_raw.get_rect(center=(circle_x, circle_y))
-            #screen.blit(target_image_raw, img_rect.topleft)
-            screen.blit(target_image_raw, (circle_x-19, circle_y-6))
-        #else: # Fallback if image didn't load - maybe draw an inner circle?
-        #    pygame.draw.circle(screen, WHITE, (circle_x, circle_y), circle_radius // 2)
+        # Circle and image come from one pre-built sprite
+        target_sprites.blit(screen, circle_radius, target_color, (circle_x, circle_y))
 
 
     draw_cursor() # Draw cursor last, on top of everything
     pygame.display.flip()
-    clock.tick(144) # Limit FPS
+    trial_log.flush()
+    clock.tick() # Limit FPS
 
 # --- Cleanup ---
+trial_log.close()
 pygame.mouse.set_visible(True)
 pygame.event.set_grab(False)
 pygame.quit()
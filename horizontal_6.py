@@ -3,6 +3,21 @@ import random
 import time
 import math
 import os # Import os module for path handling
+from target_sprites import TargetSpriteCache, ramp_color, ramp_colors
+from sdl2_renderer import Sdl2Display
+from frame_pacing import FramePacer, set_display_mode
+from late_latch import drain_motion_events
+from kinematics import TrajectoryRecorder, segment_trial
+from session_log import SessionLog
+from fitts import FittsAccumulator, fitts_trial
+from input_timeline import EventClock, MotionTrack
+from sim_loop import FixedRateLoop, SnapshotBuffer
+from trial_protocol import TrialProtocol
+from fatigue import FatigueMonitor
+from sens_experiment import SensExperiment
+from target_sequences import SequenceGenerator, SequenceQueue, visible_waypoints
+from strafe_paths import STRAFE_PATHS, BOT_TIMINGS
+from collections import deque, namedtuple
 
 # Initialize Pygame
 pygame.init()
@@ -16,8 +31,27 @@ except pygame.error:
     print("Could not get display info, using default 800x600.")
     WIDTH, HEIGHT = 800, 600
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-pygame.display.set_caption("Aim Trainer - Reaction Time Spectrogram")
+# --- Render Backend ---
+# "software" draws everything on the set_mode() surface
+# "sdl2" composites textures with pygame._sdl2, falling back to the SDL software renderer without a GPU
+# Only this trainer has the sdl2 backend so far, the others still draw in software
+RENDER_BACKEND = "software"
+gpu_display = None
+
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+
+if RENDER_BACKEND == "sdl2":
+    gpu_display = Sdl2Display("Aim Trainer - Reaction Time Spectrogram", (WIDTH, HEIGHT),
+                              vsync=FRAME_PACING == "vsync")
+    # The UI is drawn into a transparent layer that is only uploaded when it changes,
+    # draw_frame_sdl2() points screen at that layer's surface
+    screen = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+else:
+    screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
+    pygame.display.set_caption("Aim Trainer - Reaction Time Spectrogram")
 
 # --- Load Background Image and Sound Effect ---
 background_image = None # Initialize as None
@@ -70,7 +104,9 @@ try:
     print(f"Loading background image from: {image_path}") # Debug print
 
     # Load the image
-    raw_background = pygame.image.load(image_path).convert() # Use convert for potential performance boost
+    raw_background = pygame.image.load(image_path)
+    if gpu_display is None:
+        raw_background = raw_background.convert() # Use convert for potential performance boost
 
     # Scale the image to fit the screen resolution
     background_image = pygame.transform.scale(raw_background, (WIDTH, HEIGHT))
@@ -87,7 +123,9 @@ except FileNotFoundError:
     # background_image will remain None
 
 # Load the image
-image = pygame.image.load("p1.png").convert()
+image = pygame.image.load("p1.png")
+if gpu_display is None:
+    image = image.convert()
 
 # Set white (255, 255, 255) as the transparent color
 image.set_colorkey((255, 255, 255))
@@ -115,6 +153,11 @@ last_color_change_time = 0
 # --- Circle Properties ---
 CIRCLE_RADIUS = 35 - 15
 
+# --- Target Sprites ---
+# Circle and image pre-rendered once for every color the target can take
+target_sprites = TargetSpriteCache(image, (-12, -6))
+target_sprites.prebuild([CIRCLE_RADIUS], [YELLOW] + ramp_colors())
+
 # --- Spawn Area Configuration ---
 SPAWN_AREA_SIZE = 100
 CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
@@ -143,18 +186,87 @@ first_move_time = 0           # Time when first mouse movement was detected
 move_reaction_times = []      # List to store movement reaction times
 last_move_reaction_ms = None  # Store the last movement reaction time for display
 
+# --- Trial Kinematics ---
+# Cursor trajectory of the current trial, split into reaction, flick and
+# correction phases when the trial ends (see kinematics.py)
+trajectory = TrajectoryRecorder()
+last_kinematics = None  # segment_trial() result of the last finished trial
+
+# --- Fitts Analytics ---
+# The first click of each trial is its endpoint for effective width and throughput
+fitts_stats = FittsAccumulator()
+fitts_text = fitts_stats.summary_text()
+trial_fitts = None
+
 # --- Target Timeout Configuration ---
 TARGET_TIMEOUT_MS = 500  # Target disappears after x ms
 TARGET_CENTER_TIMEOUT_MS = 500  # Faster timeout for center targets
 timeout_expired = False  # Track if the target timed out
 
+# --- Strafing Targets ---
+# Targets move along an analytic strafe path once they are current (see
+# strafe_paths.py), None keeps them static. With STRAFE_TIMING the timeout and
+# delay are the recorded bot timings instead of the ones configured here.
+STRAFE_PATH = None  # "constant", "accelerate", "counter_strafe" or "adad"
+STRAFE_SPEED_PX_S = 300
+STRAFE_TIMING = "valorant_hard"
+bot_timing = BOT_TIMINGS[STRAFE_TIMING] if STRAFE_PATH and STRAFE_TIMING else None
+if bot_timing:
+    TARGET_TIMEOUT_MS = TARGET_CENTER_TIMEOUT_MS = bot_timing.timeout_ms
+
+def make_strafe_path(rng):
+    """Strafe path of a new waypoint, starting in a random direction"""
+    return STRAFE_PATHS[STRAFE_PATH](rng.choice((1, -1)), STRAFE_SPEED_PX_S)
+
+# --- Target Sequences ---
+# Every trial is a pregenerated sequence of waypoints (see target_sequences.py):
+# the plain goal TARGET_OFFSET_PX to either side, a stretch goal further out in
+# the same color, or an unnecessary decoy step to the other side before the goal
+TARGET_OFFSET_PX = 300
+STRETCH_GOAL_PX = 350
+DECOY_OFFSET_PX = 100
+# Single targets only by default: a hit's RT runs from the spawn to the last waypoint,
+# so mixing in stretch or decoy drills (e.g. 0.15 each) makes the RT stats bimodal
+SEQUENCE_WEIGHTS = {"single": 1.0}
+sequences = SequenceQueue(SequenceGenerator((CENTER_X, CENTER_Y), TARGET_OFFSET_PX, STRETCH_GOAL_PX,
+                                            DECOY_OFFSET_PX, TARGET_TIMEOUT_MS, weights=SEQUENCE_WEIGHTS,
+                                            path_factory=make_strafe_path if STRAFE_PATH else None))
+current_drill = None
+waypoints = ()
+waypoint_index = 0
+waypoint_start_time = 0.0
+waypoint_splits = []  # Per waypoint timing of the current trial, goes to the session log
+
 # --- Delay Configuration ---
+# Foreperiod: DELAY_MIN_S plus an exponential wait with mean DELAY_MEAN_EXTRA_S,
+# so the spawn can't be timed from how long the delay has already lasted
 DELAY_MIN_S = 1.0
+DELAY_MEAN_EXTRA_S = 0.6
 DELAY_MAX_S = 2.0
 is_delaying = False
 delay_start_time = 0.0
 current_delay_duration = 0.0
 
+# --- Trial Protocol ---
+# Catch trials show no target for TARGET_TIMEOUT_MS, clicking then is a false alarm.
+# Clicks during the delay are false starts and restart it, hits and movement onsets
+# under the floor are anticipations. None of them count towards the stats.
+CATCH_TRIAL_RATE = 0.0  # Off by default, e.g. 0.15 to have the odd trial show nothing
+ANTICIPATION_FLOOR_MS = 100
+protocol = TrialProtocol(CATCH_TRIAL_RATE, ANTICIPATION_FLOOR_MS,
+                         DELAY_MIN_S, DELAY_MEAN_EXTRA_S, DELAY_MAX_S)
+protocol_text = protocol.summary_text()
+catch_active = False
+catch_start_time = 0.0
+
+# --- Fatigue Detection ---
+# CUSUM charts over reaction times and misses against the session's first trials,
+# each change point goes to the session log and raises the HUD alert (see fatigue.py)
+fatigue = FatigueMonitor()
+fatigue_text = fatigue.status_text()
+fatigue_alert = None
+FATIGUE_ALERT_COLOR = RED
+
 font_large = pygame.font.Font(None, 36)  # Increased font size for top timing display
 font_medium = pygame.font.Font(None, 24)
 font_small = pygame.font.Font(None, 22)
@@ -176,6 +288,8 @@ TARGET_ACTIVE_COLOR = (150, 150, 255, 150)  # Semi-transparent blue
 HIT_MARKER_COLOR = GREEN
 MISS_MARKER_COLOR = RED
 OFF_TARGET_HIT_COLOR = PURPLE  # New color for off-target hits
+FALSE_START_COLOR = ORANGE
+CATCH_TRIAL_COLOR = (120, 120, 120, 120)  # Semi-transparent grey
 TIMELINE_AXIS_COLOR = GREY
 FIRST_MOVE_MARKER_COLOR = (100, 200, 255)  # Light blue for first move markers
 
@@ -184,7 +298,7 @@ show_timeline = True  # New variable to track timeline visibility
 
 # --- Timeline Data Structure ---
 # List of event tuples: (timestamp, event_type, duration)
-# event_type: "target_active", "hit", "miss", "off_target_hit", "first_move"
+# event_type: "target_active", "catch", "hit", "miss", "off_target_hit", "false_start", "first_move", "fatigue"
 timeline_events = []
 
 # --- Sensitivity Simulation Settings ---
@@ -203,44 +317,94 @@ def calculate_sensitivity_multiplier(dpi, sens):
 
 sensitivity_multiplier = calculate_sensitivity_multiplier(target_dpi, target_valorant_sens)
 
+# --- Sensitivity Experiment ---
+# Val sens values to compare at the current DPI, e.g. [0.18, 0.2, 0.22], None for
+# manual tuning. They are interleaved in randomized blocks until one is clearly
+# faster or more accurate, then that one is kept (see sens_experiment.py).
+# The sensitivity keys are locked while the test runs.
+SENS_EXPERIMENT = None
+SENS_BLOCK_TRIALS = 5
+experiment = SensExperiment(SENS_EXPERIMENT, SENS_BLOCK_TRIALS) if SENS_EXPERIMENT else None
+experiment_text = experiment.status_text() if experiment else None
+
+def apply_experiment_sens():
+    """Switch to the sensitivity the experiment wants for the next trial"""
+    global target_valorant_sens, sensitivity_multiplier
+    target_valorant_sens = experiment.sens() or target_valorant_sens
+    sensitivity_multiplier = calculate_sensitivity_multiplier(target_dpi, target_valorant_sens)
+
+if experiment:
+    apply_experiment_sens()
+
 # --- Custom Cursor ---
 cursor_x, cursor_y = CENTER_X, CENTER_Y
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
 
-def spawn_circle():
-    global circle_x, circle_y, circle_active, start_time, timeout_expired, last_color_change_time, target_color, target_type
+def spawn_circle(now):
+    global circle_active, start_time, timeout_expired
     global has_moved, first_move_time  # Reset first move tracking variables
+    global trial_fitts, current_drill, waypoints, waypoint_index, waypoint_splits
     
     # Reset movement tracking for the new target
     has_moved = False
     first_move_time = 0
     
-    # Determine target position based on target_type
-    if target_type != "random" and False:
-        # Center target
-        circle_x = CENTER_X
-        circle_y = CENTER_Y
-    else:
-        # Modified random position to be either 25px left or right
-        # Randomly choose -25 or +25 for the x-offset
-        x_offset = random.choice([300, -300])
-        circle_x = CENTER_X + x_offset
-        circle_y = CENTER_Y  # Keep y position at center
+    # The next pregenerated sequence, nothing is computed here
+    current_drill, waypoints = sequences.next()
+    waypoint_index = 0
+    waypoint_splits = []
         
     circle_active = True
     timeout_expired = False
-    start_time = time.time()
-    last_color_change_time = start_time
+    start_time = now  # Same clock the input timestamps are on
+    trajectory.start(now, cursor_x, cursor_y)
+    trial_fitts = None
+    show_waypoint(now)
+
+def current_timeout_ms():
+    # Center targets keep their own timeout, otherwise the waypoint's
+    if target_type == "center":
+        return TARGET_CENTER_TIMEOUT_MS
+    return waypoints[waypoint_index].timeout_ms
+
+def show_waypoint(now):
+    """Make the current waypoint the target, its timeout counts from now"""
+    global circle_x, circle_y, waypoint_start_time, last_color_change_time, target_color
+    waypoint = waypoints[waypoint_index]
+    circle_x, circle_y = waypoint.x, waypoint.y
+    waypoint_start_time = now
+    last_color_change_time = now
     target_color = YELLOW  # Reset target color when spawning
     
     # Add target activation event to timeline
-    # Use appropriate timeout based on target type
-    if target_type == "center":
-        add_timeline_event("target_active", TARGET_CENTER_TIMEOUT_MS/1000)  # Convert ms to seconds
-    else:
-        add_timeline_event("target_active", TARGET_TIMEOUT_MS/1000)  # Convert ms to seconds
+    add_timeline_event("target_active", current_timeout_ms()/1000, now)  # Convert ms to seconds
+
+def target_position(t):
+    """Where the current target is at time t, its strafe path evaluated in closed form"""
+    path = waypoints[waypoint_index].path
+    if path is None:
+        return circle_x, circle_y
+    return circle_x + path.offset(t - waypoint_start_time), circle_y
+
+def next_delay():
+    """Delay before the next target, the bot's fixed gap when strafing on bot timings"""
+    if bot_timing:
+        return bot_timing.delay_ms / 1000
+    return protocol.foreperiod()
+
+def record_split(end_time, hit):
+    """Timing of the current waypoint, ms since the trial started"""
+    waypoint = waypoints[waypoint_index]
+    waypoint_splits.append({
+        "kind": waypoint.kind,
+        "target": [waypoint.x, waypoint.y],
+        "shown_ms": (waypoint_start_time - start_time) * 1000,
+        "end_ms": (end_time - start_time) * 1000,
+        "split_ms": (end_time - waypoint_start_time) * 1000,
+        "hit": hit,
+    })
 
 def update_target_color(current_time):
     global target_color, last_color_change_time
@@ -259,17 +423,13 @@ def update_target_color(current_time):
         progress = min(time_visible_ms / TARGET_TIMEOUT_MS, 1.0)
         
         # Generate a color that shifts from red to yellow as time progresses
-        r = 255
-        g = int(255 * progress)
-        b = 0
-        
-        target_color = (r, g, b)
+        target_color = ramp_color(progress)
 
 
 def draw_sensitivity_info():
     dpi_text = f"Target DPI: {target_dpi}"
     sens_text = f"Target Val Sens: {target_valorant_sens:.3f}"
-    mode_text = f"Target Mode: {target_type.capitalize()}"
+    mode_text = f"Target Mode: {view.target_type.capitalize()}"
     dpi_surf = font_large.render(dpi_text, True, YELLOW)
     sens_surf = font_large.render(sens_text, True, YELLOW)
     mode_surf = font_large.render(mode_text, True, YELLOW)
@@ -280,12 +440,18 @@ def draw_sensitivity_info():
     screen.blit(sens_surf, sens_rect)
     screen.blit(mode_surf, mode_rect)
 
-def draw_instructions_and_fps(current_fps):
+def draw_instructions_and_fps(current_fps, frame_ms, sim_hz, present_text):
     instructions = [
-        f"FPS: {current_fps:.0f}",
+        f"FPS: {current_fps:.0f}  Render: {frame_ms:.1f}ms  Sim: {sim_hz:.0f}Hz",
+        present_text,
+        view.fitts_text,
+        view.protocol_text,
+        view.fatigue_text,
+        *([view.experiment_text] if view.experiment_text else []),
         f"Spawn Size: {SPAWN_AREA_SIZE}px",
-        f"Hits (Last {SPEC_WINDOW_SIZE}): {len(hit_times_ms)}",
+        f"Hits (Last {SPEC_WINDOW_SIZE}): {len(view.hit_times_ms)}",
         f"Target Timeout: {TARGET_TIMEOUT_MS}ms / Center: {TARGET_CENTER_TIMEOUT_MS}ms",
+        f"Strafe: {STRAFE_PATH} @ {STRAFE_SPEED_PX_S}px/s" if STRAFE_PATH else "Strafe: off",
         f"Target Color Change: {TARGET_COLOR_CHANGE_MS}ms",
         "Timeline: Last 20 seconds",
         "-----------",
@@ -316,12 +482,15 @@ def get_time_color(time_ms, is_miss):
         return PINK
 
 def draw_timing_display():
-    if last_hit_info:
-        _, _, time_ms, was_timeout = last_hit_info
+    if view.last_hit_info:
+        _, _, time_ms, was_timeout, anticipated = view.last_hit_info
         
         if was_timeout:
             timer_text = f"MISSED"
             color = RED  # Use red for missed targets
+        elif anticipated:
+            timer_text = f"TOO EARLY ({time_ms:.0f} ms)"
+            color = FALSE_START_COLOR
         else:
             timer_text = f"{time_ms:.0f} ms"
             color = get_time_color(time_ms, False)  # Use the same color as in the spectrogram
@@ -340,16 +509,32 @@ def draw_timing_display():
         screen.blit(text_surface, text_rect)
         
         # Add first move time display under the hit time
-        if last_move_reaction_ms is not None:
-            move_text = f"First Move: {last_move_reaction_ms:.0f} ms"
-            move_color = get_time_color(last_move_reaction_ms, False)
+        if view.last_move_reaction_ms is not None:
+            move_text = f"First Move: {view.last_move_reaction_ms:.0f} ms"
+            move_color = get_time_color(view.last_move_reaction_ms, False)
             move_surface = font_medium.render(move_text, True, move_color)
             move_rect = move_surface.get_rect(center=(WIDTH // 2, CENTER_Y - 60))
             screen.blit(move_surface, move_rect)
 
+        # Where the time went: reaction, flick and correction phases of the last trial
+        if view.last_kinematics is not None:
+            k = view.last_kinematics
+            phase_text = (f"Reaction {k['reaction_ms']:.0f} | Flick {k['ballistic_ms']:.0f} | "
+                          f"Correction {k['corrective_ms']:.0f} ms ({k['corrections']} corr.)")
+            phase_surface = font_small.render(phase_text, True, WHITE)
+            phase_rect = phase_surface.get_rect(center=(WIDTH // 2, CENTER_Y - 35))
+            screen.blit(phase_surface, phase_rect)
+
+def draw_fatigue_alert():
+    if view.fatigue_alert:
+        alert_surface = font_medium.render(view.fatigue_alert, True, FATIGUE_ALERT_COLOR)
+        alert_rect = alert_surface.get_rect(center=(WIDTH // 2, CENTER_Y - 140))
+        pygame.draw.rect(screen, BLACK, alert_rect.inflate(20, 10))
+        pygame.draw.rect(screen, FATIGUE_ALERT_COLOR, alert_rect.inflate(20, 10), 1)
+        screen.blit(alert_surface, alert_rect)
+
 def draw_spectrogram():
-    global hit_times_ms, miss_flags
-    if not hit_times_ms:
+    if not view.hit_times_ms:
         return
 
     total_spec_width = WIDTH * 0.8
@@ -379,7 +564,7 @@ def draw_spectrogram():
         label_rect = label_surf.get_rect(centery=SPEC_Y_POS + y_pos, right=spec_start_x - 5)
         screen.blit(label_surf, label_rect)
 
-    for i, (hit_time, is_miss) in enumerate(zip(hit_times_ms, miss_flags)):
+    for i, (hit_time, is_miss) in enumerate(zip(view.hit_times_ms, view.miss_flags)):
         normalized_hit_time = min(hit_time / SPEC_MAX_TIME_MS, 1.0)
         
         # Calculate the height of the bar based on hit time
@@ -404,11 +589,11 @@ def draw_spectrogram():
     # Draw border around the blitted area on the main screen
     pygame.draw.rect(screen, GREY, (spec_start_x, SPEC_Y_POS, total_spec_width, SPEC_HEIGHT), 1)
 
-def add_timeline_event(event_type, duration=None):
+def add_timeline_event(event_type, duration=None, timestamp=None):
     global timeline_events
     
-    """Add an event to the timeline with current timestamp"""
-    current_time = time.time()
+    """Add an event to the timeline, at the current time unless a timestamp is given"""
+    current_time = time.time() if timestamp is None else timestamp
     timeline_events.append((current_time, event_type, duration))
     
     # Clean up old events (older than TIMELINE_LENGTH_SECONDS)
@@ -421,15 +606,24 @@ def draw_timeline():
     if not show_timeline:
         return
         
-    current_time = time.time()
-    cutoff_time = current_time - TIMELINE_LENGTH_SECONDS
-    
     # Timeline dimensions
     total_timeline_width = WIDTH * 0.8
     timeline_start_x = (WIDTH - total_timeline_width) / 2
     
     # Create a surface for the timeline with alpha channel
     timeline_surface = pygame.Surface((total_timeline_width, TIMELINE_HEIGHT), pygame.SRCALPHA)
+    render_timeline(timeline_surface)
+    
+    # Blit the timeline surface onto the main screen
+    screen.blit(timeline_surface, (timeline_start_x, TIMELINE_Y_POS))
+    
+    draw_timeline_frame()
+
+def render_timeline(timeline_surface):
+    """Draw the scrolling part of the timeline (ticks and events) onto its own surface"""
+    current_time = time.time()
+    cutoff_time = current_time - TIMELINE_LENGTH_SECONDS
+    total_timeline_width = timeline_surface.get_width()
     timeline_surface.fill(TIMELINE_BG_COLOR)
     
     # Draw time markers (every second)
@@ -455,7 +649,7 @@ def draw_timeline():
                     1)
     
     # Draw events on the timeline
-    for timestamp, event_type, duration in timeline_events:
+    for timestamp, event_type, duration in view.timeline_events:
         # Skip events outside our time window
         if timestamp < cutoff_time:
             continue
@@ -472,6 +666,13 @@ def draw_timeline():
                           (event_x_pos, 0, rect_width, rect_height))
             pygame.draw.rect(timeline_surface, WHITE, 
                           (event_x_pos, 0, rect_width, rect_height), 1)
+
+        elif event_type == "catch" and duration is not None:
+            # Grey rectangle for a catch trial, no target was shown
+            rect_width = (duration / TIMELINE_LENGTH_SECONDS) * total_timeline_width
+            rect_height = TIMELINE_HEIGHT - 20
+            pygame.draw.rect(timeline_surface, CATCH_TRIAL_COLOR,
+                          (event_x_pos, 0, rect_width, rect_height))
                           
         elif event_type == "hit":
             # Draw a green marker for a hit
@@ -497,6 +698,19 @@ def draw_timeline():
             pygame.draw.circle(timeline_surface, OFF_TARGET_HIT_COLOR,
                            (event_x_pos, marker_y),
                            marker_size, 0)  # 0 means filled
+
+        elif event_type == "false_start":
+            # Orange dot for a click during the delay or a catch trial
+            marker_size = 5
+            marker_y = TIMELINE_HEIGHT - 25
+            pygame.draw.circle(timeline_surface, FALSE_START_COLOR,
+                           (event_x_pos, marker_y),
+                           marker_size, 0)  # 0 means filled
+
+        elif event_type == "fatigue":
+            # Full-height line where a change point was detected
+            pygame.draw.line(timeline_surface, FATIGUE_ALERT_COLOR,
+                           (event_x_pos, 0), (event_x_pos, TIMELINE_HEIGHT), 2)
                            
         elif event_type == "first_move":
             # Draw a blue diamond for the first mouse movement
@@ -509,9 +723,11 @@ def draw_timeline():
                               (event_x_pos, marker_y + marker_size),
                               (event_x_pos - marker_size, marker_y)], 
                              0)  # 0 means filled
-    
-    # Blit the timeline surface onto the main screen
-    screen.blit(timeline_surface, (timeline_start_x, TIMELINE_Y_POS))
+
+def draw_timeline_frame():
+    """Draw the static parts around the timeline: border, label and legend"""
+    total_timeline_width = WIDTH * 0.8
+    timeline_start_x = (WIDTH - total_timeline_width) / 2
     
     # Draw border around the timeline area
     pygame.draw.rect(screen, GREY, (timeline_start_x, TIMELINE_Y_POS, total_timeline_width, TIMELINE_HEIGHT), 1)
@@ -522,7 +738,7 @@ def draw_timeline():
     screen.blit(label, label_rect)
     
     # Add a small legend to explain the different markers
-    legend_start_x = timeline_start_x + total_timeline_width - 300  # Increased space for new marker
+    legend_start_x = timeline_start_x + total_timeline_width - 540  # Increased space for new marker
     legend_y = TIMELINE_Y_POS - 25
     
     # Hit marker
@@ -562,12 +778,34 @@ def draw_timeline():
     miss_text = font_tiny.render("Miss", True, WHITE)
     screen.blit(miss_text, (legend_start_x + 10, legend_y))
 
+    # False start marker
+    legend_start_x += 55
+    pygame.draw.circle(screen, FALSE_START_COLOR,
+                   (legend_start_x, legend_y + marker_width//2),
+                   marker_width//2, 0)
+    false_start_text = font_tiny.render("False start", True, WHITE)
+    screen.blit(false_start_text, (legend_start_x + 10, legend_y))
+
+    # Catch trial
+    legend_start_x += 90
+    pygame.draw.rect(screen, CATCH_TRIAL_COLOR,
+                   (legend_start_x - marker_width//2, legend_y, marker_width, marker_width))
+    catch_text = font_tiny.render("Catch", True, WHITE)
+    screen.blit(catch_text, (legend_start_x + 10, legend_y))
+
+    # Fatigue change point
+    legend_start_x += 60
+    pygame.draw.line(screen, FATIGUE_ALERT_COLOR,
+                   (legend_start_x, legend_y), (legend_start_x, legend_y + marker_width), 2)
+    fatigue_label = font_tiny.render("Fatigue", True, WHITE)
+    screen.blit(fatigue_label, (legend_start_x + 10, legend_y))
+
 def draw_cursor():
     # Draw a small white rectangle with black border
     rect_width = 2
     rect_height = 2
-    rect_x = int(cursor_x) - rect_width // 2
-    rect_y = int(cursor_y) - rect_height // 2
+    rect_x = int(latched_x) - rect_width // 2
+    rect_y = int(latched_y) - rect_height // 2
     
     # Draw black border (by drawing a slightly larger black rectangle)
     pygame.draw.rect(screen, BLACK, (rect_x-1, rect_y-1, rect_width+2, rect_height+2))
@@ -575,35 +813,62 @@ def draw_cursor():
     pygame.draw.rect(screen, WHITE, (rect_x, rect_y, rect_width, rect_height))
 
 # Function to process hit detection
-def process_hit():
+# click_x/click_y are where the cursor was at click_time, not where it is now
+def process_hit(click_time, click_x, click_y):
     global circle_active, is_delaying, delay_start_time, current_delay_duration, last_hit_info, hit_times_ms, miss_flags, target_type
-    global last_move_reaction_ms
+    global last_move_reaction_ms, waypoint_index
     
     if not circle_active:
-        distance = math.hypot(cursor_x - circle_x, cursor_y - circle_y)
+        distance = math.hypot(click_x - circle_x, click_y - circle_y)
         if distance <= CIRCLE_RADIUS:
             if near_miss_sound:
                 near_miss_sound.play()
     
     if circle_active:
-        distance = math.hypot(cursor_x - circle_x, cursor_y - circle_y)
+        target_x, target_y = target_position(click_time)
+        distance = math.hypot(click_x - target_x, click_y - target_y)
+        if trial_fitts is None:
+            record_first_click(click_time, click_x, click_y)
         if distance <= CIRCLE_RADIUS:
+            record_split(click_time, True)
+            if waypoint_index < len(waypoints) - 1:
+                # Intermediate waypoint, the trial goes on with the next one
+                add_timeline_event("hit", timestamp=click_time)
+                waypoint_index += 1
+                show_waypoint(click_time)
+                return True
+
             # --- HIT! ---
-            time_taken_sec = time.time() - start_time
+            time_taken_sec = click_time - start_time
             time_taken_ms = time_taken_sec * 1000
-            hit_times_ms.append(time_taken_ms)
-            miss_flags.append(False)  # Not a miss
-            # Keep only the latest SPEC_WINDOW_SIZE entries
-            if len(hit_times_ms) > SPEC_WINDOW_SIZE:
-                hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
-                miss_flags = miss_flags[-SPEC_WINDOW_SIZE:]
-            last_hit_info = (circle_x, circle_y, time_taken_ms, False)  # False means not a timeout
+            # Reaction is judged on the first waypoint, later ones follow from it, and on
+            # the movement onset, one under the floor was under way before the spawn.
+            # Onset is a real speed threshold, a stray count from a resting hand isn't one
+            trajectory.stop()
+            kinematics = segment_trial(*trajectory.arrays(), start_time, click_time)
+            anticipated = (protocol.is_anticipation(waypoint_splits[0]["split_ms"])
+                           or (kinematics is not None and protocol.is_anticipation(kinematics["onset_ms"])))
+            finish_trial("hit", click_time, click_x, click_y, "anticipation" if anticipated else None, kinematics)
+            if anticipated:
+                # Too fast to be a reaction, shown but kept out of the stats
+                protocol.anticipations += 1
+                update_protocol_text()
+            else:
+                hit_times_ms.append(time_taken_ms)
+                miss_flags.append(False)  # Not a miss
+                # Keep only the latest SPEC_WINDOW_SIZE entries
+                if len(hit_times_ms) > SPEC_WINDOW_SIZE:
+                    hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
+                    miss_flags = miss_flags[-SPEC_WINDOW_SIZE:]
+            last_hit_info = (circle_x, circle_y, time_taken_ms, False, anticipated)  # False means not a timeout
             
             # Add hit event to timeline
-            add_timeline_event("hit")
+            add_timeline_event("hit", timestamp=click_time)
             
             # Play explosion sound if reaction time is below 280ms
-            if random.random() < 0.25:
+            if anticipated:
+                pass  # No reward for a guess
+            elif random.random() < 0.25:
                 if explosion_sound: explosion_sound.play()
             else:
                 if hit_sound: hit_sound.play()
@@ -616,36 +881,227 @@ def process_hit():
             
             circle_active = False
             is_delaying = True
-            delay_start_time = time.time()
-            current_delay_duration = random.uniform(DELAY_MIN_S, DELAY_MAX_S)
+            delay_start_time = click_time
+            current_delay_duration = next_delay()
             return True
         else:
             # Click was made but missed the target
-            add_timeline_event("off_target_hit")
+            add_timeline_event("off_target_hit", timestamp=click_time)
             return False
+    elif catch_active:
+        # Fired at a catch trial, there was nothing to react to
+        protocol.false_alarms += 1
+        end_catch_trial("false_alarm", click_time)
+    elif is_delaying:
+        # Fired before any target, the wait starts over
+        protocol.false_starts += 1
+        update_protocol_text()
+        add_timeline_event("false_start", timestamp=click_time)
+        log_protocol_event("false_start", click_time, delay_start_time)
+        delay_start_time = click_time
+        current_delay_duration = next_delay()
     else:
         # No active target, but user clicked
-        add_timeline_event("off_target_hit")
+        add_timeline_event("off_target_hit", timestamp=click_time)
     return False
 
+def expire_target(now):
+    """Time out the active target if its timeout has passed by now"""
+    global circle_active, timeout_expired, target_type, last_hit_info, hit_times_ms, miss_flags
+    global is_delaying, delay_start_time, current_delay_duration
+
+    if not circle_active or timeout_expired:
+        return False
+
+    # The current waypoint's timeout, counted from when it was shown
+    timeout_time = waypoint_start_time + current_timeout_ms() / 1000
+    if now < timeout_time:
+        return False
+    trial_ms = (timeout_time - start_time) * 1000
+
+    # Target timed out - mark as missed
+    record_split(timeout_time, False)
+    finish_trial("timeout", timeout_time)
+    
+    # Toggle target type for next spawn
+    if random.random() > 0.25:
+        target_type = "random"
+    else:
+        target_type = "center"
+    
+    timeout_expired = True
+    circle_active = False
+    last_hit_info = (circle_x, circle_y, trial_ms, True, False)  # True means it was a timeout
+    hit_times_ms.append(trial_ms)  # Add timeout value to hit times
+    miss_flags.append(True)  # This was a miss
+    # Keep only the latest SPEC_WINDOW_SIZE entries
+    if len(hit_times_ms) > SPEC_WINDOW_SIZE:
+        hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
+        miss_flags = miss_flags[-SPEC_WINDOW_SIZE:]
+        
+    # Add miss event to timeline, at the moment the target actually expired
+    add_timeline_event("miss", timestamp=timeout_time)
+        
+    is_delaying = True
+    delay_start_time = timeout_time
+    current_delay_duration = next_delay()
+    return True
+
+def start_catch_trial(now):
+    """A trial without a target, it lasts as long as a target would"""
+    global catch_active, catch_start_time
+    catch_active = True
+    catch_start_time = now
+    add_timeline_event("catch", TARGET_TIMEOUT_MS / 1000, now)
+    update_protocol_text()
+
+def expire_catch_trial(now):
+    """End the catch trial once its duration has passed by now, nobody fired"""
+    if not catch_active:
+        return False
+    end_time = catch_start_time + TARGET_TIMEOUT_MS / 1000
+    if now < end_time:
+        return False
+    end_catch_trial("catch_ok", end_time)
+    return True
+
+def end_catch_trial(outcome, end_time):
+    global catch_active, is_delaying, delay_start_time, current_delay_duration
+    catch_active = False
+    if outcome == "false_alarm":
+        add_timeline_event("false_start", timestamp=end_time)
+    update_protocol_text()
+    log_protocol_event(outcome, end_time, catch_start_time)
+    is_delaying = True
+    delay_start_time = end_time
+    current_delay_duration = next_delay()
+
+def update_protocol_text():
+    global protocol_text
+    protocol_text = protocol.summary_text()
+
+def log_protocol_event(outcome, end_time, begin_time):
+    """Session log record for a trial without a target: catch trials and false starts"""
+    session_log.write({
+        "type": "trial",
+        "time": begin_time,
+        "outcome": outcome,
+        "flagged": outcome if outcome != "catch_ok" else None,
+        "target": None,
+        "end_ms": (end_time - begin_time) * 1000,
+        "dpi": target_dpi,
+        "sens": target_valorant_sens,
+    })
+
+def record_first_click(click_time, click_x, click_y):
+    """The trial's first click is its Fitts endpoint, whether it hit or not"""
+    global trial_fitts, fitts_text
+    # Cursor position at spawn is the trajectory's first sample
+    start = (trajectory.x[0], trajectory.y[0])
+    movement_ms = (click_time - start_time) * 1000
+    trial_fitts = fitts_trial(start, target_position(click_time), (click_x, click_y), CIRCLE_RADIUS, movement_ms)
+    if not protocol.is_anticipation(movement_ms):
+        fitts_stats.add(trial_fitts)
+        fitts_text = fitts_stats.summary_text()
+
+def finish_trial(outcome, end_time, click_x=None, click_y=None, flagged=None, kinematics=None):
+    """Segment the trial's trajectory unless already done, and queue its record for the session log"""
+    global last_kinematics
+    trajectory.stop()
+    if kinematics is None:
+        t, x, y = trajectory.arrays()
+        kinematics = segment_trial(t, x, y, start_time, end_time)
+    last_kinematics = kinematics
+    session_log.write({
+        "type": "trial",
+        "time": start_time,
+        "outcome": outcome,
+        "flagged": flagged,  # Left out of the stats, e.g. "anticipation"
+        "target_type": target_type,
+        "drill": current_drill,
+        "waypoints": waypoint_splits,
+        "target": [circle_x, circle_y],
+        "target_end": list(target_position(end_time)),  # Differs from target for strafing targets
+        "strafe_path": waypoints[waypoint_index].path.name if waypoints[waypoint_index].path else None,
+        "radius": CIRCLE_RADIUS,
+        "click": [click_x, click_y] if click_x is not None else None,
+        "end_ms": (end_time - start_time) * 1000,
+        "rt_ms": (end_time - start_time) * 1000,  # Same field as the other trainers' logs
+        "first_move_ms": (first_move_time - start_time) * 1000 if has_moved else None,
+        "dpi": target_dpi,
+        "sens": target_valorant_sens,
+        "kinematics": last_kinematics,
+        "fitts": trial_fitts,
+        "trajectory": trajectory.to_record(start_time),
+        "experiment": experiment_fields(flagged),
+    })
+    result = update_experiment(outcome, end_time, flagged)  # After the write, it may switch sens for the next trial
+    if result:
+        session_log.write({"type": "experiment_result", "time": end_time, **result})
+    if not flagged:
+        update_fatigue(outcome, end_time)
+
+def experiment_fields(flagged):
+    """The trial's sensitivity test fields for the log, None outside a running test"""
+    if not experiment or experiment.result:
+        return None
+    return {"arm": experiment.arm, "counted": not flagged and not experiment.in_warmup()}
+
+def update_experiment(outcome, end_time, flagged):
+    """Count the trial towards the sensitivity test, returns the test's result if this trial decided it"""
+    global experiment_text
+    if not experiment or experiment.result or flagged:
+        return None
+    rt_ms = (end_time - start_time) * 1000 if outcome == "hit" else None
+    experiment.record(rt_ms, outcome == "timeout")
+    apply_experiment_sens()
+    experiment_text = experiment.status_text()
+    return experiment.result
+
+def update_fatigue(outcome, end_time):
+    """Feed the trial to the change-point charts, log whatever they detect"""
+    global fatigue_text, fatigue_alert
+    rt_ms = (end_time - start_time) * 1000 if outcome == "hit" else None
+    for change in fatigue.add(rt_ms, outcome == "timeout"):
+        session_log.write({"type": "change_point", "time": end_time, **change})
+        add_timeline_event("fatigue", timestamp=end_time)
+        fatigue_alert = fatigue.alert_text()
+    fatigue_text = fatigue.status_text()
+
+def resolve_click(click_time):
+    """Judge a click against the cursor and target as they were at click_time"""
+    # A timeout that fell before the click has to be applied first,
+    # however late in the frame the click gets processed
+    expire_target(click_time)
+    expire_catch_trial(click_time)
+    if (circle_active and click_time < start_time) or (catch_active and click_time < catch_start_time):
+        # Stamped before the target or catch trial existed, it wasn't aimed at it
+        add_timeline_event("off_target_hit", timestamp=click_time)
+        return False
+    click_x, click_y = motion_track.position_at(click_time)
+    return process_hit(click_time, click_x, click_y)
+
 # Function to track and record first mouse movement
-def track_first_movement(dx, dy):
+def track_first_movement(dx, dy, move_time):
     global has_moved, first_move_time, move_reaction_times, last_move_reaction_ms
     
-    # Only track movement if a target is active and player hasn't moved yet
-    if circle_active and not has_moved and (dx != 0 or dy != 0):
+    # Only track movement if a target is active and player hasn't moved yet,
+    # motion stamped before the spawn belongs to the wait
+    if circle_active and not has_moved and move_time >= start_time and (dx != 0 or dy != 0):
         has_moved = True
-        first_move_time = time.time()
+        first_move_time = move_time
         reaction_time_ms = (first_move_time - start_time) * 1000
-        move_reaction_times.append(reaction_time_ms)
         last_move_reaction_ms = reaction_time_ms
+        # A move under the floor was already under way before the target showed
+        if not protocol.is_anticipation(reaction_time_ms):
+            move_reaction_times.append(reaction_time_ms)
         
         # Keep only the last SPEC_WINDOW_SIZE entries
         if len(move_reaction_times) > SPEC_WINDOW_SIZE:
             move_reaction_times = move_reaction_times[-SPEC_WINDOW_SIZE:]
         
         # Add the first move event to the timeline
-        add_timeline_event("first_move")
+        add_timeline_event("first_move", timestamp=move_time)
 
 
 def get_trail_color(time_since_target_ms):
@@ -668,7 +1124,7 @@ def get_trail_color(time_since_target_ms):
 
 def draw_cursor_trail():
     """Draw the cursor trail with color-coded segments"""
-    if not cursor_trail:  # Skip if trail is empty
+    if not view.cursor_trail:  # Skip if trail is empty
         return
 
     current_time = time.time()
@@ -677,7 +1133,7 @@ def draw_cursor_trail():
     trail_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
 
     # Draw each trail segment with color based on how quickly it was created after target spawn
-    for i, (x, y, timestamp, color) in enumerate(cursor_trail):
+    for i, (x, y, timestamp, color) in enumerate(view.cursor_trail):
         # Calculate age of this segment for fade effect
         age_ms = (current_time - timestamp) * 1000
         age_factor = 1.0 - min(1.0, age_ms / TRAIL_MAX_AGE_MS) # Fade based on segment age
@@ -706,9 +1162,255 @@ def update_cursor_trail(current_time):
     cutoff_time = current_time - (TRAIL_MAX_AGE_MS / 1000.0)
     cursor_trail = [seg for seg in cursor_trail if seg[2] >= cutoff_time]
 
+# --- SDL2 Backend Drawing ---
+HUD_FPS_REFRESH_S = 0.25  # The FPS text alone should not force a HUD re-upload every frame
+hud_fps_shown = (0, 0.0, 0, "")
+hud_fps_time = 0.0
+hud_state = None
+
+def make_circle_surface(color, radius):
+    """Antialiasing-free filled circle on a transparent surface, same as pygame.draw.circle"""
+    surface = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    return surface
+
+def draw_frame_sdl2(current_fps, current_time):
+    """Composite the frame from textures, UI layers are re-rasterized only when they change"""
+    global hud_fps_shown, hud_fps_time, hud_state, view, latched_x, latched_y, screen
+
+    gpu_display.clear(BLACK)
+    if background_image:
+        gpu_display.draw(gpu_display.texture("background", lambda: background_image), (0, 0))
+
+    # Static UI: only redrawn when something it shows has changed
+    if current_time - hud_fps_time >= HUD_FPS_REFRESH_S:
+        hud_fps_shown = (round(current_fps), round(render_ms, 1), round(simulation.measured_hz), clock.stats_text())
+        hud_fps_time = current_time
+    state = (hud_fps_shown, target_dpi, target_valorant_sens, view.target_type, show_timeline,
+             view.last_hit_info, view.last_move_reaction_ms, view.hit_times_ms, view.miss_flags,
+             view.last_kinematics, view.fitts_text, view.protocol_text,
+             view.fatigue_text, view.fatigue_alert, view.experiment_text)
+    hud = gpu_display.layer("hud", (WIDTH, HEIGHT))
+    screen = hud.surface  # The HUD helpers all draw on screen
+    if state != hud_state:
+        hud_state = state
+        hud.clear()
+        draw_instructions_and_fps(*hud_fps_shown)
+        draw_sensitivity_info()
+        draw_timing_display()
+        draw_fatigue_alert()
+        draw_spectrogram()
+        if show_timeline:
+            draw_timeline_frame()
+    hud.draw()
+
+    # The timeline scrolls, so only its own small layer is refreshed every frame
+    if show_timeline:
+        total_timeline_width = WIDTH * 0.8
+        timeline = gpu_display.layer("timeline", (int(total_timeline_width), TIMELINE_HEIGHT),
+                                     ((WIDTH - total_timeline_width) / 2, TIMELINE_Y_POS))
+        render_timeline(timeline.surface)
+        timeline.dirty = True
+        timeline.draw()
+
+    # Cursor trail: one small tinted sprite per segment instead of a full-screen alpha surface
+    if view.cursor_trail:
+        segment = gpu_display.texture("trail_segment", make_circle_surface, WHITE, TRAIL_SEGMENT_SIZE)
+        for x, y, timestamp, color in view.cursor_trail:
+            age_ms = (current_time - timestamp) * 1000
+            alpha = int(color[3] * (1.0 - min(1.0, age_ms / TRAIL_MAX_AGE_MS)))
+            if alpha > 0:
+                gpu_display.draw_centered(segment, (int(x), int(y)), color[:3], alpha)
+
+    # Late latch: motion that arrived while the layers were drawn, and the latest target state
+    latched_x, latched_y = latch_cursor()
+    view = snapshots.read()
+
+    if view.circle_visible:
+        # Same pre-built sprite as the software path, uploaded once per color
+        sprite, (anchor_x, anchor_y) = target_sprites.get(CIRCLE_RADIUS, view.target_color)
+        target = gpu_display.texture(("target", view.target_color), lambda: sprite)
+        for x, y in view.upcoming:
+            gpu_display.draw(target, (x - anchor_x, y - anchor_y))
+        target_x, target_y = view_target_position(time.time())
+        gpu_display.draw(target, (target_x - anchor_x, target_y - anchor_y))
+
+    # Cursor: white square with a black border, drawn last
+    rect_x = int(latched_x) - 1
+    rect_y = int(latched_y) - 1
+    gpu_display.fill_rect(BLACK, (rect_x - 1, rect_y - 1, 4, 4))
+    gpu_display.fill_rect(WHITE, (rect_x, rect_y, 2, 2))
+
+    gpu_display.present()
+
+# --- Simulation ---
+# Game logic runs in its own thread at sim_loop.SIM_RATE_HZ. The render loop below
+# only drains input into input_queue and draws from the latest published Snapshot.
+Snapshot = namedtuple("Snapshot", [
+    "cursor_x", "cursor_y", "circle_x", "circle_y", "circle_visible", "target_color",
+    "target_type", "hit_times_ms", "miss_flags", "last_hit_info", "last_move_reaction_ms",
+    "timeline_events", "cursor_trail", "motions_applied", "last_kinematics", "fitts_text",
+    "protocol_text", "upcoming", "target_path", "path_start", "fatigue_text", "fatigue_alert",
+    "experiment_text",
+])
+
+# Events are timestamped when drained and handed to the simulation in time order,
+# clicks are resolved against the cursor track, so hits don't depend on the frame rate.
+# Timeouts and spawns never run past input_horizon, the latest drain whose events are
+# all queued: input from before it has to be applied before the target may change.
+event_clock = EventClock(time.time())
+motion_track = MotionTrack(cursor_x, cursor_y, event_clock.last_drain)
+input_queue = deque()  # (event_time, kind, dx, dy), appended by the render loop only
+input_horizon = event_clock.last_drain  # Set by the render loop once a drained batch is queued
+motions_applied = 0    # MOUSEMOTION events the simulation has consumed, in queue order
+
+def view_target_position(now):
+    """Snapshot target position at render time, moving targets are evaluated rather than stepped"""
+    if view.target_path is None:
+        return view.circle_x, view.circle_y
+    return view.circle_x + view.target_path.offset(now - view.path_start), view.circle_y
+
+def take_snapshot():
+    # Later waypoints that are already on screen, drawn like the target
+    upcoming = ()
+    target_path = None
+    if circle_active and not timeout_expired:
+        upcoming = tuple((w.x, w.y) for w in visible_waypoints(waypoints, waypoint_index))
+        target_path = waypoints[waypoint_index].path
+    return Snapshot(
+        cursor_x, cursor_y, circle_x, circle_y, circle_active and not timeout_expired, target_color,
+        target_type, tuple(hit_times_ms), tuple(miss_flags), last_hit_info, last_move_reaction_ms,
+        tuple(timeline_events), tuple(cursor_trail), motions_applied, last_kinematics, fitts_text,
+        protocol_text, upcoming, target_path, waypoint_start_time, fatigue_text, fatigue_alert,
+        experiment_text,
+    )
+
+def apply_motion(event_time, dx, dy):
+    global cursor_x, cursor_y, motions_applied
+    motions_applied += 1
+    cursor_x += dx * sensitivity_multiplier
+    cursor_y += dy * sensitivity_multiplier
+    cursor_x = max(0, min(WIDTH - 1, cursor_x))
+    cursor_y = max(0, min(HEIGHT - 1, cursor_y))
+    motion_track.add(event_time, cursor_x, cursor_y)
+    if trajectory.recording:
+        trajectory.add(max(event_time, start_time), cursor_x, cursor_y)  # Never before the spawn
+    
+    # Track the first movement after target appears
+    track_first_movement(dx, dy, event_time)
+
+    # --- ADD TO CURSOR TRAIL ---
+    time_since_target_ms = 0
+    if circle_active:
+        time_since_target_ms = (event_time - start_time) * 1000
+
+    trail_color = get_trail_color(time_since_target_ms)
+    cursor_trail.append((cursor_x, cursor_y, event_time, trail_color))
+
+    # Limit the number of trail segments
+    if len(cursor_trail) > MAX_TRAIL_SEGMENTS:
+        cursor_trail.pop(0) # Remove the oldest segment
+
+def simulation_step(now):
+    """One fixed tick: input up to now, then timeouts, delays and spawns up to the input horizon"""
+    global is_delaying
+
+    # Input still in the render loop's hands may be older than now, game time stops at the horizon
+    horizon = min(now, input_horizon)
+
+    # Only input that happened by this tick, anything newer waits for the next one
+    is_hitting = False
+    while input_queue and input_queue[0][0] <= horizon:
+        event_time, kind, dx, dy = input_queue.popleft()
+        if kind == "motion":
+            apply_motion(event_time, dx, dy)
+        else:
+            resolve_click(event_time)
+            is_hitting = True
+
+    # Update target color if active
+    if circle_active and not timeout_expired:
+        update_target_color(now)
+        
+    # Check for target timeout
+    if circle_active and not timeout_expired:
+        # --- UPDATE CURSOR TRAIL ---
+        update_cursor_trail(now) # Remove old segments
+        
+        expire_target(horizon)
+
+    if catch_active:
+        expire_catch_trial(horizon)
+    elif is_delaying and not is_hitting:
+        if horizon - delay_start_time >= current_delay_duration:
+            is_delaying = False
+            if protocol.next_is_catch():
+                start_catch_trial(horizon)
+            else:
+                spawn_circle(horizon)
+    elif not circle_active and not is_delaying and not is_hitting:
+         spawn_circle(horizon)
+
+    snapshots.publish(take_snapshot())
+
+# --- Session Log ---
+# Every trial with its trajectory goes to sessions/horizontal_6_<date>.jsonl
+session_log = SessionLog("horizontal_6", {
+    "circle_radius": CIRCLE_RADIUS,
+    "spawn_area_size": SPAWN_AREA_SIZE,
+    "target_timeout_ms": TARGET_TIMEOUT_MS,
+    "sequences": {"weights": SEQUENCE_WEIGHTS, "goal_px": TARGET_OFFSET_PX,
+                  "stretch_px": STRETCH_GOAL_PX, "decoy_px": DECOY_OFFSET_PX},
+    "strafe": {"path": STRAFE_PATH, "speed_px_s": STRAFE_SPEED_PX_S,
+               "timing": STRAFE_TIMING if bot_timing else None},
+    "foreperiod_s": {"min": DELAY_MIN_S, "mean_extra": DELAY_MEAN_EXTRA_S, "max": DELAY_MAX_S},
+    "catch_rate": CATCH_TRIAL_RATE,
+    "anticipation_floor_ms": ANTICIPATION_FLOOR_MS,
+    "fatigue_baseline_trials": fatigue.baseline_trials,
+    "sens_experiment": {"arms": SENS_EXPERIMENT, "block_trials": SENS_BLOCK_TRIALS} if experiment else None,
+    "dpi": target_dpi,
+    "sens": target_valorant_sens,
+})
+
 # --- Game Loop ---
 running = True
-clock = pygame.time.Clock()
+# Paces the render loop only, the simulation rate doesn't depend on it
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
+render_ms = 0.0
+
+# --- Late Latch ---
+# Motion queued by the render loop that the last snapshot doesn't include yet,
+# added on top of the snapshot cursor right before the cursor is drawn
+motions_queued = 0
+unapplied_motion = deque()  # (sequence number, dx, dy)
+latched_x, latched_y = cursor_x, cursor_y
+
+def queue_motion(event_time, dx, dy):
+    global motions_queued
+    motions_queued += 1
+    input_queue.append((event_time, "motion", dx, dy))
+    unapplied_motion.append((motions_queued, dx, dy))
+
+def latch_cursor():
+    """Queue motion that arrived during the frame and return the cursor as it will be once applied"""
+    global input_horizon
+    for event_time, event in event_clock.stamp(drain_motion_events(), time.time()):
+        queue_motion(event_time, *event.rel)
+    input_horizon = event_clock.last_drain  # Nothing is latched past a pending click, so this drain was complete
+
+    latest = snapshots.read()
+    while unapplied_motion and unapplied_motion[0][0] <= latest.motions_applied:
+        unapplied_motion.popleft()
+
+    x, y = latest.cursor_x, latest.cursor_y
+    for _, dx, dy in unapplied_motion:
+        x = max(0, min(WIDTH - 1, x + dx * sensitivity_multiplier))
+        y = max(0, min(HEIGHT - 1, y + dy * sensitivity_multiplier))
+    return x, y
+
+snapshots = SnapshotBuffer(take_snapshot())
+simulation = FixedRateLoop(simulation_step)
+simulation.start()
 
 while running:
     current_frame_time = time.time()
@@ -717,9 +1419,7 @@ while running:
     keys_pressed = pygame.key.get_pressed()
     shift_pressed = keys_pressed[pygame.K_LSHIFT] or keys_pressed[pygame.K_RSHIFT]
 
-    is_hitting = False
-    
-    for event in pygame.event.get():
+    for event_time, event in event_clock.stamp(pygame.event.get(), current_frame_time):
         if event.type == pygame.QUIT: running = False
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE: running = False
@@ -730,13 +1430,14 @@ while running:
             
             # Fire with left CTRL key (single press)
             if event.key == pygame.K_LCTRL:
-                process_hit()
-                is_hitting = True
+                input_queue.append((event_time, "click", 0, 0))
 
             # Sensitivity Adjustments
             current_sens_increment = VALORANT_SENS_INCREMENT_COARSE if shift_pressed else VALORANT_SENS_INCREMENT_FINE
             sens_changed = False
-            if event.key == pygame.K_UP: target_valorant_sens += current_sens_increment; sens_changed = True
+            if experiment and not experiment.result:
+                pass  # Left to the experiment while one runs
+            elif event.key == pygame.K_UP: target_valorant_sens += current_sens_increment; sens_changed = True
             elif event.key == pygame.K_DOWN: target_valorant_sens -= current_sens_increment; sens_changed = True
             elif event.key == pygame.K_RIGHT: target_dpi += DPI_INCREMENT; sens_changed = True
             elif event.key == pygame.K_LEFT: target_dpi -= DPI_INCREMENT; sens_changed = True
@@ -749,110 +1450,62 @@ while running:
         # --- Hit Detection with Mouse ---
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left mouse button
-                process_hit()
-                is_hitting = True
+                input_queue.append((event_time, "click", 0, 0))
 
         if event.type == pygame.MOUSEMOTION:
             dx, dy = event.rel
-            cursor_x += dx * sensitivity_multiplier
-            cursor_y += dy * sensitivity_multiplier
-            cursor_x = max(0, min(WIDTH - 1, cursor_x))
-            cursor_y = max(0, min(HEIGHT - 1, cursor_y))
-            
-            # Track the first movement after target appears
-            track_first_movement(dx, dy)
-
-
-            # --- ADD TO CURSOR TRAIL ---
-            time_since_target_ms = 0
-            if circle_active:
-                time_since_target_ms = (current_frame_time - start_time) * 1000
-
-            trail_color = get_trail_color(time_since_target_ms)
-            cursor_trail.append((cursor_x, cursor_y, current_frame_time, trail_color))
-
-            # Limit the number of trail segments
-            if len(cursor_trail) > MAX_TRAIL_SEGMENTS:
-                cursor_trail.pop(0) # Remove the oldest segment
-                
-    # --- Game Logic ---
-    # Update target color if active
-    if circle_active and not timeout_expired:
-        update_target_color(current_frame_time)
-        
-    # Check for target timeout
-    if circle_active and not timeout_expired:
-        time_visible_ms = (current_frame_time - start_time) * 1000
-        
-        # Use the appropriate timeout based on target type
-        current_timeout = TARGET_CENTER_TIMEOUT_MS if target_type == "center" else TARGET_TIMEOUT_MS
-
-        # --- UPDATE CURSOR TRAIL ---
-        update_cursor_trail(current_frame_time) # Remove old segments
-        
-        if time_visible_ms >= current_timeout:
-            # Target timed out - mark as missed
-            
-            # Toggle target type for next spawn
-            if random.random() > 0.25:
-                target_type = "random"
-            else:
-                target_type = "center"
-            
-            timeout_expired = True
-            circle_active = False
-            last_hit_info = (circle_x, circle_y, current_timeout, True)  # True means it was a timeout
-            hit_times_ms.append(current_timeout)  # Add timeout value to hit times
-            miss_flags.append(True)  # This was a miss
-            # Keep only the latest SPEC_WINDOW_SIZE entries
-            if len(hit_times_ms) > SPEC_WINDOW_SIZE:
-                hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
-                miss_flags = miss_flags[-SPEC_WINDOW_SIZE:]
-                
-            # Add miss event to timeline
-            add_timeline_event("miss")
-                
-            is_delaying = True
-            delay_start_time = current_frame_time
-            current_delay_duration = random.uniform(DELAY_MIN_S, DELAY_MAX_S)
-
-    if is_delaying and not is_hitting:
-        if current_frame_time - delay_start_time >= current_delay_duration:
-            is_delaying = False
-            spawn_circle()
-    elif not circle_active and not is_delaying and not is_hitting:
-         spawn_circle()
+            queue_motion(event_time, dx, dy)
+    input_horizon = event_clock.last_drain
 
     # --- Drawing ---
-    # Draw Background FIRST
-    if background_image:
-        screen.blit(background_image, (0, 0))
+    # Everything below reads the snapshot, never the simulation's globals
+    view = snapshots.read()
+    render_start = time.perf_counter()
+    if gpu_display:
+        draw_frame_sdl2(clock.get_fps(), current_frame_time)
     else:
-        screen.fill(BLACK) # Fallback to black background if image failed to load
+        # Draw Background FIRST
+        if background_image:
+            screen.blit(background_image, (0, 0))
+        else:
+            screen.fill(BLACK) # Fallback to black background if image failed to load
 
      
-    # UI Elements (drawn OVER background)
-    current_fps = clock.get_fps()
-    draw_instructions_and_fps(current_fps)
-    draw_sensitivity_info()
-    draw_timing_display()  # Always draw timing display, regardless of circle state
-    draw_spectrogram()
-    draw_timeline()  # Draw the timeline if visible
-
-    # --- DRAW CURSOR TRAIL ---
-    draw_cursor_trail() # Draw the trail before the target and cursor
-
-    # Game Elements (drawn OVER background and some UI)
-    if circle_active and not timeout_expired:
-        pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS)
-        # Display different colors or indicators based on target type
-        #if target_type == "center":
-        #    pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS + 2, 1)  # Cyan outline for center targets
-        screen.blit(image, (circle_x-12, circle_y-6))
-
-    draw_cursor() # Draw cursor last, on top of everything
-    pygame.display.flip()
-    clock.tick(144)
+        # UI Elements (drawn OVER background)
+        current_fps = clock.get_fps()
+        draw_instructions_and_fps(current_fps, render_ms, simulation.measured_hz, clock.stats_text())
+        draw_sensitivity_info()
+        draw_timing_display()  # Always draw timing display, regardless of circle state
+        draw_fatigue_alert()
+        draw_spectrogram()
+        draw_timeline()  # Draw the timeline if visible
+
+        # --- DRAW CURSOR TRAIL ---
+        draw_cursor_trail() # Draw the trail before the target and cursor
+
+        # --- Late Latch ---
+        # Motion that arrived while the UI was drawn, and the latest target state
+        latched_x, latched_y = latch_cursor()
+        view = snapshots.read()
+
+        # Game Elements (drawn OVER background and some UI)
+        if view.circle_visible:
+            for position in view.upcoming:
+                target_sprites.blit(screen, CIRCLE_RADIUS, view.target_color, position)
+            target_sprites.blit(screen, CIRCLE_RADIUS, view.target_color, view_target_position(time.time()))
+            # Display different colors or indicators based on target type
+            #if target_type == "center":
+            #    pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS + 2, 1)  # Cyan outline for center targets
+
+        draw_cursor() # Draw cursor last, on top of everything
+        pygame.display.flip()
+    render_ms = (time.perf_counter() - render_start) * 1000
+    session_log.flush()  # Records queued by the simulation, written off its thread
+    sequences.top_up()   # Next batch of target sequences, built here rather than at spawn
+    clock.tick()
+
+simulation.stop()
+session_log.close()
 
 # --- Cleanup ---
 pygame.mouse.set_visible(True)
@@ -0,0 +1,46 @@
+from collections import deque
+
+# Timestamped input for resolving clicks at the instant they happened.
+# pygame only tells us which events arrived since the last pygame.event.get(),
+# not when, so every drained batch is spread evenly over the time since the
+# previous drain. Motion samples go into a short track that is looked up for
+# where the cursor was at a click's timestamp. Events reach the simulation in
+# queue order, so that is the last motion before the click.
+
+MOTION_TRACK_LENGTH = 512  # Motion samples kept, a few seconds even with 1000Hz mice
+
+
+class EventClock:
+    """Assigns estimated timestamps to the events of each pygame.event.get() batch"""
+    def __init__(self, now):
+        self.last_drain = now
+
+    def stamp(self, events, now):
+        """List of (timestamp, event), evenly spaced between the previous drain and now"""
+        count = len(events)
+        span = now - self.last_drain
+        start = self.last_drain
+        self.last_drain = now
+        return [(start + span * (i + 1) / count, event) for i, event in enumerate(events)]
+
+
+class MotionTrack:
+    """Ring buffer of (timestamp, x, y) cursor samples"""
+    def __init__(self, x, y, now, length=MOTION_TRACK_LENGTH):
+        self.samples = deque(maxlen=length)
+        self.samples.append((now, x, y))
+
+    def add(self, timestamp, x, y):
+        self.samples.append((timestamp, x, y))
+
+    def position_at(self, timestamp):
+        """Cursor position at timestamp: the last sample at or before it, held until the next"""
+        # Order within a batch is exact but its timestamps are spread evenly, so
+        # interpolating between samples would make up positions the cursor never held
+        for sample in reversed(self.samples):  # Clicks are almost always recent
+            if sample[0] <= timestamp:
+                return sample[1], sample[2]
+
+        # Older than anything kept, the oldest sample is the best guess
+        oldest = self.samples[0]
+        return oldest[1], oldest[2]
@@ -0,0 +1,140 @@
+import numpy as np
+
+# Kinematic segmentation of a trial's cursor trajectory.
+# The trajectory from target spawn to click is resampled onto a 1ms grid and
+# its speed profile split into phases:
+#   reaction   - spawn to movement onset (perception and decision)
+#   ballistic  - onset to the end of the primary submovement (the flick)
+#   corrective - primary end to the click (corrections and settling)
+
+RESAMPLE_MS = 1.0         # Grid the trajectory is resampled onto
+SMOOTHING_MS = 8          # Moving average window for the speed profile
+ONSET_FRACTION = 0.05     # Movement starts/stops at this fraction of peak speed...
+MIN_SPEED_PX_S = 50.0     # ...but never below this absolute speed
+INITIAL_CAPACITY = 1024   # Samples preallocated per trial, grows if needed
+
+
+class TrajectoryRecorder:
+    """Timestamped cursor samples for one trial, kept in preallocated NumPy arrays"""
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.t = np.empty(capacity)
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.count = 0
+        self.recording = False
+
+    def start(self, t, x, y):
+        self.count = 0
+        self.recording = True
+        self.add(t, x, y)
+
+    def stop(self):
+        self.recording = False
+
+    def add(self, t, x, y):
+        # Estimated event timestamps can land a hair before the previous sample
+        if self.count and t < self.t[self.count - 1]:
+            t = self.t[self.count - 1]
+        if self.count == len(self.t):
+            grow = len(self.t)
+            self.t = np.concatenate((self.t, np.empty(grow)))
+            self.x = np.concatenate((self.x, np.empty(grow)))
+            self.y = np.concatenate((self.y, np.empty(grow)))
+        self.t[self.count] = t
+        self.x[self.count] = x
+        self.y[self.count] = y
+        self.count += 1
+
+    def arrays(self):
+        """Views of the recorded t, x, y samples"""
+        n = self.count
+        return self.t[:n], self.x[:n], self.y[:n]
+
+    def to_record(self, start_t):
+        """Samples as JSON-friendly lists, times in ms since start_t"""
+        t, x, y = self.arrays()
+        return {
+            "t": np.round((t - start_t) * 1000, 2).tolist(),
+            "x": np.round(x, 2).tolist(),
+            "y": np.round(y, 2).tolist(),
+        }
+
+
+def speed_profile(t, x, y, start_t, end_t):
+    """Time grid in ms since start_t and smoothed speed in px/s on it"""
+    grid = np.arange(start_t, end_t + RESAMPLE_MS / 1000, RESAMPLE_MS / 1000)
+    # The cursor holds still between motion events, so sample-and-hold, not a straight line
+    idx = np.clip(np.searchsorted(t, grid, side="right") - 1, 0, len(t) - 1)
+    gx = x[idx]
+    gy = y[idx]
+
+    speed = np.zeros(len(grid))
+    speed[1:] = np.hypot(np.diff(gx), np.diff(gy)) / (RESAMPLE_MS / 1000)
+    window = max(1, int(SMOOTHING_MS / RESAMPLE_MS))
+    speed = np.convolve(speed, np.ones(window) / window, mode="same")
+    return (grid - start_t) * 1000, speed
+
+
+def segment_trial(t, x, y, start_t, end_t):
+    """Phase boundaries of one trial, times in ms since start_t (target spawn)
+
+    Returns None when the cursor never moved. Otherwise a dict with onset_ms,
+    peak_speed (px/s), peak_ms, primary_end_ms, corrections (number of corrective
+    submovements), end_ms, and the reaction/ballistic/corrective phase lengths.
+    """
+    if len(t) < 2 or end_t <= start_t:
+        return None
+    grid_ms, speed = speed_profile(t, x, y, start_t, end_t)
+    peak = int(np.argmax(speed))
+    peak_speed = float(speed[peak])
+    threshold = max(peak_speed * ONSET_FRACTION, MIN_SPEED_PX_S)
+    if peak_speed < threshold:
+        return None
+
+    moving = speed >= threshold
+    # Onset: last still sample before the peak
+    still_before = np.nonzero(~moving[:peak])[0]
+    onset = int(still_before[-1]) + 1 if len(still_before) else 0
+
+    # Primary end: first drop below threshold or first speed minimum after the peak,
+    # whichever comes first (a minimum means a new submovement starts)
+    accel = np.diff(speed[peak:])
+    minima = np.nonzero((accel[:-1] < 0) & (accel[1:] >= 0))[0]
+    stopped = np.nonzero(~moving[peak:])[0]
+    candidates = [len(speed) - 1]
+    if len(minima):
+        candidates.append(peak + int(minima[0]) + 1)
+    if len(stopped):
+        candidates.append(peak + int(stopped[0]))
+    primary_end = min(candidates)
+
+    # Corrective submovements: speed peaks above threshold after the primary one
+    after = speed[primary_end:]
+    d = np.diff(after)
+    peaks = np.nonzero((d[:-1] > 0) & (d[1:] <= 0))[0] + 1
+    corrections = int(np.count_nonzero(after[peaks] >= threshold))
+
+    onset_ms = float(grid_ms[onset])
+    primary_end_ms = float(grid_ms[primary_end])
+    end_ms = (end_t - start_t) * 1000
+    return {
+        "onset_ms": onset_ms,
+        "peak_speed": peak_speed,
+        "peak_ms": float(grid_ms[peak]),
+        "primary_end_ms": primary_end_ms,
+        "corrections": corrections,
+        "end_ms": end_ms,
+        "reaction_ms": onset_ms,
+        "ballistic_ms": primary_end_ms - onset_ms,
+        "corrective_ms": end_ms - primary_end_ms,
+    }
+
+
+def segment_record(record):
+    """Re-run the segmentation on a trial record loaded from a session log"""
+    trajectory = record.get("trajectory")
+    if not trajectory:
+        return None
+    t = np.asarray(trajectory["t"]) / 1000  # Stored in ms since spawn
+    return segment_trial(t, np.asarray(trajectory["x"]), np.asarray(trajectory["y"]),
+                         0.0, record["end_ms"] / 1000)
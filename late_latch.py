@@ -0,0 +1,27 @@
+import pygame
+
+# Late-latched cursor.
+# The event loop runs at the top of the frame, so motion that arrives while the
+# UI is being drawn would only show up a frame later. drain_motion() is called
+# right before the cursor is composited and the frame flipped, and picks up that
+# motion so the cursor is drawn where the mouse is now.
+
+# A queued click has to be handled after the motion before it and before the
+# motion after it, so nothing is latched while one is waiting
+CLICK_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
+
+def drain_motion_events():
+    """Pending MOUSEMOTION events, none if a click is queued behind them"""
+    if pygame.event.peek(CLICK_EVENTS):
+        return []
+    return pygame.event.get(pygame.MOUSEMOTION)
+
+
+def drain_motion():
+    """Summed relative motion of the pending MOUSEMOTION events"""
+    dx = dy = 0
+    for event in drain_motion_events():
+        dx += event.rel[0]
+        dy += event.rel[1]
+    return dx, dy
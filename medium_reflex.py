@@ -3,6 +3,12 @@ import random
 import time
 import math
 import os # Import os module for path handling
+from target_sprites import TargetSpriteCache, ramp_color, ramp_colors
+from frame_pacing import FramePacer, set_display_mode
+from late_latch import drain_motion
+from fitts import TrialLog
+from spawn_lattice import SpawnLattice
+from adaptive_spawn import WeaknessGrid
 
 # Initialize Pygame
 pygame.init()
@@ -16,7 +22,11 @@ except pygame.error:
     print("Could not get display info, using default 800x600.")
     WIDTH, HEIGHT = 800, 600
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
 pygame.display.set_caption("Aim Trainer - Reaction Time Spectrogram")
 
 # --- Load Background Image and Sound Effect ---
@@ -85,6 +95,11 @@ last_color_change_time = 0
 # --- Circle Properties ---
 CIRCLE_RADIUS = 5
 
+# --- Target Sprites ---
+# Circle and image pre-rendered once for every color the target can take
+target_sprites = TargetSpriteCache(image, (-12, -6))
+target_sprites.prebuild([CIRCLE_RADIUS], [YELLOW] + ramp_colors())
+
 # --- Spawn Area Configuration ---
 SPAWN_AREA_SIZE = 100
 CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
@@ -94,6 +109,28 @@ MAX_SPAWN_X = min(WIDTH - CIRCLE_RADIUS, CENTER_X + HALF_SPAWN_SIZE)
 MIN_SPAWN_Y = max(CIRCLE_RADIUS, CENTER_Y - HALF_SPAWN_SIZE)
 MAX_SPAWN_Y = min(HEIGHT - CIRCLE_RADIUS, CENTER_Y + HALF_SPAWN_SIZE)
 
+# --- Spawn Lattice ---
+# "box" spawns uniformly in the square above (the original behavior), opt-in
+# "lattice" deals (angle, eccentricity) bins of the disc inside it from a shuffled
+# deck, so every direction and distance comes up once per block (see
+# spawn_lattice.py), "adaptive" favors the cells of the weakness grid below where
+# reactions are slowest
+SPAWN_MODE = "box"
+LATTICE_ANGLES = 8
+LATTICE_RINGS = 3
+LATTICE_SLOW_BIAS = 0.25  # Extra cards per block for the slowest bins, as a share of the bin count
+spawn_lattice = SpawnLattice((CENTER_X, CENTER_Y), HALF_SPAWN_SIZE, LATTICE_ANGLES, LATTICE_RINGS,
+                             slow_bias=LATTICE_SLOW_BIAS)
+spawn_bin = None  # Lattice bin of the current target, None for box and center targets
+
+# --- Weakness Grid ---
+# Decayed RT and miss rate per cell of the spawn box, fed by every random target
+# whatever the spawn mode (see adaptive_spawn.py)
+WEAKNESS_GRID_SIZE = 4  # Cells per side
+weakness_grid = WeaknessGrid((MIN_SPAWN_X, MIN_SPAWN_Y, MAX_SPAWN_X, MAX_SPAWN_Y),
+                             WEAKNESS_GRID_SIZE, WEAKNESS_GRID_SIZE)
+spawn_cell = None  # Weakness grid cell of the current target, None for center targets
+
 # --- Game Variables ---
 circle_x = 0
 circle_y = 0
@@ -171,15 +208,37 @@ cursor_x, cursor_y = CENTER_X, CENTER_Y
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
+# --- Session Log ---
+# One record per trial in sessions/medium_reflex_<date>.jsonl, with the Fitts fields
+# of the trial's first click (see fitts.py)
+trial_log = TrialLog("medium_reflex", {
+    "circle_radius": CIRCLE_RADIUS,
+    "spawn_area_size": SPAWN_AREA_SIZE,
+    "spawn_mode": SPAWN_MODE,
+    "lattice": [LATTICE_ANGLES, LATTICE_RINGS, LATTICE_SLOW_BIAS],
+    "weakness_grid": WEAKNESS_GRID_SIZE,
+    "dpi": target_dpi,
+    "sens": target_valorant_sens,
+}, (cursor_x, cursor_y))
+
 
 def spawn_circle():
     global circle_x, circle_y, circle_active, start_time, timeout_expired, last_color_change_time, target_color, target_type
+    global spawn_bin, spawn_cell
     
+    spawn_bin = None
+    spawn_cell = None
     # Determine target position based on target_type
     if target_type != "random":
         # Center target
         circle_x = CENTER_X
         circle_y = CENTER_Y
+    elif SPAWN_MODE == "lattice":
+        spawn_bin, (x, y) = spawn_lattice.spawn()
+        circle_x = round(min(max(x, MIN_SPAWN_X), MAX_SPAWN_X))
+        circle_y = round(min(max(y, MIN_SPAWN_Y), MAX_SPAWN_Y))
+    elif SPAWN_MODE == "adaptive":
+        spawn_cell, (circle_x, circle_y) = weakness_grid.spawn()
     else:
         # Random position target (original behavior)
         valid_x_range = MAX_SPAWN_X >= MIN_SPAWN_X
@@ -192,11 +251,14 @@ def spawn_circle():
             circle_y = random.randint(MIN_SPAWN_Y, MAX_SPAWN_Y)
         else: 
             circle_y = CENTER_Y
+    if target_type == "random" and spawn_cell is None:
+        spawn_cell = weakness_grid.cell_at(circle_x, circle_y)
     circle_active = True
     timeout_expired = False
     start_time = time.time()
     last_color_change_time = start_time
     target_color = YELLOW  # Reset target color when spawning
+    trial_log.start_trial((cursor_x, cursor_y))
     
     # Add target activation event to timeline
     # Use appropriate timeout based on target type
@@ -223,11 +285,7 @@ def update_target_color(current_time):
         progress = min(time_visible_ms / TARGET_TIMEOUT_MS, 1.0)
         
         # Generate a color that shifts from red to yellow as time progresses
-        r = 255
-        g = int(255 * progress)
-        b = 0
-        
-        target_color = (r, g, b)
+        target_color = ramp_color(progress)
 
 
 def draw_sensitivity_info():
@@ -244,10 +302,20 @@ def draw_sensitivity_info():
     screen.blit(sens_surf, sens_rect)
     screen.blit(mode_surf, mode_rect)
 
+def weakness_text():
+    slowest = weakness_grid.slowest()
+    if slowest is None:
+        return "Weakest cell: -"
+    col, row, score = slowest
+    return f"Weakest cell: {col},{row} ({score:.0f}ms)  Table rebuilds: {weakness_grid.rebuilds}"
+
 def draw_instructions_and_fps(current_fps):
     instructions = [
         f"FPS: {current_fps:.0f}",
-        f"Spawn Size: {SPAWN_AREA_SIZE}px",
+        clock.stats_text(),
+        trial_log.summary_text(),
+        f"Spawn Size: {SPAWN_AREA_SIZE}px ({SPAWN_MODE})",
+        weakness_text(),
         f"Hits (Last {SPEC_WINDOW_SIZE}): {len(hit_times_ms)}",
         f"Target Timeout: {TARGET_TIMEOUT_MS}ms / Center: {TARGET_CENTER_TIMEOUT_MS}ms",
         f"Target Color Change: {TARGET_COLOR_CHANGE_MS}ms",
@@ -507,18 +575,31 @@ def draw_cursor():
     # Draw white inner rectangle
     pygame.draw.rect(screen, WHITE, (rect_x, rect_y, rect_width, rect_height))
 
+# --- Trial Logging ---
+def log_trial(outcome, time_ms):
+    if spawn_bin is not None:
+        spawn_lattice.record(spawn_bin, time_ms)  # Timeouts count as slow
+    if spawn_cell is not None:
+        weakness_grid.record(spawn_cell, time_ms, outcome == "timeout")
+    trial_log.write(start_time, outcome, time_ms, (circle_x, circle_y), CIRCLE_RADIUS, target_dpi, target_valorant_sens,
+                    spawn_bin=spawn_bin,
+                    bin=spawn_lattice.describe(spawn_bin) if spawn_bin is not None else None,
+                    cell=spawn_cell)
+
 # Function to process hit detection
 def process_hit():
     global circle_active, is_delaying, delay_start_time, current_delay_duration, last_hit_info, hit_times_ms, miss_flags, target_type
     
     if circle_active:
         distance = math.hypot(cursor_x - circle_x, cursor_y - circle_y)
+        trial_log.click((circle_x, circle_y), (cursor_x, cursor_y), CIRCLE_RADIUS, (time.time() - start_time) * 1000)
         if distance <= CIRCLE_RADIUS:
             # --- HIT! ---
             time_taken_sec = time.time() - start_time
             time_taken_ms = time_taken_sec * 1000
             hit_times_ms.append(time_taken_ms)
             miss_flags.append(False)  # Not a miss
+            log_trial("hit", time_taken_ms)
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -554,7 +635,7 @@ def process_hit():
 
 # --- Game Loop ---
 running = True
-clock = pygame.time.Clock()
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
 
 while running:
     current_frame_time = time.time()
@@ -631,6 +712,7 @@ while running:
             last_hit_info = (circle_x, circle_y, current_timeout, True)  # True means it was a timeout
             hit_times_ms.append(current_timeout)  # Add timeout value to hit times
             miss_flags.append(True)  # This was a miss
+            log_trial("timeout", hit_times_ms[-1])
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -666,19 +748,26 @@ while running:
     draw_spectrogram()
     draw_timeline()  # Draw the timeline if visible
 
+    # --- Late Latch ---
+    # Motion that arrived while the UI was drawn, so the cursor goes out where the mouse is now
+    latch_dx, latch_dy = drain_motion()
+    cursor_x = max(0, min(WIDTH - 1, cursor_x + latch_dx * sensitivity_multiplier))
+    cursor_y = max(0, min(HEIGHT - 1, cursor_y + latch_dy * sensitivity_multiplier))
+
     # Game Elements (drawn OVER background and some UI)
     if circle_active and not timeout_expired:
-        pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS)
+        target_sprites.blit(screen, CIRCLE_RADIUS, target_color, (circle_x, circle_y))
         # Display different colors or indicators based on target type
         if target_type == "center":
             pygame.draw.circle(screen, CYAN, (circle_x, circle_y), CIRCLE_RADIUS + 2, 1)  # Cyan outline for center targets
-        screen.blit(image, (circle_x-12, circle_y-6))
 
     draw_cursor() # Draw cursor last, on top of everything
     pygame.display.flip()
-    clock.tick(144)
+    trial_log.flush()
+    clock.tick()
 
 # --- Cleanup ---
+trial_log.close()
 pygame.mouse.set_visible(True)
 pygame.event.set_grab(False)
 pygame.quit()
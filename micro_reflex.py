@@ -3,6 +3,10 @@ import random
 import time
 import math
 import os # Import os module for path handling
+from target_sprites import TargetSpriteCache, CursorSpriteCache, ramp_color, ramp_colors
+from frame_pacing import FramePacer, set_display_mode
+from late_latch import drain_motion
+from fitts import TrialLog
 
 # Initialize Pygame
 pygame.init()
@@ -16,7 +20,11 @@ except pygame.error:
     print("Could not get display info, using default 800x600.")
     WIDTH, HEIGHT = 800, 600
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+# --- Frame Pacing ---
+# "refresh" paces frames to the display's refresh rate, "vsync" lets flip() wait
+# for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
 pygame.display.set_caption("Aim Trainer - Reaction Time Spectrogram")
 
 # --- Load Background Image and Sound Effect ---
@@ -85,6 +93,13 @@ last_color_change_time = 0
 # --- Circle Properties ---
 CIRCLE_RADIUS = 5
 
+# --- Target Sprites ---
+# Circle and image pre-rendered once for every color the target can take,
+# at quarter-pixel offsets so float positions are drawn without snapping
+SUBPIXEL_STEPS = 4
+target_sprites = TargetSpriteCache(image, (-12, -6), subpixel_steps=SUBPIXEL_STEPS)
+target_sprites.prebuild([CIRCLE_RADIUS], [YELLOW] + ramp_colors())
+
 # --- Spawn Area Configuration ---
 SPAWN_AREA_SIZE = 20
 CENTER_X, CENTER_Y = WIDTH // 2, HEIGHT // 2
@@ -164,23 +179,36 @@ sensitivity_multiplier = calculate_sensitivity_multiplier(target_dpi, target_val
 
 # --- Custom Cursor ---
 cursor_x, cursor_y = CENTER_X, CENTER_Y
+cursor_sprites = CursorSpriteCache(SUBPIXEL_STEPS)
 pygame.mouse.set_visible(False)
 pygame.event.set_grab(True)
 
+# --- Session Log ---
+# One record per trial in sessions/micro_reflex_<date>.jsonl, with the Fitts fields
+# of the trial's first click (see fitts.py)
+trial_log = TrialLog("micro_reflex", {
+    "circle_radius": CIRCLE_RADIUS,
+    "spawn_area_size": SPAWN_AREA_SIZE,
+    "dpi": target_dpi,
+    "sens": target_valorant_sens,
+}, (cursor_x, cursor_y))
+
 
 def spawn_circle():
     global circle_x, circle_y, circle_active, start_time, timeout_expired, last_color_change_time, target_color
     valid_x_range = MAX_SPAWN_X >= MIN_SPAWN_X
     valid_y_range = MAX_SPAWN_Y >= MIN_SPAWN_Y
-    if valid_x_range: circle_x = random.randint(MIN_SPAWN_X, MAX_SPAWN_X)
+    # Float positions, at these sizes whole pixels are too coarse a grid
+    if valid_x_range: circle_x = random.uniform(MIN_SPAWN_X, MAX_SPAWN_X)
     else: circle_x = CENTER_X
-    if valid_y_range: circle_y = random.randint(MIN_SPAWN_Y, MAX_SPAWN_Y)
+    if valid_y_range: circle_y = random.uniform(MIN_SPAWN_Y, MAX_SPAWN_Y)
     else: circle_y = CENTER_Y
     circle_active = True
     timeout_expired = False
     start_time = time.time()
     last_color_change_time = start_time
     target_color = YELLOW  # Reset target color when spawning
+    trial_log.start_trial((cursor_x, cursor_y))
     
     # Add target activation event to timeline
     add_timeline_event("target_active", TARGET_TIMEOUT_MS/1000)  # Convert ms to seconds
@@ -203,11 +231,7 @@ def update_target_color(current_time):
         progress = min(time_visible_ms / TARGET_TIMEOUT_MS, 1.0)
         
         # Generate a color that shifts from red to yellow as time progresses
-        r = 255
-        g = int(255 * progress)
-        b = 0
-        
-        target_color = (r, g, b)
+        target_color = ramp_color(progress)
 
 
 def draw_sensitivity_info():
@@ -223,6 +247,8 @@ def draw_sensitivity_info():
 def draw_instructions_and_fps(current_fps):
     instructions = [
         f"FPS: {current_fps:.0f}",
+        clock.stats_text(),
+        trial_log.summary_text(),
         f"Spawn Size: {SPAWN_AREA_SIZE}px",
         f"Hits (Last {SPEC_WINDOW_SIZE}): {len(hit_times_ms)}",
         f"Target Timeout: {TARGET_TIMEOUT_MS}ms",
@@ -472,29 +498,28 @@ def draw_timeline():
     screen.blit(miss_text, (legend_start_x + 10, legend_y))
 
 def draw_cursor():
-    # Draw a small white rectangle with black border
-    rect_width = 2
-    rect_height = 2
-    rect_x = int(cursor_x) - rect_width // 2
-    rect_y = int(cursor_y) - rect_height // 2
-    
-    # Draw black border (by drawing a slightly larger black rectangle)
-    pygame.draw.rect(screen, BLACK, (rect_x-1, rect_y-1, rect_width+2, rect_height+2))
-    # Draw white inner rectangle
-    pygame.draw.rect(screen, WHITE, (rect_x, rect_y, rect_width, rect_height))
+    # Small white square with black border, drawn at the unrounded cursor position
+    cursor_sprites.blit(screen, (cursor_x, cursor_y))
+
+# --- Trial Logging ---
+def log_trial(outcome, time_ms):
+    trial_log.write(start_time, outcome, time_ms, (circle_x, circle_y), CIRCLE_RADIUS, target_dpi, target_valorant_sens)
 
 # Function to process hit detection
 def process_hit():
     global circle_active, is_delaying, delay_start_time, current_delay_duration, last_hit_info, hit_times_ms, miss_flags
     
     if circle_active:
+        # Unrounded cursor and target, same positions the sprites are drawn at
         distance = math.hypot(cursor_x - circle_x, cursor_y - circle_y)
+        trial_log.click((circle_x, circle_y), (cursor_x, cursor_y), CIRCLE_RADIUS, (time.time() - start_time) * 1000)
         if distance <= CIRCLE_RADIUS:
             # --- HIT! ---
             time_taken_sec = time.time() - start_time
             time_taken_ms = time_taken_sec * 1000
             hit_times_ms.append(time_taken_ms)
             miss_flags.append(False)  # Not a miss
+            log_trial("hit", time_taken_ms)
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -524,7 +549,7 @@ def process_hit():
 
 # --- Game Loop ---
 running = True
-clock = pygame.time.Clock()
+clock = FramePacer(FRAME_PACING, fallback_hz=144)
 
 while running:
     current_frame_time = time.time()
@@ -590,6 +615,7 @@ while running:
             last_hit_info = (circle_x, circle_y, TARGET_TIMEOUT_MS, True)  # True means it was a timeout
             hit_times_ms.append(TARGET_TIMEOUT_MS)  # Add timeout value to hit times
             miss_flags.append(True)  # This was a miss
+            log_trial("timeout", hit_times_ms[-1])
             # Keep only the latest SPEC_WINDOW_SIZE entries
             if len(hit_times_ms) > SPEC_WINDOW_SIZE:
                 hit_times_ms = hit_times_ms[-SPEC_WINDOW_SIZE:]
@@ -625,16 +651,23 @@ while running:
     draw_spectrogram()
     draw_timeline()  # Draw the timeline if visible
 
+    # --- Late Latch ---
+    # Motion that arrived while the UI was drawn, so the cursor goes out where the mouse is now
+    latch_dx, latch_dy = drain_motion()
+    cursor_x = max(0, min(WIDTH - 1, cursor_x + latch_dx * sensitivity_multiplier))
+    cursor_y = max(0, min(HEIGHT - 1, cursor_y + latch_dy * sensitivity_multiplier))
+
     # Game Elements (drawn OVER background and some UI)
     if circle_active and not timeout_expired:
-        pygame.draw.circle(screen, target_color, (circle_x, circle_y), CIRCLE_RADIUS)
-        screen.blit(image, (circle_x-12, circle_y-6))
+        target_sprites.blit(screen, CIRCLE_RADIUS, target_color, (circle_x, circle_y))
 
     draw_cursor() # Draw cursor last, on top of everything
     pygame.display.flip()
-    clock.tick(144)
+    trial_log.flush()
+    clock.tick()
 
 # --- Cleanup ---
+trial_log.close()
 pygame.mouse.set_visible(True)
 pygame.event.set_grab(False)
 pygame.quit()
@@ -0,0 +1,56 @@
+import numpy as np
+
+# Min/max/mean pyramid for plotting long series.
+# Level 0 is the series itself, each level above holds the min, max and sum of
+# FANOUT consecutive entries of the one below. To draw trials [start, end) into
+# W pixel columns, pick the coarsest level whose blocks are still no wider than
+# a column and reduce its blocks per column, so a frame touches at most about
+# W * FANOUT entries whether the series is a thousand trials or ten million.
+# Keeping min and max per column (rather than every Nth value) means a single
+# slow trial or streak never disappears when zoomed out.
+
+FANOUT = 4
+
+
+class MinMaxPyramid:
+    def __init__(self, values, fanout=FANOUT):
+        values = np.asarray(values, dtype=np.float32)
+        self.fanout = fanout
+        self.size = len(values)
+        self.levels = [(values, values, values.astype(np.float64), np.ones(len(values)))]
+        while len(self.levels[-1][0]) > 1:
+            lo, hi, total, count = self.levels[-1]
+            starts = np.arange(0, len(lo), fanout)
+            self.levels.append((
+                np.minimum.reduceat(lo, starts),
+                np.maximum.reduceat(hi, starts),
+                np.add.reduceat(total, starts),
+                np.add.reduceat(count, starts),
+            ))
+
+    def columns(self, start, end, width):
+        """(min, max, mean) arrays with one entry per pixel column for entries [start, end)"""
+        start = max(0.0, float(start))
+        end = min(float(self.size), float(end))
+        if self.size == 0 or width <= 0 or end <= start:
+            empty = np.full(max(width, 0), np.nan)
+            return empty, empty, empty
+        per_column = (end - start) / width
+        level = 0
+        while level + 1 < len(self.levels) and self.fanout ** (level + 1) <= per_column:
+            level += 1
+        block = self.fanout ** level
+        lo, hi, total, count = self.levels[level]
+
+        # Column edges in this level's blocks, each column gets at least the block it starts in
+        edges = np.floor((start + per_column * np.arange(width)) / block).astype(np.int64)
+        first = edges[0]
+        last = min(int(np.ceil(end / block)), len(lo))
+        edges = np.minimum(edges, last - 1) - first
+        col_lo = np.minimum.reduceat(lo[first:last], edges)
+        col_hi = np.maximum.reduceat(hi[first:last], edges)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            col_mean = np.add.reduceat(total[first:last], edges) / np.add.reduceat(count[first:last], edges)
+        # reduceat gives a lone entry where a column ends before it starts, which is
+        # the block under that column anyway, so zoomed-in columns repeat a trial
+        return col_lo, col_hi, col_mean
@@ -4,6 +4,7 @@ import random
 import math
 import time
 from collections import deque
+from frame_pacing import FramePacer, set_display_mode
 
 # Initialize pygame
 pygame.init()
@@ -11,7 +12,10 @@ pygame.init()
 # Get display info and create fullscreen surface
 display_info = pygame.display.Info()
 WIDTH, HEIGHT = display_info.current_w, display_info.current_h
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+# Frame pacing: "refresh" paces to the display's refresh rate, "vsync" lets flip()
+# wait for vblank, "uncapped" renders as fast as possible
+FRAME_PACING = "refresh"
+screen = set_display_mode((WIDTH, HEIGHT), pygame.FULLSCREEN, FRAME_PACING)
 pygame.display.set_caption("Aim Reaction Trainer")
 
 # Colors
@@ -193,7 +197,7 @@ def draw_trail(surface, trail):
         color = (255, 255, 255)
         pygame.draw.line(surface, color, display_trail[i-1], display_trail[i], 2)
 
-def draw_stats(surface, game_state):
+def draw_stats(surface, game_state, present_text=None):
     """Draw statistics on screen."""
     font = pygame.font.SysFont(None, 24)
     
@@ -225,6 +229,11 @@ def draw_stats(surface, game_state):
         text_surface = font.render(avg_text, True, WHITE)
         surface.blit(text_surface, (20, text_y))
         
+    # Achieved present interval, under the stats box
+    if present_text:
+        text_surface = font.render(present_text, True, GRAY)
+        surface.blit(text_surface, (10, stats_rect.bottom + 5))
+        
     # Draw reaction time in center if just completed a target
     if game_state.last_reaction_time is not None and time.time() - game_state.idle_timer < 1.0:
         center_font = pygame.font.SysFont(None, 48)
@@ -244,7 +253,7 @@ def draw_stats(surface, game_state):
         surface.blit(text_surface, text_rect)
 
 def main():
-    clock = pygame.time.Clock()
+    clock = FramePacer(FRAME_PACING, fallback_hz=100)
     game_state = GameState()
     
     # Hide the mouse cursor
@@ -303,11 +312,11 @@ def main():
         draw_crosshair(screen, CENTER, CROSSHAIR_SIZE, WHITE)
         
         # Draw stats
-        draw_stats(screen, game_state)
+        draw_stats(screen, game_state, clock.stats_text())
         
         # Update display
         pygame.display.flip()
-        clock.tick(100)  # 100 FPS max
+        clock.tick()  # Paced to the display refresh
     
     pygame.quit()
     sys.exit()
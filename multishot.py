@@ -0,0 +1,326 @@
+import pygame
+import numpy as np
+import sys
+import time
+from frame_pacing import FramePacer, set_display_mode
+
+# Port of the Rust multishot mode (multishot/src/main.rs).
+# Targets are kept as struct-of-arrays so radius, alpha, expiry and hit tests
+# run over all targets at once instead of one Python object per target.
+
+# --- Window ---
+WIDTH, HEIGHT = 1280, 720  # Same window as the Rust build
+
+# --- Colors ---
+BG_COLOR = (10, 15, 20)
+TARGET_COLOR = (71, 217, 217)
+DOT_COLOR = (235, 242, 250)
+HUD_COLOR = (230, 237, 247)
+CROSSHAIR_COLOR = (235, 242, 250)
+
+FRAME_PACING = "refresh"  # "refresh", "vsync" or "uncapped", see frame_pacing.py
+HUD_UPDATE_S = 0.05  # Rebuild the HUD text at ~20Hz, not every frame
+SPAWN_RETRIES = 24   # Attempts to place a target away from the others
+
+
+class Config:
+    def __init__(self, duration_s=60.0, target_count=3, target_life_s=0.90, margin_px=80.0,
+                 min_r=10.0, max_r=28.0, base_points=100, speed_bonus=100,
+                 miss_penalty=50, expire_penalty=75):
+        self.duration_s = duration_s        # Timed mode length
+        self.target_count = target_count
+        self.target_life_s = target_life_s  # Base lifetime (randomized slightly per target)
+        self.margin_px = margin_px          # Keep spawns away from edges
+        self.min_r = min_r
+        self.max_r = max_r
+
+        self.base_points = base_points
+        self.speed_bonus = speed_bonus
+        self.miss_penalty = miss_penalty
+        self.expire_penalty = expire_penalty
+
+
+class Stats:
+    def __init__(self):
+        self.score = 0
+        self.shots = 0
+        self.kills = 0
+        self.expired = 0
+        self.rt_sum_s = 0.0
+        self.rt_n = 0
+
+
+def radius_at(cfg, age_s, life_s):
+    """Triangle wave grow->shrink with an ease-out, for scalars or arrays"""
+    p = np.clip(age_s / life_s, 0.0, 1.0)
+    tri = np.where(p < 0.5, p * 2.0, (1.0 - p) * 2.0)
+    eased = 1.0 - (1.0 - tri) * (1.0 - tri)  # easeOutQuad
+    return cfg.min_r + (cfg.max_r - cfg.min_r) * eased
+
+
+def alpha_at(age_s, life_s):
+    """Fully opaque until 85% of the lifetime, then fade down to 0.15"""
+    p = np.clip(age_s / life_s, 0.0, 1.0)
+    return np.where(p < 0.85, 1.0, np.clip((1.0 - p) / 0.15, 0.15, 1.0))
+
+
+def blend(color, alpha, background=BG_COLOR):
+    """Blend colors over the flat background, alpha is an array of opacities"""
+    color = np.asarray(color, dtype=float)
+    background = np.asarray(background, dtype=float)
+    return (background + (color - background) * alpha[:, None]).astype(int)
+
+
+class Game:
+    def __init__(self, cfg, width=WIDTH, height=HEIGHT, seed=None):
+        self.cfg = cfg
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+
+        # Target state, one slot per target
+        n = cfg.target_count
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.spawn_t = np.zeros(n)
+        self.life_s = np.ones(n)
+
+        self.stats = Stats()
+        self.practice = False
+        self.finished = False
+        self.start_t = 0.0
+
+        self.hud_lines = []
+        self.hud_next_update = 0.0
+
+        self.reset(time.perf_counter())
+
+    def reset(self, now):
+        self.stats = Stats()
+        self.finished = False
+        self.start_t = now
+
+        # NaN positions never fail the separation test, so slots fill in one by one
+        self.x[:] = np.nan
+        self.y[:] = np.nan
+        for i in range(self.cfg.target_count):
+            self.spawn_target(i, now)
+
+        self.hud_lines = []
+        self.hud_next_update = 0.0
+
+    def spawn_range(self):
+        """Usable x and y spawn bounds after the edge margin"""
+        # Clamp margin so we never produce invalid ranges on small windows
+        m = min(self.cfg.margin_px, self.width * 0.45, self.height * 0.45)
+        x_range = (m, self.width - m) if self.width > 2 * m else (self.width * 0.5,) * 2
+        y_range = (m, self.height - m) if self.height > 2 * m else (self.height * 0.5,) * 2
+        return x_range, y_range
+
+    def spawn_target(self, i, now):
+        """Place slot i somewhere that does not overlap the other targets"""
+        x_range, y_range = self.spawn_range()
+        life = self.cfg.target_life_s * self.rng.uniform(0.85, 1.15)
+
+        # Draw every retry at once and keep the first candidate far enough from the others
+        cx = self.rng.uniform(*x_range, SPAWN_RETRIES)
+        cy = self.rng.uniform(*y_range, SPAWN_RETRIES)
+        others = np.arange(self.cfg.target_count) != i
+        dx = cx[:, None] - self.x[None, others]
+        dy = cy[:, None] - self.y[None, others]
+        min_sep = (self.cfg.max_r * 2.2) ** 2
+        ok = ~np.any(dx * dx + dy * dy < min_sep, axis=1)
+
+        if ok.any():
+            j = int(np.argmax(ok))
+            self.x[i], self.y[i] = cx[j], cy[j]
+        else:
+            # Fallback: just place it somewhere valid
+            self.x[i] = self.rng.uniform(*x_range)
+            self.y[i] = self.rng.uniform(*y_range)
+        self.spawn_t[i] = now
+        self.life_s[i] = life
+
+    def expire_targets(self, now):
+        """Penalize and respawn every target whose lifetime ran out"""
+        for i in np.nonzero(now - self.spawn_t >= self.life_s)[0]:
+            self.stats.expired += 1
+            self.stats.score = max(self.stats.score - self.cfg.expire_penalty, 0)
+            self.spawn_target(i, now)
+
+    def shoot(self, now, mx, my):
+        self.stats.shots += 1
+
+        age_s = now - self.spawn_t
+        r = radius_at(self.cfg, age_s, self.life_s)
+        dx = mx - self.x
+        dy = my - self.y
+        hit = dx * dx + dy * dy <= r * r
+
+        if hit.any():
+            # First hit wins, same as the Rust linear scan
+            i = int(np.argmax(hit))
+            p = min(max(age_s[i] / self.life_s[i], 0.0), 1.0)
+
+            self.stats.kills += 1
+            self.stats.rt_sum_s += age_s[i]
+            self.stats.rt_n += 1
+
+            self.stats.score += self.cfg.base_points + round(self.cfg.speed_bonus * (1.0 - p))
+            self.spawn_target(i, now)
+        else:
+            self.stats.score -= self.cfg.miss_penalty
+
+        if self.stats.score < 0:
+            self.stats.score = 0
+
+    def update(self, now, fps, present_text=None):
+        if self.finished:
+            return
+
+        # Timed end
+        if not self.practice and now - self.start_t >= self.cfg.duration_s:
+            self.finished = True
+            return
+
+        self.expire_targets(now)
+
+        # Update HUD text ~20Hz to reduce allocations
+        if now >= self.hud_next_update:
+            self.hud_lines = self.hud_text(now, fps)
+            if present_text:
+                self.hud_lines.append(present_text)
+            self.hud_next_update = now + HUD_UPDATE_S
+
+    def hud_text(self, now, fps):
+        s = self.stats
+        shot_acc = s.kills / s.shots if s.shots > 0 else 0.0
+        denom = s.kills + s.expired
+        target_acc = s.kills / denom if denom > 0 else 0.0
+        avg_rt_ms = s.rt_sum_s / s.rt_n * 1000.0 if s.rt_n > 0 else 0.0
+
+        if self.practice:
+            header = "PRACTICE (inf)"
+        else:
+            header = f"TIME: {max(self.cfg.duration_s - (now - self.start_t), 0.0):>4.1f}s"
+        return [
+            header,
+            f"Score: {s.score}",
+            f"Kills: {s.kills}  Expired: {s.expired}",
+            f"Shots: {s.shots}  ShotAcc: {round(shot_acc * 100):>3}%",
+            f"TargetAcc: {round(target_acc * 100):>3}%",
+            f"Avg RT: {avg_rt_ms:>4.0f} ms",
+            f"FPS: {fps:.0f}",
+        ]
+
+    def target_shapes(self, now):
+        """Radius and the three blended colors for every target"""
+        age_s = now - self.spawn_t
+        r = radius_at(self.cfg, age_s, self.life_s)
+        a = alpha_at(age_s, self.life_s)
+        fill = blend(TARGET_COLOR, 0.18 * a + 0.08)
+        rim = blend(TARGET_COLOR, 0.95 * a)
+        dot = blend(DOT_COLOR, 0.95 * a)
+        return r, fill, rim, dot
+
+
+class Hud:
+    """Rendered HUD lines, re-rendered only when the cached text changes"""
+    def __init__(self, font):
+        self.font = font
+        self.lines = []
+        self.surfaces = []
+
+    def draw(self, surface, lines):
+        if lines != self.lines:
+            self.lines = lines
+            self.surfaces = [self.font.render(line, True, HUD_COLOR) for line in lines]
+        y = 12
+        for text_surface in self.surfaces:
+            surface.blit(text_surface, (16, y))
+            y += text_surface.get_height() + 2
+
+
+def draw_crosshair(surface, pos):
+    mx, my = pos
+    pygame.draw.line(surface, CROSSHAIR_COLOR, (mx - 10, my), (mx - 4, my), 2)
+    pygame.draw.line(surface, CROSSHAIR_COLOR, (mx + 4, my), (mx + 10, my), 2)
+    pygame.draw.line(surface, CROSSHAIR_COLOR, (mx, my - 10), (mx, my - 4), 2)
+    pygame.draw.line(surface, CROSSHAIR_COLOR, (mx, my + 4), (mx, my + 10), 2)
+    pygame.draw.circle(surface, CROSSHAIR_COLOR, (mx, my), 1)
+
+
+def draw_game(surface, game, now):
+    """Draw the background and all targets"""
+    surface.fill(BG_COLOR)
+
+    r, fill, rim, dot = game.target_shapes(now)
+    for i in range(game.cfg.target_count):
+        center = (game.x[i], game.y[i])
+        pygame.draw.circle(surface, fill[i], center, r[i])
+        pygame.draw.circle(surface, rim[i], center, r[i], 2)
+        pygame.draw.circle(surface, dot[i], center, max(r[i] * 0.18, 2.0))
+
+
+def main():
+    pygame.init()
+    screen = set_display_mode((WIDTH, HEIGHT), 0, FRAME_PACING)
+    pygame.display.set_caption("Multishot (Python)")
+
+    clock = FramePacer(FRAME_PACING, fallback_hz=144)
+    game = Game(Config())
+    hud = Hud(pygame.font.SysFont(None, 26))
+    finish_font = pygame.font.SysFont(None, 44)
+    cursor_grabbed = False
+
+    running = True
+    while running:
+        now = time.perf_counter()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                # Toggles / restart
+                elif event.key == pygame.K_r:
+                    game.reset(now)
+                elif event.key == pygame.K_p:
+                    game.practice = not game.practice
+                    game.reset(now)
+                elif event.key == pygame.K_g:
+                    cursor_grabbed = not cursor_grabbed
+                    pygame.event.set_grab(cursor_grabbed)
+                    pygame.mouse.set_visible(not cursor_grabbed)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if not game.finished:
+                    game.shoot(now, *event.pos)
+
+        was_finished = game.finished
+        game.update(now, clock.get_fps(), clock.stats_text())
+        if game.finished and not was_finished:
+            # Restore cursor when run ends
+            cursor_grabbed = False
+            pygame.event.set_grab(False)
+            pygame.mouse.set_visible(True)
+
+        draw_game(screen, game, now)
+        draw_crosshair(screen, pygame.mouse.get_pos())
+        hud.draw(screen, game.hud_lines)
+
+        if game.finished:
+            y = HEIGHT // 2
+            for line in ("RUN COMPLETE", "R = Restart   P = Practice"):
+                text_surface = finish_font.render(line, True, (242, 247, 255))
+                screen.blit(text_surface, text_surface.get_rect(midtop=(WIDTH // 2, y)))
+                y += text_surface.get_height()
+
+        pygame.display.flip()
+        clock.tick()
+
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
@@ -222,6 +222,18 @@ impl Game {
         }
     }
 
+    fn expire_targets(&mut self, now: f64) {
+        for i in 0..self.targets.len() {
+            let t = self.targets[i];
+            let age_s = (now - t.spawn_t) as f32;
+            if age_s >= t.life_s {
+                self.stats.expired += 1;
+                self.stats.score = (self.stats.score - self.cfg.expire_penalty).max(0);
+                self.targets[i] = self.spawn_target(now);
+            }
+        }
+    }
+
     fn update(&mut self) {
         let now = get_time();
 
@@ -263,15 +275,7 @@ impl Game {
         }
 
         // Expire targets
-        for i in 0..self.targets.len() {
-            let t = self.targets[i];
-            let age_s = (now - t.spawn_t) as f32;
-            if age_s >= t.life_s {
-                self.stats.expired += 1;
-                self.stats.score = (self.stats.score - self.cfg.expire_penalty).max(0);
-                self.targets[i] = self.spawn_target(now);
-            }
-        }
+        self.expire_targets(now);
 
         // Shoot input
         if is_mouse_button_pressed(MouseButton::Left) {
@@ -390,8 +394,58 @@ impl Game {
     }
 }
 
+// -------- Per-frame benchmark (`cargo run --release -- --bench`) --------
+// Replays the same frames as multishot_bench.py: expire, radius/alpha for every
+// target, and a click every 10 frames alternating hit and miss. Drawing is left
+// out so only the logic the Python port mirrors is timed.
+fn run_bench() {
+    const FRAMES: usize = 20_000;
+    const DT: f64 = 1.0 / 144.0;
+
+    for &n in &[3usize, 30, 300] {
+        let cfg = Config { target_count: n, ..Default::default() };
+        let mut game = Game::new(cfg);
+        let t0 = game.start_t;
+        let mut sink = 0.0f32;
+
+        let start = std::time::Instant::now();
+        for frame in 0..FRAMES {
+            let now = t0 + frame as f64 * DT;
+            game.expire_targets(now);
+
+            for t in &game.targets {
+                let age_s = (now - t.spawn_t) as f32;
+                sink += game.radius_at(age_s, t.life_s) + game.alpha_at(age_s, t.life_s);
+            }
+
+            if frame % 10 == 0 {
+                let (mx, my) = if frame % 20 == 0 {
+                    let t = game.targets[frame % n];
+                    (t.x, t.y)
+                } else {
+                    (0.0, 0.0)
+                };
+                game.shoot(now, mx, my);
+            }
+        }
+        let elapsed = start.elapsed();
+        std::hint::black_box(sink);
+
+        println!(
+            "bench targets={} frame_us={:.3}",
+            n,
+            elapsed.as_secs_f64() * 1e6 / FRAMES as f64
+        );
+    }
+}
+
 #[macroquad::main(window_conf)]
 async fn main() {
+    if std::env::args().any(|a| a == "--bench") {
+        run_bench();
+        return;
+    }
+
     let cfg = Config::default();
     let mut game = Game::new(cfg);
 
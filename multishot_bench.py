@@ -0,0 +1,92 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Per-frame cost of the Python multishot mode against the Rust build.
+# Both sides replay the same frame: expire targets, evaluate radius and alpha for
+# every target, and click every 10 frames (alternating hit and miss).
+# Run from the repo root: python multishot_bench.py
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Draw timing needs no real window
+import pygame
+import multishot
+
+TARGET_COUNTS = [3, 30, 300]
+FRAMES = 20000
+DT = 1.0 / 144.0
+RUST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "multishot")
+
+
+def run_frames(game, frames, surface=None):
+    """Replay the benchmark frames on a game, optionally drawing each one"""
+    n = game.cfg.target_count
+    t0 = game.start_t
+    start = time.perf_counter()
+    for frame in range(frames):
+        now = t0 + frame * DT
+        game.expire_targets(now)
+
+        if surface is None:
+            game.target_shapes(now)
+        else:
+            multishot.draw_game(surface, game, now)
+
+        # One click every 10 frames, alternating between a hit and a miss
+        if frame % 10 == 0:
+            if frame % 20 == 0:
+                i = frame % n
+                game.shoot(now, game.x[i], game.y[i])
+            else:
+                game.shoot(now, 0.0, 0.0)
+    return (time.perf_counter() - start) * 1e6 / frames
+
+
+def bench_python():
+    """Microseconds per frame for the logic alone and logic plus software drawing"""
+    surface = pygame.Surface((multishot.WIDTH, multishot.HEIGHT))
+    results = {}
+    for n in TARGET_COUNTS:
+        cfg = multishot.Config(target_count=n)
+        logic_us = run_frames(multishot.Game(cfg, seed=1), FRAMES)
+        draw_us = run_frames(multishot.Game(cfg, seed=1), FRAMES // 10, surface)
+        results[n] = (logic_us, draw_us)
+    return results
+
+
+def bench_rust():
+    """Microseconds per frame from the Rust build's --bench mode, None if it can't run"""
+    try:
+        out = subprocess.run(["cargo", "run", "--release", "--quiet", "--", "--bench"],
+                             cwd=RUST_DIR, capture_output=True, text=True, timeout=600)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Could not run the Rust benchmark: {e}")
+        return None
+    if out.returncode != 0:
+        print(f"Rust benchmark failed:\n{out.stderr.strip()}")
+        return None
+
+    results = {}
+    for match in re.finditer(r"bench targets=(\d+) frame_us=([\d.]+)", out.stdout):
+        results[int(match.group(1))] = float(match.group(2))
+    return results
+
+
+def main():
+    pygame.init()
+    python_results = bench_python()
+    rust_results = bench_rust() if "--no-rust" not in sys.argv else None
+
+    print(f"{'targets':>8} {'py logic us':>12} {'py +draw us':>12} {'rust us':>10} {'py/rust':>8}")
+    for n in TARGET_COUNTS:
+        logic_us, draw_us = python_results[n]
+        rust_us = rust_results.get(n) if rust_results else None
+        rust_col = f"{rust_us:10.3f}" if rust_us is not None else f"{'-':>10}"
+        ratio_col = f"{logic_us / rust_us:8.1f}" if rust_us else f"{'-':>8}"
+        print(f"{n:>8} {logic_us:12.2f} {draw_us:12.2f} {rust_col} {ratio_col}")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import pygame
+from pygame._sdl2 import sdl2
+from pygame._sdl2.video import Window, Renderer, Texture
+
+# Alternative to drawing everything on the set_mode() surface.
+# Static images are uploaded to textures once and composited by the SDL2 renderer,
+# UI panels are rasterized into layers that are only re-uploaded when they change,
+# so the Python thread no longer touches every pixel of the screen each frame.
+# Only horizontal_6.py uses it (RENDER_BACKEND = "sdl2"), the other trainers still
+# draw on the set_mode() surface.
+
+BLENDMODE_BLEND = 1  # SDL_BLENDMODE_BLEND
+
+
+class Layer:
+    """Software surface mirrored into a texture, re-uploaded only when marked dirty"""
+    def __init__(self, renderer, size, pos=(0, 0)):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.texture = Texture(renderer, size, streaming=True)
+        self.texture.blend_mode = BLENDMODE_BLEND
+        self.pos = pos
+        self.dirty = True
+
+    def clear(self):
+        """Make the layer fully transparent before redrawing it"""
+        self.surface.fill((0, 0, 0, 0))
+        self.dirty = True
+
+    def draw(self):
+        if self.dirty:
+            self.texture.update(self.surface)
+            self.dirty = False
+        self.texture.draw(dstrect=(self.pos, self.surface.get_size()))
+
+
+class Sdl2Display:
+    """Window with an SDL2 renderer, falls back to the software renderer without a GPU"""
+    def __init__(self, title, size, fullscreen=True, vsync=False, software=False):
+        self.size = size
+        self.window = Window(title, size=size, fullscreen=fullscreen)
+        self.renderer = None
+        self.accelerated = False
+
+        if not software:
+            try:
+                self.renderer = Renderer(self.window, accelerated=1, vsync=vsync)
+                self.accelerated = True
+            except (pygame.error, sdl2.error) as e:
+                print(f"Hardware renderer unavailable: {e}")
+                print("Falling back to the software renderer.")
+        if self.renderer is None:
+            self.renderer = Renderer(self.window, accelerated=0)
+
+        self.textures = {}
+        self.layers = {}
+
+    def texture(self, key, make_surface, *args):
+        """Build and upload a static surface the first time its key is seen, return the texture"""
+        texture = self.textures.get(key)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, make_surface(*args))
+            texture.blend_mode = BLENDMODE_BLEND
+            self.textures[key] = texture
+        return texture
+
+    def layer(self, key, size, pos=(0, 0)):
+        """Cached Layer for UI that changes now and then"""
+        layer = self.layers.get(key)
+        if layer is None or layer.surface.get_size() != tuple(size):
+            layer = Layer(self.renderer, size, pos)
+            self.layers[key] = layer
+        layer.pos = pos
+        return layer
+
+    def clear(self, color):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def fill_rect(self, color, rect):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(rect)
+
+    def draw(self, texture, pos, color=None, alpha=255):
+        """Copy a texture with its top left at pos, optionally tinted and faded"""
+        if color is not None:
+            texture.color = color
+        texture.alpha = alpha
+        texture.draw(dstrect=(pos, (texture.width, texture.height)))
+
+    def draw_centered(self, texture, center, color=None, alpha=255):
+        self.draw(texture, (center[0] - texture.width / 2, center[1] - texture.height / 2), color, alpha)
+
+    def present(self):
+        self.renderer.present()
@@ -0,0 +1,65 @@
+import glob
+import json
+import os
+import time
+from collections import deque
+
+# Per-session trial log.
+# Every run of a mode writes sessions/<mode>_<date>_<time>.jsonl: a header line
+# with the settings, then one JSON object per trial. Records are queued by the
+# game logic and written out by flush(), so a slow disk never stalls a trial.
+
+SESSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions")
+
+
+class SessionLog:
+    def __init__(self, mode, settings=None, directory=SESSIONS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.start_time = time.time()
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.start_time))
+        self.path = os.path.join(directory, f"{mode}_{stamp}.jsonl")
+        self.pending = deque()
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.write({"type": "session", "mode": mode, "start": self.start_time, "settings": settings or {}})
+
+    def write(self, record):
+        """Queue a record, thread safe, written on the next flush()"""
+        self.pending.append(record)
+
+    def flush(self):
+        if not self.pending:
+            return
+        while self.pending:
+            self.file.write(json.dumps(self.pending.popleft()) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def read_session(path):
+    """Header and trial records of one session file"""
+    header = {}
+    trials = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Truncated last line after a crash
+            if record.get("type") == "session":
+                header = record
+            elif record.get("type") == "trial":
+                trials.append(record)
+    return header, trials
+
+
+def list_sessions(mode=None, directory=SESSIONS_DIR):
+    """Session files oldest first, optionally only one mode's"""
+    # The date right after the mode, so "horizontal" doesn't pick up horizontal_2's files
+    pattern = f"{mode}_{'[0-9]' * 8}_*.jsonl" if mode else "*.jsonl"
+    return sorted(glob.glob(os.path.join(directory, pattern)), key=os.path.getmtime)
@@ -0,0 +1,67 @@
+import math
+import random
+
+# Spawn lattice.
+# Uniform x/y in a box over-samples the corners and leaves whole directions
+# unvisited for a while. Instead the disc around the center is split into
+# angle sectors and equal-area eccentricity rings, and bins are dealt from a
+# shuffled deck: every bin comes up once per block, in random order, and a
+# spawn is a pop plus one random point inside the bin.
+# With slow_bias > 0 the deck also gets one extra card for each of the slowest
+# bins, judged by the per-bin latency table fed by record().
+
+LATENCY_WINDOW = 20  # Per-bin mean over roughly the last this many trials
+
+
+class SpawnLattice:
+    """(angle, eccentricity) bins around a center, dealt from a shuffled deck"""
+    def __init__(self, center, max_radius, angles=8, rings=3, min_radius=0.0, slow_bias=0.0, rng=random):
+        self.center = center
+        self.rng = rng
+        self.slow_bias = slow_bias
+        step = 2 * math.pi / angles
+        # Equal-area rings, so every bin covers the same area of the disc
+        edges = [math.sqrt(min_radius ** 2 + (max_radius ** 2 - min_radius ** 2) * i / rings) for i in range(rings + 1)]
+        self.bins = [(a * step, (a + 1) * step, edges[r], edges[r + 1]) for r in range(rings) for a in range(angles)]
+        self.rt_count = [0] * len(self.bins)
+        self.rt_mean = [0.0] * len(self.bins)
+        self.deck = []
+        self.block_size = 0
+
+    def slowest_bins(self):
+        """The bins that get an extra card, slowest measured first"""
+        extra = int(self.slow_bias * len(self.bins))
+        measured = [i for i in range(len(self.bins)) if self.rt_count[i]]
+        measured.sort(key=lambda i: self.rt_mean[i], reverse=True)
+        return measured[:extra]
+
+    def deal_block(self):
+        deck = list(range(len(self.bins))) + self.slowest_bins()
+        self.rng.shuffle(deck)
+        self.deck = deck
+        self.block_size = len(deck)
+
+    def point(self, index):
+        """Uniform random point inside a bin"""
+        a0, a1, r0, r1 = self.bins[index]
+        angle = self.rng.uniform(a0, a1)
+        radius = math.sqrt(self.rng.uniform(r0 * r0, r1 * r1))
+        return self.center[0] + radius * math.cos(angle), self.center[1] + radius * math.sin(angle)
+
+    def spawn(self):
+        """Next bin off the deck and a point in it"""
+        if not self.deck:
+            self.deal_block()
+        index = self.deck.pop()
+        return index, self.point(index)
+
+    def record(self, index, rt_ms):
+        """Running mean that settles into a moving average after LATENCY_WINDOW trials"""
+        self.rt_count[index] += 1
+        n = min(self.rt_count[index], LATENCY_WINDOW)
+        self.rt_mean[index] += (rt_ms - self.rt_mean[index]) / n
+
+    def describe(self, index):
+        """Bin as (angle range in degrees, eccentricity range in px) for the session log"""
+        a0, a1, r0, r1 = self.bins[index]
+        return {"angle": [round(math.degrees(a0)), round(math.degrees(a1))], "eccentricity": [round(r0, 1), round(r1, 1)]}
@@ -0,0 +1,98 @@
+from bisect import bisect_right
+from collections import namedtuple
+
+# Strafing target motion.
+# A path is a list of segments of constant acceleration along x, so the
+# target's offset at any time has a closed form: x0 + v0*t + a*t^2/2 in the
+# segment t falls into. Rendering and click-time hit tests evaluate it at their
+# own timestamp, nothing is integrated frame by frame.
+#
+# Bot timings from valo_bots_hard.txt: the range bots on hard stay up ~450ms
+# (frames 40342-40810, 41349-41810) with ~550ms between them.
+
+STRAFE_SPEED_PX_S = 300     # Full running speed
+COUNTER_STRAFE_MS = 40      # Counter-strafe from full speed to a stop
+ACCELERATION_MS = 120       # From standing to full speed
+
+BotTiming = namedtuple("BotTiming", ["timeout_ms", "delay_ms"])
+BOT_TIMINGS = {
+    "valorant_hard": BotTiming(450, 550),
+}
+
+
+class StrafePath:
+    """Piecewise constant-acceleration motion along x, offsets relative to the spawn point"""
+    def __init__(self, name, segments, start_velocity=0.0):
+        # segments: (duration_s, acceleration_px_s2, velocity_px_s or None to carry on)
+        self.name = name
+        self.starts = []
+        self.params = []  # (x0, v0, a) per segment
+        t = x = 0.0
+        v = start_velocity
+        for duration, acceleration, velocity in segments:
+            if velocity is not None:
+                v = velocity
+            self.starts.append(t)
+            self.params.append((x, v, acceleration))
+            x += v * duration + 0.5 * acceleration * duration * duration
+            v += acceleration * duration
+            t += duration
+        # Past the last segment the target keeps its final velocity
+        self.starts.append(t)
+        self.params.append((x, v, 0.0))
+
+    def offset(self, t):
+        """x offset t seconds after the spawn"""
+        if t <= 0:
+            return 0.0
+        i = bisect_right(self.starts, t) - 1
+        x0, v0, a = self.params[i]
+        dt = t - self.starts[i]
+        return x0 + v0 * dt + 0.5 * a * dt * dt
+
+    def velocity(self, t):
+        i = max(0, bisect_right(self.starts, t) - 1)
+        _, v0, a = self.params[i]
+        return v0 + a * (max(t, 0.0) - self.starts[i])
+
+
+def constant_path(direction, speed=STRAFE_SPEED_PX_S):
+    return StrafePath("constant", [], direction * speed)
+
+
+def accelerate_path(direction, speed=STRAFE_SPEED_PX_S):
+    """From standing to full speed, then holds it"""
+    ramp = ACCELERATION_MS / 1000
+    return StrafePath("accelerate", [(ramp, direction * speed / ramp, 0.0)])
+
+
+def counter_strafe_path(direction, speed=STRAFE_SPEED_PX_S, run_ms=200, hold_ms=100):
+    """Runs, counter-strafes to a dead stop, holds, then runs back"""
+    stop = COUNTER_STRAFE_MS / 1000
+    v = direction * speed
+    return StrafePath("counter_strafe", [
+        (run_ms / 1000, 0.0, v),
+        (stop, -v / stop, None),
+        (hold_ms / 1000, 0.0, 0.0),
+        (stop, -v / stop, None),
+    ])
+
+
+def adad_path(direction, speed=STRAFE_SPEED_PX_S, swing_ms=150):
+    """Left-right jiggle with counter-strafed reversals, what the hard bots do"""
+    stop = COUNTER_STRAFE_MS / 1000
+    v = direction * speed
+    segments = []
+    for _ in range(4):
+        segments.append((swing_ms / 1000, 0.0, v))
+        segments.append((stop, -2 * v / stop, None))  # Through zero into the other direction
+        v = -v
+    return StrafePath("adad", segments)
+
+
+STRAFE_PATHS = {
+    "constant": constant_path,
+    "accelerate": accelerate_path,
+    "counter_strafe": counter_strafe_path,
+    "adad": adad_path,
+}
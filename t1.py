@@ -5,10 +5,10 @@ from direct.task import Task
 from direct.gui.OnscreenText import OnscreenText
 from direct.gui.DirectGui import DirectFrame
 from panda3d.core import (
-    WindowProperties, CollisionTraverser, CollisionNode, 
-    CollisionRay, CollisionHandlerQueue, CollisionSphere, Vec3, Vec4, 
-    NodePath, BitMask32, LPoint3, TextNode, CardMaker
+    WindowProperties, Vec3, Vec4, NodePath, LPoint3, TextNode, CardMaker,
+    ClockObject, loadPrcFileData
 )
+import numpy as np
 import random
 import math
 import time
@@ -19,12 +19,116 @@ TARGET_SIZE = 0.5
 TARGET_COUNT = 10
 TARGET_SPAWN_RADIUS = 15
 CROSSHAIR_SIZE = 0.02  # Increased crosshair size
-MOUSE_SENSITIVITY = 0.2
+
+# --- Sensitivity Simulation Settings ---
+target_dpi = 1600
+target_valorant_sens = 0.2
+VALORANT_YAW = 0.07  # Degrees turned per mouse count at sensitivity 1.0
 TARGET_COLORS = {
     "normal": (1, 0, 0, 1),    # Bright red
     "hit": (0, 1, 0, 1)        # Green
 }
 
+# Frame pacing and stats display
+VSYNC = False         # Sync buffer swaps to the monitor refresh
+FPS_CAP = 0           # Fixed frame rate limit, 0 runs uncapped
+STATS_UPDATE_HZ = 10  # Timer and frame time readout refresh rate
+
+# The sync-video setting has to be in place before ShowBase opens the window
+loadPrcFileData("", f"sync-video {'#t' if VSYNC else '#f'}")
+
+def calculate_sensitivity_multiplier(dpi, sens):
+    """Degrees of camera rotation per raw mouse count, same eDPI model as Valorant"""
+    # DPI only changes how many counts one inch of hand movement produces,
+    # the in-game rotation per count depends on the sensitivity alone
+    return sens * VALORANT_YAW
+
+def calculate_cm_per_360(dpi, sens):
+    """Hand movement in centimeters for a full turn"""
+    counts_per_360 = 360 / calculate_sensitivity_multiplier(dpi, sens)
+    return counts_per_360 / dpi * 2.54
+
+def ray_sphere_hit(origin, direction, centers, radii, alive):
+    """Return the index of the nearest sphere hit by the ray, or -1 on a miss"""
+    # Vector from the ray origin to every target center
+    oc = centers - origin
+    # Distance along the ray to the closest approach of each center
+    t_closest = oc @ direction
+    # Squared distance between each center and the ray at that point
+    dist_sq = np.einsum("ij,ij->i", oc, oc) - t_closest * t_closest
+    half_chord_sq = radii * radii - dist_sq
+
+    hit = alive & (half_chord_sq >= 0)
+    if not hit.any():
+        return -1
+
+    # Entry distance, or exit distance if the origin is inside the sphere
+    half_chord = np.sqrt(np.where(hit, half_chord_sq, 0.0))
+    t_hit = t_closest - half_chord
+    t_hit = np.where(t_hit < 0, t_closest + half_chord, t_hit)
+    hit &= t_hit >= 0
+    if not hit.any():
+        return -1
+
+    return int(np.argmin(np.where(hit, t_hit, np.inf)))
+
+class StatsPresenter:
+    """Push stats to the OnscreenText nodes only when their text actually changes"""
+    def __init__(self, ui_text, update_hz):
+        self.ui_text = ui_text
+        self.update_interval = 1.0 / update_hz
+        self.next_update_time = 0.0
+        self.last_text = {}
+        self.last_counters = None
+
+        # Frame times accumulated between two timed refreshes
+        self.frame_time_sum = 0.0
+        self.frame_time_max = 0.0
+        self.frame_count = 0
+
+    def set_text(self, key, text):
+        """Regenerate the text geometry only if the string differs from what is shown"""
+        if self.last_text.get(key) != text:
+            self.ui_text[key].setText(text)
+            self.last_text[key] = text
+
+    def add_frame_time(self, dt):
+        """Record the duration of one rendered frame"""
+        self.frame_time_sum += dt
+        self.frame_time_max = max(self.frame_time_max, dt)
+        self.frame_count += 1
+
+    def update_counters(self, hits, shots):
+        """Refresh hit, shot and accuracy texts when the counters changed"""
+        if self.last_counters == (hits, shots):
+            return
+        self.last_counters = (hits, shots)
+
+        accuracy = (hits / shots) * 100 if shots > 0 else 0
+        self.set_text("accuracy", f"Accuracy: {accuracy:.1f}%")
+        self.set_text("hits", f"Hits: {hits}")
+        self.set_text("shots", f"Shots: {shots}")
+
+    def update_timed(self, now, elapsed_time):
+        """Refresh the timer and frame time readout at the configured rate"""
+        if now < self.next_update_time:
+            return
+        self.next_update_time = now + self.update_interval
+
+        self.set_text("timer", f"Time: {elapsed_time:.1f}s")
+        if self.frame_count > 0:
+            avg_ms = self.frame_time_sum / self.frame_count * 1000
+            max_ms = self.frame_time_max * 1000
+            self.set_text("frame_time", f"Frame: {avg_ms:.1f} ms (max {max_ms:.1f} ms)")
+        self.frame_time_sum = 0.0
+        self.frame_time_max = 0.0
+        self.frame_count = 0
+
+    def reset(self):
+        """Force every text to be rewritten on the next update"""
+        self.last_counters = None
+        self.next_update_time = 0.0
+
 class ValorantAimTrainer(ShowBase):
     def __init__(self):
         ShowBase.__init__(self)
@@ -38,9 +142,6 @@ class ValorantAimTrainer(ShowBase):
         # Hide default mouse cursor and set up first-person mouse control
         self.setup_mouse_control()
         
-        # Set up collision detection
-        self.setup_collision()
-        
         # Create crosshair
         self.create_crosshair()
         
@@ -54,7 +155,7 @@ class ValorantAimTrainer(ShowBase):
         self.create_ui()
         
         # Create targets
-        self.targets = []
+        self.create_target_pool()
         self.spawn_targets(TARGET_COUNT)
         
         # Set up key bindings
@@ -78,6 +179,12 @@ class ValorantAimTrainer(ShowBase):
         
         # Disable default camera controls
         self.disableMouse()
+        
+        # Optionally limit the frame rate, the clock sleeps off the rest of each frame
+        if FPS_CAP > 0:
+            clock = ClockObject.getGlobalClock()
+            clock.setMode(ClockObject.MLimited)
+            clock.setFrameRate(FPS_CAP)
 
     def setup_camera(self):
         """Set up the camera with Valorant's FOV"""
@@ -90,12 +197,9 @@ class ValorantAimTrainer(ShowBase):
 
     def setup_mouse_control(self):
         """Set up first-person mouse control"""
-        self.heading = 0
-        self.pitch = 0
-        
-        # Center mouse position
-        self.center_x = 0
-        self.center_y = 0
+        self.heading = 0.0
+        self.pitch = 0.0
+        self.sensitivity_multiplier = calculate_sensitivity_multiplier(target_dpi, target_valorant_sens)
         
         # Set mouse to relative mode for better FPS controls
         props = WindowProperties()
@@ -103,45 +207,49 @@ class ValorantAimTrainer(ShowBase):
         props.setMouseMode(WindowProperties.M_relative)
         self.win.requestProperties(props)
         
-        # Add task to handle mouse movement
-        self.taskMgr.add(self.mouse_task, "MouseTask")
+        # Start from the window center, deltas are measured from the last known pointer position
+        self.center_x = self.win.getXSize() // 2
+        self.center_y = self.win.getYSize() // 2
+        self.win.movePointer(0, self.center_x, self.center_y)
+        self.last_pointer_x = self.center_x
+        self.last_pointer_y = self.center_y
+        
+        # Sample the mouse as late as possible, right before the frame is rendered (igLoop is sort 50)
+        self.taskMgr.add(self.mouse_task, "MouseTask", sort=49)
+
+    def sample_mouse(self):
+        """Turn the camera by the raw mouse counts received since the last sample"""
+        pointer = self.win.getPointer(0)
+        if not pointer.getInWindow():
+            return
+        
+        # Raw relative counts, no normalization by window size and no jitter threshold
+        x, y = pointer.getX(), pointer.getY()
+        dx = x - self.last_pointer_x
+        dy = y - self.last_pointer_y
+        
+        # Keep the pointer centered when the platform allows it, otherwise track where it is
+        if (dx or dy) and self.win.movePointer(0, self.center_x, self.center_y):
+            self.last_pointer_x, self.last_pointer_y = self.center_x, self.center_y
+        else:
+            self.last_pointer_x, self.last_pointer_y = x, y
+        
+        if dx or dy:
+            # Accumulate in float degrees so single-count micro-adjustments are kept
+            self.heading -= dx * self.sensitivity_multiplier
+            self.pitch -= dy * self.sensitivity_multiplier
+            
+            # Limit pitch to 90 degrees up and down
+            self.pitch = max(-90.0, min(90.0, self.pitch))
+            
+            # Set the camera's orientation
+            self.camera.setHpr(self.heading, self.pitch, 0)
 
     def mouse_task(self, task):
         """Handle mouse movement for camera control"""
-        if self.mouseWatcherNode.hasMouse():
-            # Get mouse position delta in relative mode
-            dx = self.mouseWatcherNode.getMouseX()
-            dy = self.mouseWatcherNode.getMouseY()
-            
-            # Only update if there's significant movement to prevent jitter
-            if abs(dx) > 0.001 or abs(dy) > 0.001:
-                # Apply sensitivity to mouse movement
-                self.heading -= dx * MOUSE_SENSITIVITY * 100
-                self.pitch -= dy * MOUSE_SENSITIVITY * 100
-                
-                # Limit pitch to 90 degrees up and down
-                self.pitch = max(-90, min(90, self.pitch))
-                
-                # Set the camera's orientation
-                self.camera.setHpr(self.heading, self.pitch, 0)
-                
+        self.sample_mouse()
         return Task.cont
 
-    def setup_collision(self):
-        """Set up collision detection for shooting targets"""
-        self.cTrav = CollisionTraverser()
-        self.shooterRay = CollisionRay()
-        self.shooterNode = CollisionNode('shooterRay')
-        self.shooterNode.addSolid(self.shooterRay)
-        self.shooterNode.setFromCollideMask(BitMask32.bit(1))
-        self.shooterNode.setIntoCollideMask(BitMask32.allOff())
-        self.shooterNP = self.camera.attachNewNode(self.shooterNode)
-        self.shooterRay.setOrigin(0, 0, 0)
-        self.shooterRay.setDirection(0, 1, 0)
-        
-        self.shooterHandler = CollisionHandlerQueue()
-        self.cTrav.addCollider(self.shooterNP, self.shooterHandler)
-
     def create_crosshair(self):
         """Create a crosshair in the center of the screen"""
         # Crosshair consists of four lines - Valorant-style
@@ -230,47 +338,73 @@ class ValorantAimTrainer(ShowBase):
             align=TextNode.ALeft
         )
         
+        # Create frame time text
+        self.ui_text["frame_time"] = OnscreenText(
+            text="Frame: - ms",
+            pos=(-1.3, 0.5),
+            scale=0.05,
+            fg=(1, 1, 1, 1),
+            align=TextNode.ALeft
+        )
+        
+        self.stats_presenter = StatsPresenter(self.ui_text, STATS_UPDATE_HZ)
+        
         # Instructions
         self.ui_text["instructions"] = OnscreenText(
-            text="Left-click to shoot | R to reset | ESC to quit",
+            text=(f"Sens {target_valorant_sens:.3f} @ {target_dpi} DPI "
+                  f"({calculate_cm_per_360(target_dpi, target_valorant_sens):.1f} cm/360) | "
+                  "Left-click to shoot | R to reset | ESC to quit"),
             pos=(0, -0.9),
             scale=0.04,
             fg=(1, 1, 1, 1),
             align=TextNode.ACenter
         )
 
+    def create_target_pool(self):
+        """Preallocate the target nodes once and reuse them for every spawn"""
+        # Load the sphere a single time, every pooled target instances the same geometry
+        self.target_model = self.loader.loadModel("models/misc/sphere")
+        self.target_model.setScale(TARGET_SIZE, TARGET_SIZE, TARGET_SIZE)
+
+        # Contiguous target geometry for the analytic hit test, indexed like self.targets
+        self.target_centers = np.zeros((TARGET_COUNT, 3))
+        self.target_radii = np.full(TARGET_COUNT, TARGET_SIZE, dtype=float)
+        self.target_alive = np.zeros(TARGET_COUNT, dtype=bool)
+
+        self.targets = []
+        for i in range(TARGET_COUNT):
+            # Each slot gets its own parent node so it can be moved and re-colored on its own
+            target = self.render.attachNewNode(f"target_slot{i}")
+            self.target_model.instanceTo(target)
+
+            # Hidden until spawned, stashed nodes are skipped by rendering
+            target.stash()
+            self.targets.append({"node": target, "hit": False})
+
     def spawn_targets(self, count):
         """Spawn multiple targets around the player"""
-        for _ in range(count):
-            self.spawn_target()
+        for target_index in range(min(count, len(self.targets))):
+            self.spawn_target(target_index)
+
+    def spawn_target(self, target_index):
+        """Re-position and re-color a pooled target at a random location"""
+        target = self.targets[target_index]
 
-    def spawn_target(self):
-        """Spawn a single target at a random position"""
-        # Create a sphere for the target
-        target = self.loader.loadModel("models/misc/sphere")
-        target.setScale(TARGET_SIZE, TARGET_SIZE, TARGET_SIZE)
-        target.setColor(*TARGET_COLORS["normal"])
-        
         # Position the target at a random location within the spawn radius
         theta = random.uniform(0, 2 * math.pi)
         phi = random.uniform(0, math.pi)
         x = TARGET_SPAWN_RADIUS * math.sin(phi) * math.cos(theta)
         y = TARGET_SPAWN_RADIUS * math.sin(phi) * math.sin(theta)
         z = TARGET_SPAWN_RADIUS * math.cos(phi)
-        
-        target.setPos(x, y, z)
-        target.reparentTo(self.render)
-        
-        # Set up collision for this target
-        target_coll = CollisionNode(f'target{len(self.targets)}')
-        # Create a collision sphere with the same radius as the target
-        coll_sphere = CollisionSphere(0, 0, 0, TARGET_SIZE)
-        target_coll.addSolid(coll_sphere)
-        target_coll.setIntoCollideMask(BitMask32.bit(1))
-        target_np = target.attachNewNode(target_coll)
-        
-        # Store the target in our list
-        self.targets.append({"node": target, "collision": target_np, "hit": False})
+
+        target["node"].setPos(x, y, z)
+        target["node"].setColor(*TARGET_COLORS["normal"])
+        target["node"].unstash()
+        target["hit"] = False
+
+        self.target_centers[target_index] = (x, y, z)
+        self.target_alive[target_index] = True
+
         self.stats["targets_spawned"] += 1
 
     def shoot(self):
@@ -278,21 +412,18 @@ class ValorantAimTrainer(ShowBase):
         # Increment shot counter
         self.stats["shots"] += 1
         
-        # Traverse the collision ray
-        self.cTrav.traverse(self.render)
+        # Latch the newest mouse motion so the shot uses the orientation at the click
+        self.sample_mouse()
+        
+        # Cast the camera forward ray against every target sphere at once
+        origin = self.camera.getPos(self.render)
+        direction = self.render.getRelativeVector(self.camera, Vec3(0, 1, 0))
+        direction.normalize()
+        target_index = ray_sphere_hit(np.array(origin), np.array(direction),
+                                      self.target_centers, self.target_radii, self.target_alive)
         
         # Check if we hit anything
-        if self.shooterHandler.getNumEntries() > 0:
-            # Sort entries by distance
-            self.shooterHandler.sortEntries()
-            entry = self.shooterHandler.getEntry(0)
-            
-            # Get the target we hit
-            hit_target_name = entry.getIntoNode().getName()
-            
-            # Extract the target index from the name
-            target_index = int(hit_target_name[6:])
-            
+        if target_index >= 0:
             # Check if this target was already hit
             if not self.targets[target_index]["hit"]:
                 # Mark as hit
@@ -307,34 +438,24 @@ class ValorantAimTrainer(ShowBase):
                                       extraArgs=[target_index])
     
     def remove_target(self, target_index):
-        """Remove a target after it's been hit"""
+        """Recycle a target after it's been hit"""
         if target_index < len(self.targets):
-            # Remove the target model from the scene
-            self.targets[target_index]["node"].removeNode()
-            
-            # Spawn a new target to replace it
-            self.spawn_target()
-            
-            # Remove the target from our list
-            self.targets.pop(target_index)
-        
+            # Respawn the pooled node in place, no scene graph churn
+            self.spawn_target(target_index)
+
         return Task.done
 
     def update_stats_task(self, task):
         """Update the UI with current stats"""
-        # Calculate accuracy
-        accuracy = 0
-        if self.stats["shots"] > 0:
-            accuracy = (self.stats["hits"] / self.stats["shots"]) * 100
+        now = time.time()
+        self.stats_presenter.add_frame_time(ClockObject.getGlobalClock().getDt())
         
-        # Calculate elapsed time
-        elapsed_time = time.time() - self.stats["start_time"]
+        # Hits and shots only change on clicks, accuracy follows them
+        self.stats_presenter.update_counters(self.stats["hits"], self.stats["shots"])
         
-        # Update UI texts
-        self.ui_text["accuracy"].setText(f"Accuracy: {accuracy:.1f}%")
-        self.ui_text["hits"].setText(f"Hits: {self.stats['hits']}")
-        self.ui_text["shots"].setText(f"Shots: {self.stats['shots']}")
-        self.ui_text["timer"].setText(f"Time: {elapsed_time:.1f}s")
+        # Timer and frame time are refreshed at STATS_UPDATE_HZ
+        elapsed_time = now - self.stats["start_time"]
+        self.stats_presenter.update_timed(now, elapsed_time)
         
         return Task.cont
 
@@ -347,15 +468,13 @@ class ValorantAimTrainer(ShowBase):
             "start_time": time.time(),
             "targets_spawned": 0
         }
+        self.stats_presenter.reset()
         
-        # Remove all targets
-        for target in self.targets:
-            target["node"].removeNode()
-        
-        # Clear targets list
-        self.targets.clear()
+        # Cancel pending removals, the pooled targets are all respawned below
+        for i in range(len(self.targets)):
+            self.taskMgr.remove(f"RemoveTarget{i}")
         
-        # Spawn new targets
+        # Re-position every pooled target
         self.spawn_targets(TARGET_COUNT)
 
     def quit_game(self):
@@ -0,0 +1,88 @@
+import random
+from collections import deque, namedtuple
+
+# Sequenced targets.
+# A trial is a precomputed tuple of waypoints hit in order. Each waypoint has
+# its own timeout, counted from when it becomes the current one, and a
+# visibility rule:
+#   "on_start"       - drawn from the start of the trial
+#   "after_previous" - only drawn once the waypoint before it is hit
+# and optionally a strafe path (see strafe_paths.py) it moves along once current.
+# Drills from the training journal:
+#   "single"  - one goal to either side, the plain trial
+#   "stretch" - the goal further out than usual, same color so it can't be told apart
+#   "decoy"   - an unnecessary middle step to the opposite side before the goal,
+#               e.g. swing left when the goal is on the right
+# Sequences are generated in batches ahead of time, a spawn only pops the next one.
+
+Waypoint = namedtuple("Waypoint", ["kind", "x", "y", "timeout_ms", "visible", "path"], defaults=(None,))
+
+DRILL_WEIGHTS = {"single": 0.7, "stretch": 0.15, "decoy": 0.15}
+BATCH_SIZE = 64
+LOW_WATER = 16  # Refill once fewer sequences than this are left
+
+
+class SequenceGenerator:
+    """Builds the waypoint tuples of each drill around a center point"""
+    def __init__(self, center, goal_offset, stretch_offset, decoy_offset, timeout_ms,
+                 decoy_timeout_ms=None, weights=None, rng=random, path_factory=None):
+        self.center = center
+        self.goal_offset = goal_offset
+        self.stretch_offset = stretch_offset
+        self.decoy_offset = decoy_offset
+        self.timeout_ms = timeout_ms
+        self.decoy_timeout_ms = decoy_timeout_ms or timeout_ms
+        weights = weights or DRILL_WEIGHTS
+        self.drills = [drill for drill, weight in weights.items() if weight > 0]
+        self.weights = [weights[drill] for drill in self.drills]
+        self.rng = rng
+        self.path_factory = path_factory  # path_factory(rng) -> StrafePath, None for static targets
+
+    def waypoint(self, kind, x, y, timeout_ms, visible):
+        path = self.path_factory(self.rng) if self.path_factory else None
+        return Waypoint(kind, x, y, timeout_ms, visible, path)
+
+    def sequence(self, drill, side):
+        cx, cy = self.center
+        if drill == "stretch":
+            return (self.waypoint("stretch", cx + side * self.stretch_offset, cy, self.timeout_ms, "on_start"),)
+        if drill == "decoy":
+            return (
+                self.waypoint("decoy", cx - side * self.decoy_offset, cy, self.decoy_timeout_ms, "on_start"),
+                self.waypoint("goal", cx + side * self.goal_offset, cy, self.timeout_ms, "after_previous"),
+            )
+        return (self.waypoint("goal", cx + side * self.goal_offset, cy, self.timeout_ms, "on_start"),)
+
+    def batch(self, count):
+        drills = self.rng.choices(self.drills, self.weights, k=count)
+        return [(drill, self.sequence(drill, self.rng.choice((1, -1)))) for drill in drills]
+
+
+class SequenceQueue:
+    """Pregenerated (drill, waypoints) pairs
+
+    next() is called by whoever spawns targets, top_up() from somewhere off the
+    hot path (the render loop) so a spawn never has to build a batch. deque
+    appends and pops are atomic, so the two can run on different threads.
+    """
+    def __init__(self, generator, batch_size=BATCH_SIZE, low_water=LOW_WATER):
+        self.generator = generator
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.pending = deque(generator.batch(batch_size))
+
+    def top_up(self):
+        if len(self.pending) < self.low_water:
+            self.pending.extend(self.generator.batch(self.batch_size))
+
+    def next(self):
+        try:
+            return self.pending.popleft()
+        except IndexError:
+            # Drained faster than topped up, build one on the spot
+            return self.generator.batch(1)[0]
+
+
+def visible_waypoints(waypoints, index):
+    """Waypoints after the current one that are already drawn"""
+    return [w for w in waypoints[index + 1:] if w.visible == "on_start"]
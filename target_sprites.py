@@ -0,0 +1,127 @@
+import pygame
+import math
+
+# Pre-built target sprites.
+# The circle and its image overlay are rendered once per (radius, color) with the
+# colorkey baked into per-pixel alpha, so drawing a target is a single blit and
+# changing level or color is a dictionary lookup.
+# With subpixel_steps > 1 a sprite is also built for every fractional offset
+# (quarter pixels for 4), so float positions are drawn without snapping.
+
+SUPERSAMPLE = 4          # Sprites are drawn this many times larger, then smoothscaled down
+TARGET_COLOR_STEPS = 32  # The red to yellow ramp is quantized to this many steps
+
+
+def split_subpixel(value, steps):
+    """Split a float coordinate into a whole pixel and the index of the nearest 1/steps offset"""
+    whole = math.floor(value)
+    step = round((value - whole) * steps)
+    if step == steps:
+        return whole + 1, 0
+    return whole, step
+
+
+def make_circle_sprite(radius, color, offset=(0.0, 0.0), supersample=SUPERSAMPLE):
+    """Antialiased filled circle centered at (r+1, r+1) + offset on a transparent surface"""
+    # One spare pixel on each side leaves room for the antialiased edge and the sub-pixel shift
+    size = radius * 2 + 3
+    big = pygame.Surface((size * supersample, size * supersample), pygame.SRCALPHA)
+    left = round((1 + offset[0]) * supersample)
+    top = round((1 + offset[1]) * supersample)
+    pygame.draw.ellipse(big, color, (left, top, radius * 2 * supersample, radius * 2 * supersample))
+    return pygame.transform.smoothscale(big, (size, size))
+
+
+def make_cursor_sprite(offset=(0.0, 0.0), supersample=SUPERSAMPLE):
+    """2x2 white square with a 1px black border centered at (2, 2) + offset"""
+    big = pygame.Surface((5 * supersample, 5 * supersample), pygame.SRCALPHA)
+    left = round(offset[0] * supersample)
+    top = round(offset[1] * supersample)
+    pygame.draw.rect(big, (0, 0, 0), (left, top, 4 * supersample, 4 * supersample))
+    pygame.draw.rect(big, (255, 255, 255), (left + supersample, top + supersample, 2 * supersample, 2 * supersample))
+    return pygame.transform.smoothscale(big, (5, 5))
+
+
+def ramp_color(progress, steps=TARGET_COLOR_STEPS):
+    """Red to yellow color for a 0..1 progress, snapped to one of the pre-built steps"""
+    step = round(min(max(progress, 0.0), 1.0) * steps)
+    return (255, int(255 * step / steps), 0)
+
+
+def ramp_colors(steps=TARGET_COLOR_STEPS):
+    """Every color ramp_color() can return"""
+    return [ramp_color(i / steps, steps) for i in range(steps + 1)]
+
+
+def convert_sprite(sprite):
+    try:
+        return sprite.convert_alpha()
+    except pygame.error:
+        return sprite  # No display mode yet, keep the plain SRCALPHA surface
+
+
+class TargetSpriteCache:
+    """Target sprites keyed by radius, color and sub-pixel offset, anchored on the circle center"""
+    def __init__(self, image=None, image_offset=(0, 0), subpixel_steps=1):
+        # image_offset is the image's top left relative to the circle center,
+        # the same offset the trainers used for screen.blit(image, ...)
+        self.image = image
+        self.image_offset = image_offset
+        self.subpixel_steps = subpixel_steps
+        self.sprites = {}
+
+    def build(self, radius, color, step_x=0, step_y=0):
+        offset = (step_x / self.subpixel_steps, step_y / self.subpixel_steps)
+        circle = make_circle_sprite(radius, color, offset)
+        circle_rect = circle.get_rect(topleft=(-(radius + 1), -(radius + 1)))
+        bounds = circle_rect
+        if self.image:
+            image_rect = self.image.get_rect(topleft=self.image_offset)
+            bounds = circle_rect.union(image_rect)
+
+        sprite = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        sprite.blit(circle, (circle_rect.x - bounds.x, circle_rect.y - bounds.y))
+        if self.image:
+            # The image colorkey is honored here and ends up as transparent pixels
+            sprite.blit(self.image, (self.image_offset[0] - bounds.x, self.image_offset[1] - bounds.y))
+
+        return convert_sprite(sprite), (-bounds.x, -bounds.y)
+
+    def get(self, radius, color, step_x=0, step_y=0):
+        """Sprite surface and the whole-pixel position of the circle center inside it"""
+        key = (radius, tuple(color), step_x, step_y)
+        entry = self.sprites.get(key)
+        if entry is None:
+            entry = self.build(radius, color, step_x, step_y)
+            self.sprites[key] = entry
+        return entry
+
+    def prebuild(self, radii, colors):
+        """Build every combination up front so no sprite is created mid-session"""
+        for radius in radii:
+            for color in colors:
+                for step_x in range(self.subpixel_steps):
+                    for step_y in range(self.subpixel_steps):
+                        self.get(radius, color, step_x, step_y)
+
+    def blit(self, surface, radius, color, center):
+        x, step_x = split_subpixel(center[0], self.subpixel_steps)
+        y, step_y = split_subpixel(center[1], self.subpixel_steps)
+        sprite, (anchor_x, anchor_y) = self.get(radius, color, step_x, step_y)
+        surface.blit(sprite, (x - anchor_x, y - anchor_y))
+
+
+class CursorSpriteCache:
+    """The trainers' 2x2 bordered cursor, pre-built for every sub-pixel offset"""
+    def __init__(self, subpixel_steps=4):
+        self.subpixel_steps = subpixel_steps
+        self.sprites = {}
+        for step_x in range(subpixel_steps):
+            for step_y in range(subpixel_steps):
+                offset = (step_x / subpixel_steps, step_y / subpixel_steps)
+                self.sprites[(step_x, step_y)] = convert_sprite(make_cursor_sprite(offset))
+
+    def blit(self, surface, pos):
+        x, step_x = split_subpixel(pos[0], self.subpixel_steps)
+        y, step_y = split_subpixel(pos[1], self.subpixel_steps)
+        surface.blit(self.sprites[(step_x, step_y)], (x - 2, y - 2))
@@ -0,0 +1,61 @@
+import random
+
+# Trial protocol against guessing.
+# With a uniform delay the chance of a spawn grows the longer the player has
+# waited, so a trained player can time the spawn and fire early. Instead:
+#   foreperiod    - a fixed minimum plus an exponential wait. The exponential is
+#                   memoryless, so the spawn is never more likely just because
+#                   time has passed (flat hazard)
+#   catch trials  - some delays end without a target, a click then is a false alarm
+#   floor         - a hit or first move faster than the physiological floor is
+#                   anticipation, not reaction
+# Flagged trials are kept in the session log but left out of the statistics.
+
+CATCH_TRIAL_RATE = 0.15       # Share of trials that show no target
+ANTICIPATION_FLOOR_MS = 100   # Faster than this can't be a reaction to the target
+FOREPERIOD_MIN_S = 1.0
+FOREPERIOD_MEAN_EXTRA_S = 0.6  # Mean of the exponential part
+FOREPERIOD_MAX_S = 4.0         # Longer draws are redrawn, keeps the tail sane
+
+
+class TrialProtocol:
+    """Foreperiods, catch trials and anticipation checks, with running counts"""
+    def __init__(self, catch_rate=CATCH_TRIAL_RATE, floor_ms=ANTICIPATION_FLOOR_MS,
+                 min_s=FOREPERIOD_MIN_S, mean_extra_s=FOREPERIOD_MEAN_EXTRA_S,
+                 max_s=FOREPERIOD_MAX_S, rng=random):
+        self.catch_rate = catch_rate
+        self.floor_ms = floor_ms
+        self.min_s = min_s
+        self.mean_extra_s = mean_extra_s
+        self.max_s = max(max_s, min_s)
+        self.rng = rng
+
+        self.catch_trials = 0
+        self.false_alarms = 0   # Clicks during a catch trial
+        self.false_starts = 0   # Clicks during the foreperiod
+        self.anticipations = 0  # Hits faster than the floor
+
+    def foreperiod(self):
+        """Next delay in seconds before a trial"""
+        if self.mean_extra_s <= 0:
+            return self.min_s
+        while True:
+            delay = self.min_s + self.rng.expovariate(1.0 / self.mean_extra_s)
+            if delay <= self.max_s:
+                return delay
+
+    def next_is_catch(self):
+        """Whether the trial about to start shows no target"""
+        if self.rng.random() < self.catch_rate:
+            self.catch_trials += 1
+            return True
+        return False
+
+    def is_anticipation(self, rt_ms):
+        return rt_ms < self.floor_ms
+
+    def summary_text(self):
+        text = f"False starts: {self.false_starts}  Too early: {self.anticipations}"
+        if self.catch_rate > 0:
+            text = f"Catch: {self.false_alarms}/{self.catch_trials} fired  " + text
+        return text